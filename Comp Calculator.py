@@ -1,5 +1,9 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+
+from compcalc.plans import CAPPED
+from compcalc.ui import (ae_breakdown, ae_earnings_curve, earnings_curve_chart,
+                         sales_needed_widget, sdr_breakdown,
+                         sdr_earnings_curve)
 
 # Apply global styles for a polished look
 st.set_page_config(
@@ -108,15 +112,6 @@ tab = st.radio("Select Role", [
                "Sales Development Representative (SDR)", "Account Executive (AE)"])
 
 
-def calculate_pro_rata_bonus(attainment_rate, bonus_amount):
-    if attainment_rate < 0.5:
-        return 0  # No bonus if attainment is below 50%
-    elif attainment_rate >= 1.0:
-        return bonus_amount  # Full bonus at 100% attainment or above
-    else:
-        return bonus_amount * attainment_rate  # Pro-rata bonus
-
-
 if tab == "Sales Development Representative (SDR)":
     st.markdown('<div class="section-title">SDR Compensation Calculation</div>',
                 unsafe_allow_html=True)
@@ -152,39 +147,34 @@ if tab == "Sales Development Representative (SDR)":
     total_revenue_assist = st.number_input("Total Won Revenue Assisted (€)", min_value=0.0,
                                            help="Total revenue from deals you assisted in closing.")
 
-    # Calculation Logic
-    sal_attainment_rate = total_sals_attained / \
-        sal_target_per_month if sal_target_per_month > 0 else 0
-    sql_attainment_rate = total_sqls_attained / \
-        sql_target_per_month if sql_target_per_month > 0 else 0
-    monthly_base_salary = base_salary / 12
-
-    # Determine target attainment bonuses (with pro-rata)
-    base_sal_bonus = calculate_pro_rata_bonus(
-        sal_attainment_rate, bonus_sals_target_attainment)
-    base_sql_bonus = calculate_pro_rata_bonus(
-        sql_attainment_rate, bonus_sqls_target_attainment)
+    # Calculation Logic (cached on the plan and inputs)
+    breakdown = sdr_breakdown(
+        CAPPED, base_salary=base_salary,
+        sal_target_per_month=sal_target_per_month,
+        sql_target_per_month=sql_target_per_month,
+        bonus_sals_target_attainment=bonus_sals_target_attainment,
+        bonus_per_excess_sal=bonus_per_excess_sal,
+        bonus_sqls_target_attainment=bonus_sqls_target_attainment,
+        bonus_per_excess_sql=bonus_per_excess_sql,
+        bonus_on_won_revenue=bonus_on_won_revenue,
+        total_sals_attained=total_sals_attained,
+        total_sqls_attained=total_sqls_attained,
+        total_revenue_assist=total_revenue_assist)
+    sal_attainment_rate = breakdown["sal_attainment_rate"]
+    sql_attainment_rate = breakdown["sql_attainment_rate"]
+    monthly_base_salary = breakdown["monthly_base_salary"]
+    base_sal_bonus = breakdown["base_sal_bonus"]
+    base_sql_bonus = breakdown["base_sql_bonus"]
 
     # Caps on excess bonuses (50% over target)
     max_excess_sals = sal_target_per_month * 0.5  # Cap at 50% over target
     max_excess_sqls = sql_target_per_month * 0.5  # Cap at 50% over target
-
-    # Calculate excess bonuses with caps
-    excess_sals_count = max(
-        0, min(total_sals_attained - sal_target_per_month, max_excess_sals))
-    excess_sqls_count = max(
-        0, min(total_sqls_attained - sql_target_per_month, max_excess_sqls))
-    excess_sal_bonus = excess_sals_count * bonus_per_excess_sal
-    excess_sql_bonus = excess_sqls_count * bonus_per_excess_sql
-
-    # Calculate revenue bonus
-    revenue_bonus = total_revenue_assist * bonus_on_won_revenue
-
-    # Total earnings calculation
-    total_target_attainment_earnings = base_sal_bonus + base_sql_bonus
-    total_excess_earnings = excess_sal_bonus + excess_sql_bonus + revenue_bonus
-    grand_total = total_target_attainment_earnings + \
-        total_excess_earnings + monthly_base_salary
+    excess_sals_count = breakdown["excess_sals_count"]
+    excess_sqls_count = breakdown["excess_sqls_count"]
+    excess_sal_bonus = breakdown["excess_sal_bonus"]
+    excess_sql_bonus = breakdown["excess_sql_bonus"]
+    revenue_bonus = breakdown["revenue_bonus"]
+    grand_total = breakdown["grand_total"]
 
     # Display results
     st.markdown('<div class="result-card">Total SDR Earnings: €<b>{:,.2f}</b></div>'.format(
@@ -241,6 +231,18 @@ if tab == "Sales Development Representative (SDR)":
     st.write("**SQL Attainment Rate:**")
     st.progress(min(sql_attainment_rate, 1.0))
 
+    # Earnings curve, precomputed once per set of plan parameters
+    earnings_curve_chart(sdr_earnings_curve(
+        CAPPED, base_salary=base_salary,
+        sal_target_per_month=sal_target_per_month,
+        sql_target_per_month=sql_target_per_month,
+        bonus_sals_target_attainment=bonus_sals_target_attainment,
+        bonus_per_excess_sal=bonus_per_excess_sal,
+        bonus_sqls_target_attainment=bonus_sqls_target_attainment,
+        bonus_per_excess_sql=bonus_per_excess_sql,
+        bonus_on_won_revenue=bonus_on_won_revenue,
+        total_revenue_assist=total_revenue_assist), "SDR Earnings")
+
 elif tab == "Account Executive (AE)":
     st.markdown('<div class="section-title">AE Compensation Calculation</div>',
                 unsafe_allow_html=True)
@@ -270,39 +272,25 @@ elif tab == "Account Executive (AE)":
     total_sales = st.number_input("Total Sales Closed (€)", min_value=0.0,
                                   help="Total sales value you closed this month.")
 
-    # AE Calculation Logic
-    attainment_rate = total_sales / monthly_target if monthly_target > 0 else 0
-    monthly_base_salary = base_salary / 12
-    commission = 0
-
-    if attainment_rate >= 0.5:
-        # Calculate standard commission up to the accelerator threshold
-        accelerator_threshold_sales = monthly_target * accelerator_threshold
-        standard_commission_sales = min(
-            total_sales, accelerator_threshold_sales)
-        standard_commission = standard_commission_sales * commission_rate
-
-        # Calculate accelerated commission for sales above the accelerator threshold
-        if total_sales > accelerator_threshold_sales:
-            accelerated_sales = total_sales - accelerator_threshold_sales
-            accelerated_commission = accelerated_sales * accelerator_rate
-        else:
-            accelerated_sales = 0
-            accelerated_commission = 0
-
-        # Total commission before cap
-        total_commission = standard_commission + accelerated_commission
-
-        # Calculate target commission for 100% attainment
-        target_commission = monthly_target * commission_rate
-
-        # Apply commission cap
-        maximum_commission_allowed = target_commission * commission_cap_multiplier
-        commission = min(total_commission, maximum_commission_allowed)
-    else:
-        commission = 0  # No commission if attainment is below 50%
-
-    total_earnings = commission + monthly_base_salary
+    # AE Calculation Logic (cached on the plan and inputs)
+    breakdown = ae_breakdown(
+        CAPPED, base_salary=base_salary, commission_rate=commission_rate,
+        accelerator_threshold=accelerator_threshold,
+        accelerator_rate=accelerator_rate, monthly_target=monthly_target,
+        commission_cap_multiplier=commission_cap_multiplier,
+        total_sales=total_sales)
+    attainment_rate = breakdown["attainment_rate"]
+    monthly_base_salary = breakdown["monthly_base_salary"]
+    standard_commission = breakdown["standard_commission"]
+    accelerated_commission = breakdown["accelerated_commission"]
+    total_commission = breakdown["total_commission"]
+    commission = breakdown["commission"]
+    total_earnings = breakdown["total_earnings"]
+
+    # Sales split around the accelerator threshold, for the breakdown
+    accelerator_threshold_sales = monthly_target * accelerator_threshold
+    standard_commission_sales = min(total_sales, accelerator_threshold_sales)
+    accelerated_sales = max(total_sales - accelerator_threshold_sales, 0)
 
     # Display results
     st.markdown('<div class="result-card">Total AE Earnings: €<b>{:,.2f}</b></div>'.format(
@@ -362,6 +350,21 @@ elif tab == "Account Executive (AE)":
     st.write("**Sales Attainment Rate:**")
     st.progress(min(attainment_rate / commission_cap_multiplier, 1.0))
 
+    # Earnings curve, precomputed once per set of plan parameters
+    earnings_curve_chart(ae_earnings_curve(
+        CAPPED, base_salary=base_salary, commission_rate=commission_rate,
+        accelerator_threshold=accelerator_threshold,
+        accelerator_rate=accelerator_rate, monthly_target=monthly_target,
+        commission_cap_multiplier=commission_cap_multiplier), "AE Earnings")
+
+    # Sales needed for a target payout, solved in closed form
+    sales_needed_widget(
+        CAPPED, base_salary=base_salary, commission_rate=commission_rate,
+        accelerator_threshold=accelerator_threshold,
+        accelerator_rate=accelerator_rate, monthly_target=monthly_target,
+        commission_cap_multiplier=commission_cap_multiplier,
+        total_sales=total_sales)
+
 # Footer
 st.markdown("""
 <footer>
@@ -0,0 +1,64 @@
+import pandas as pd
+import streamlit as st
+
+from compcalc.events import open_queue
+from compcalc.files import read_table
+from compcalc.leaderboard import Leaderboard
+from compcalc.plans import DEFAULT_PLAN, PLANS
+from compcalc.ui import autorefresh
+
+st.set_page_config(page_title="Live Leaderboard", layout="wide")
+st.title("Live Leaderboard")
+st.write("Ranked payouts for the whole roster, updated as deal, SAL and SQL "
+         "events arrive on the queue.")
+
+# Sources
+roster_path = st.text_input("Roster File (CSV or Parquet)", value="roster.csv",
+                            help="One row per rep with rep_id, role and plan inputs.")
+queue_path = st.text_input("Event Queue (.jsonl file or SQLite database)",
+                           value="events.db",
+                           help="Where deal, SAL and SQL events are pushed.")
+plan_names = list(PLANS)
+plan = st.selectbox("Plan", plan_names, index=plan_names.index(DEFAULT_PLAN))
+top_n = st.number_input("Reps to Show", min_value=1, max_value=500, value=25)
+refresh_seconds = st.number_input("Refresh Every (seconds)", min_value=1,
+                                  max_value=60, value=2)
+
+# The leaderboard lives in the session and is only rebuilt when a source changes
+sources = (roster_path, queue_path, plan)
+state = st.session_state.get("leaderboard")
+if state is None or state["sources"] != sources:
+    try:
+        board = Leaderboard(read_table(roster_path), plan)
+        queue = open_queue(queue_path)
+    except (OSError, ValueError, KeyError) as exc:
+        st.error(f"Could not load the leaderboard: {exc}")
+        st.stop()
+    state = {"sources": sources, "board": board, "queue": queue, "cursor": 0}
+    st.session_state["leaderboard"] = state
+
+autorefresh(int(refresh_seconds * 1000), key="leaderboard_refresh")
+
+# Only events after the last cursor are read; the cursor moves on once
+# they have been applied
+events, cursor = state["queue"].read(state["cursor"])
+board = state["board"]
+changes = board.consume(events)
+state["cursor"] = cursor
+if board.skipped:
+    reasons = "; ".join(reason for _, reason in board.skipped[:5])
+    st.warning(f"Skipped {len(board.skipped)} event(s) that could not be "
+               f"applied: {reasons}")
+
+st.metric("Total Payout", f"€{board.total_payout:,.2f}")
+
+st.write("### Leaderboard")
+st.dataframe(pd.DataFrame(board.top(int(top_n))), hide_index=True,
+             use_container_width=True)
+
+st.write("### Changes Since Last Refresh")
+if changes:
+    st.dataframe(pd.DataFrame(changes), hide_index=True,
+                 use_container_width=True)
+else:
+    st.write("No new events.")
@@ -0,0 +1,57 @@
+import sqlite3
+
+import streamlit as st
+
+from compcalc.ui import payout_store
+
+st.set_page_config(page_title="Payout History", layout="wide")
+st.title("Payout History")
+st.write("Reopen the inputs and payouts saved for past months. Nothing is "
+         "recomputed; every view is read straight from the database.")
+
+db_path = st.text_input("Payout Database", value="payouts.db",
+                        help="SQLite file written by `python -m compcalc ... --store`.")
+try:
+    store = payout_store(db_path)
+    periods = store.periods()
+except sqlite3.Error as exc:
+    st.error(f"Could not open the database: {exc}")
+    st.stop()
+
+if not periods:
+    st.info("No payouts have been stored yet.")
+    st.stop()
+
+period = st.selectbox("Period", periods)
+versions = store.plan_versions()
+labels = {f"v{row.plan_version} - {row.name}": row.plan_version
+          for row in versions.itertuples()}
+plan_version = labels[st.selectbox("Plan Version", list(labels))]
+rep_id = st.text_input("Rep ID (leave blank for the whole period)").strip()
+
+if rep_id:
+    # Rep ids are stored as given (7 and "007" alike), so match the typed id
+    # against the stored ones as text and look up with the stored value
+    key = next((stored for stored in store.rep_ids(period)
+                if str(stored) == rep_id), rep_id)
+    results = store.load_results(period, plan_version, rep_id=key)
+    inputs = store.load_inputs(period, rep_id=key)
+    if results.empty:
+        st.warning(f"No stored payout for rep {rep_id} in {period}.")
+    else:
+        st.markdown(f"**Total payout:** €{results['total_payout'].iloc[0]:,.2f}")
+        st.write("### Payout Breakdown")
+        st.dataframe(results.dropna(axis=1).T, use_container_width=True)
+        st.write("### Inputs")
+        st.dataframe(inputs.dropna(axis=1).T, use_container_width=True)
+        adjustments = store.load_adjustments(rep_id=key, period=period)
+        if not adjustments.empty:
+            st.write("### Adjustments")
+            st.dataframe(adjustments, hide_index=True, use_container_width=True)
+else:
+    results = store.load_results(period, plan_version)
+    st.metric("Total Payout", f"€{results['total_payout'].sum():,.2f}")
+    st.dataframe(results, hide_index=True, use_container_width=True)
+    st.download_button("Download CSV", results.to_csv(index=False),
+                       file_name=f"payouts-{period}-v{plan_version}.csv",
+                       mime="text/csv")
@@ -0,0 +1,53 @@
+import os
+
+import streamlit as st
+
+from compcalc.plans import DEFAULT_PLAN, PLANS
+from compcalc.team import PAGE_SIZES, filter_payouts, page_count, team_page
+from compcalc.ui import payout_grid, team_table
+
+st.set_page_config(page_title="Team View", layout="wide")
+st.title("Team View")
+st.write("Every SDR's and AE's payout on one screen. The table is computed "
+         "once on the server; only the page you are looking at is sent to "
+         "the browser.")
+
+roster_path = st.text_input("Roster File (CSV or Parquet)", value="roster.csv",
+                            help="One row per rep with rep_id, role and plan inputs.")
+plan_names = list(PLANS)
+plan = st.selectbox("Plan", plan_names, index=plan_names.index(DEFAULT_PLAN))
+try:
+    table = team_table(plan, roster_path, os.path.getmtime(roster_path))
+except (OSError, ValueError, KeyError) as exc:
+    st.error(f"Could not load the roster: {exc}")
+    st.stop()
+
+# Filters and sort order apply to the whole table, not just the page
+filter_col, search_col, payout_col = st.columns(3)
+role = filter_col.selectbox("Role", ["All", "SDR", "AE"])
+search = search_col.text_input("Search Reps").strip()
+min_payout = payout_col.number_input("Minimum Total Payout (€)", min_value=0.0,
+                                     value=0.0, step=500.0)
+sort_col, order_col, size_col = st.columns(3)
+sortable = [name for name in table.columns if table[name].dtype.kind in "fiuO"]
+sort_by = sort_col.selectbox("Sort By", sortable,
+                             index=sortable.index("total_payout"))
+ascending = order_col.radio("Order", ["Descending", "Ascending"],
+                            horizontal=True) == "Ascending"
+page_size = size_col.selectbox("Rows per Page", PAGE_SIZES, index=1)
+
+role = None if role == "All" else role
+min_payout = min_payout or None
+# Filtered once per rerun; the page count and the page share the result
+filtered = filter_payouts(table, role, search, min_payout)
+pages = page_count(len(filtered), page_size)
+page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages,
+                       value=1, step=1)
+rows, matched = team_page(filtered, page, page_size, sort_by, ascending)
+
+team_total = table["total_payout"].sum()
+total_col, matched_col = st.columns(2)
+total_col.metric("Team Total Payout", f"€{team_total:,.2f}")
+matched_col.metric("Matching Reps", f"{matched:,} of {len(table):,}")
+
+payout_grid(rows, key="team_grid")
@@ -1,5 +1,8 @@
 import streamlit as st
 
+from compcalc.plans import BASIC
+from compcalc.ui import ae_breakdown, sdr_breakdown
+
 # Apply global styles for a polished look
 st.markdown("""
     <style>
@@ -79,14 +82,6 @@ tab = st.radio("Select Role", [
                "Sales Development Representative (SDR)", "Account Executive (AE)"])
 
 
-def enforce_criteria(attainment_rate, commission):
-    # Apply minimum threshold of 50% attainment and cap at 150%
-    if attainment_rate < 0.5:
-        return 0  # No commission if attainment is below 50%
-    effective_attainment_rate = min(attainment_rate, 1.5)  # Cap at 150%
-    return commission * effective_attainment_rate
-
-
 if tab == "Sales Development Representative (SDR)":
     st.markdown('<div class="section-title">SDR Compensation Calculation</div>',
                 unsafe_allow_html=True)
@@ -117,33 +112,28 @@ if tab == "Sales Development Representative (SDR)":
     total_revenue_assist = st.number_input(
         "Total Won Revenue Assisted (€)", min_value=0.0)
 
-    # Calculation Logic
-    sal_attainment_rate = total_sals_attained / sal_target_per_month
-    sql_attainment_rate = total_sqls_attained / sql_target_per_month
-    monthly_base_salary = base_salary / 12
-
-    # Apply cap to target attainment bonuses
-    base_sal_bonus = enforce_criteria(
-        sal_attainment_rate, bonus_sals_target_attainment)
-    base_sql_bonus = enforce_criteria(
-        sql_attainment_rate, bonus_sqls_target_attainment)
-
-    # Apply cap to excess bonuses
-    excess_sals_count = max(0, min(total_sals_attained - sal_target_per_month,
-                            sal_target_per_month * 1.5 - sal_target_per_month))
-    excess_sqls_count = max(0, min(total_sqls_attained - sql_target_per_month,
-                            sql_target_per_month * 1.5 - sql_target_per_month))
-    excess_sal_bonus = excess_sals_count * bonus_per_excess_sal
-    excess_sql_bonus = excess_sqls_count * bonus_per_excess_sql
-
-    # Calculate revenue bonus
-    revenue_bonus = total_revenue_assist * bonus_on_won_revenue
-
-    # Total earnings calculation
-    total_target_attainment_earnings = base_sal_bonus + base_sql_bonus
-    total_above_earnings = excess_sal_bonus + excess_sql_bonus + revenue_bonus
-    grand_total = total_target_attainment_earnings + \
-        total_above_earnings + monthly_base_salary
+    # Calculation Logic (cached on the plan and inputs)
+    breakdown = sdr_breakdown(
+        BASIC, base_salary=base_salary,
+        sal_target_per_month=sal_target_per_month,
+        sql_target_per_month=sql_target_per_month,
+        bonus_sals_target_attainment=bonus_sals_target_attainment,
+        bonus_per_excess_sal=bonus_per_excess_sal,
+        bonus_sqls_target_attainment=bonus_sqls_target_attainment,
+        bonus_per_excess_sql=bonus_per_excess_sql,
+        bonus_on_won_revenue=bonus_on_won_revenue,
+        total_sals_attained=total_sals_attained,
+        total_sqls_attained=total_sqls_attained,
+        total_revenue_assist=total_revenue_assist)
+    sal_attainment_rate = breakdown["sal_attainment_rate"]
+    sql_attainment_rate = breakdown["sql_attainment_rate"]
+    monthly_base_salary = breakdown["monthly_base_salary"]
+    base_sal_bonus = breakdown["base_sal_bonus"]
+    base_sql_bonus = breakdown["base_sql_bonus"]
+    excess_sal_bonus = breakdown["excess_sal_bonus"]
+    excess_sql_bonus = breakdown["excess_sql_bonus"]
+    revenue_bonus = breakdown["revenue_bonus"]
+    grand_total = breakdown["grand_total"]
 
     # Display results
     st.markdown('<div class="result-card">Total SDR Earnings: €<b>{:,.2f}</b></div>'.format(
@@ -167,25 +157,16 @@ elif tab == "Account Executive (AE)":
 
     total_sales = st.number_input("Total Sales Closed (€)", min_value=0.0)
 
-    # AE Calculation Logic with 1:1 payout and capping
-    attainment_rate = total_sales / monthly_target
-    commission = 0
-
-    # Calculate standard commission only if attainment meets or exceeds 50%
-    if attainment_rate >= 0.5:
-        # Cap at 150% for the standard commission
-        capped_attainment_rate = min(attainment_rate, 1.5)
-        commission = (monthly_target * commission_rate) * \
-            capped_attainment_rate
-
-        # Add accelerated commission for sales above the accelerator threshold
-        if attainment_rate > accelerator_threshold:
-            accelerated_sales = total_sales - \
-                (monthly_target * accelerator_threshold)
-            commission += accelerated_sales * accelerator_rate
-
-    monthly_base_salary = base_salary / 12
-    total_earnings = commission + monthly_base_salary
+    # AE Calculation Logic with 1:1 payout and capping (cached)
+    breakdown = ae_breakdown(
+        BASIC, base_salary=base_salary, commission_rate=commission_rate,
+        accelerator_threshold=accelerator_threshold,
+        accelerator_rate=accelerator_rate, monthly_target=monthly_target,
+        total_sales=total_sales)
+    attainment_rate = breakdown["attainment_rate"]
+    monthly_base_salary = breakdown["monthly_base_salary"]
+    commission = breakdown["commission"]
+    total_earnings = breakdown["total_earnings"]
 
     st.markdown('<div class="result-card">Total AE Earnings: €<b>{:,.2f}</b></div>'.format(
         total_earnings), unsafe_allow_html=True)
@@ -0,0 +1,89 @@
+"""Cold-start budget check for the pages and the batch command.
+
+Run from the repository root::
+
+    python benchmarks/startup.py
+
+Each entry point's top-level imports are timed in a fresh interpreter
+(best of a few runs), and the check fails if any exceeds its budget or
+pulls in a heavy library that only specific views need. Third-party
+baselines (Streamlit itself loads plotly, for instance) are imported first
+and only what our modules add on top of them is checked.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be imported by the views that use them
+HEAVY_MODULES = ("matplotlib", "plotly", "st_aggrid", "streamlit_autorefresh")
+
+# name -> (third-party baseline, our top-level imports, total budget in seconds)
+ENTRY_POINTS = {
+    "pages": (["streamlit"],
+              ["compcalc.plans", "compcalc.formulas", "compcalc.ui",
+               "compcalc.leaderboard", "compcalc.events", "compcalc.team"],
+              3.0),
+    "cli": ([], ["compcalc.cli"], 0.3),
+}
+
+RUNS = 3
+
+_PROBE = """
+import json, sys, time
+baseline, modules = json.loads(sys.argv[1])
+start = time.perf_counter()
+for name in baseline:
+    __import__(name)
+before = set(sys.modules)
+for name in modules:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed,
+                  "added": sorted(set(sys.modules) - before)}))
+"""
+
+
+def measure(baseline, modules):
+    """Return (best total import time, modules ``modules`` added to baseline)."""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    best = None
+    added = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE, json.dumps([baseline, modules])],
+            env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+        report = json.loads(result.stdout)
+        if best is None or report["seconds"] < best:
+            best = report["seconds"]
+        added = report["added"]
+    return best, added
+
+
+def main():
+    failures = []
+    for name, (baseline, modules, budget) in ENTRY_POINTS.items():
+        try:
+            seconds, added = measure(baseline, modules)
+        except subprocess.CalledProcessError as exc:
+            failures.append(f"{name}: import failed\n{exc.stderr}")
+            continue
+        heavy = sorted({module.split(".")[0] for module in added}
+                       & set(HEAVY_MODULES))
+        status = "ok" if seconds <= budget and not heavy else "FAIL"
+        print(f"{name:<6} {seconds * 1000:8.1f} ms  (budget "
+              f"{budget * 1000:.0f} ms)  {status}")
+        if seconds > budget:
+            failures.append(f"{name}: {seconds:.3f}s exceeds {budget:.3f}s")
+        if heavy:
+            failures.append(f"{name}: imports {', '.join(heavy)} at startup")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
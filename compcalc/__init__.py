@@ -0,0 +1,27 @@
+"""Sales compensation calculations shared by the Streamlit pages and batch tools."""
+
+from compcalc.compiled import CompiledPlan, compile_plan
+from compcalc.formulas import (ae_compensation, calculate_pro_rata_bonus,
+                               enforce_criteria, sdr_compensation)
+from compcalc.plans import (AE_DEFAULTS, BASIC, CAPPED, DEFAULT_PLAN, PLANS,
+                            SDR_DEFAULTS, TIERED, get_plan, load_plan,
+                            validate_plan)
+
+__all__ = [
+    "AE_DEFAULTS",
+    "BASIC",
+    "CAPPED",
+    "CompiledPlan",
+    "DEFAULT_PLAN",
+    "PLANS",
+    "SDR_DEFAULTS",
+    "TIERED",
+    "ae_compensation",
+    "calculate_pro_rata_bonus",
+    "compile_plan",
+    "enforce_criteria",
+    "get_plan",
+    "load_plan",
+    "sdr_compensation",
+    "validate_plan",
+]
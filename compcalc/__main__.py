@@ -0,0 +1,5 @@
+import sys
+
+from compcalc.cli import main
+
+sys.exit(main())
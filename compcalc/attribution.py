@@ -0,0 +1,198 @@
+"""Split-credit attribution of won deals to AEs, SDRs and overlays.
+
+A deal ledger has one row per won deal (``deal_id``, ``period``,
+``amount`` and optionally the owning ``rep_id``). A credit-split table
+has one row per (deal, rep) credit with the ``split`` fraction and the
+``role`` the credit is for; an optional ``credit_type`` marks ``overlay``
+credits, which are paid on top of the deal's ordinary splits instead of out
+of them.
+
+AE and SDR credit are separate pools: a deal's ordinary AE splits share
+100% of its amount (AE credit becomes ``total_sales``) and its ordinary SDR
+splits share another 100% (``total_revenue_assist``). Unallocated credit is
+never dropped:
+
+- whatever the AE splits leave over goes to the deal's own ``rep_id``, so a
+  deal with no AE splits (including an overlay-only deal) is credited in
+  full to its owner; a ledger without owners must allocate all of it;
+- the SDR pool has no owner to fall back on, so a deal with SDR splits must
+  allocate all 100% of it, and one without SDR splits has no SDR credit.
+
+Either shortfall raises ``ValueError``.
+
+Each split row is matched to its deal by a hash lookup on ``deal_id`` and
+credited ``amount * split``: in effect a sparse (rep x deal) credit matrix
+times the deal amounts, done with array indexing and one group-by, never a
+Python loop per deal. The per-rep credited totals have the same layout as
+``ledger.aggregate_ledger``, so ``ledger.apply_totals`` turns them into
+``total_sales`` for AEs and ``total_revenue_assist`` for SDRs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import AE, SDR, compute_payouts
+from compcalc.files import iter_chunks
+from compcalc.fx import convert_deals
+from compcalc.ledger import (AMOUNT, PERIOD_KEY, REP_KEY, aggregate_chunks,
+                             apply_totals)
+from compcalc.plans import DEFAULT_PLAN
+
+DEAL_KEY = "deal_id"
+SPLIT = "split"
+CREDIT_TYPE = "credit_type"
+OVERLAY = "overlay"
+CREDITED = "credited_amount"
+
+# Slack for split fractions that add up to 1 in floating point
+SPLIT_TOLERANCE = 1e-9
+
+
+def _matches(column, *wanted):
+    """One row mask per value in ``wanted``, compared case-insensitively.
+
+    The column is factorized once and only its few distinct values are
+    compared, not every row.
+    """
+    codes, values = pd.factorize(column)
+    values = pd.Index(values).astype(str).str.upper()
+    return [np.isin(codes, np.flatnonzero(values == value))
+            for value in wanted]
+
+
+def _roles(splits):
+    """``(is_ae, is_sdr, ordinary)`` row masks of a credit-split table."""
+    is_ae, is_sdr = _matches(splits["role"], AE, SDR)
+    ordinary = np.ones(len(splits), dtype=bool)
+    if CREDIT_TYPE in splits.columns:
+        ordinary = ~_matches(splits[CREDIT_TYPE], OVERLAY.upper())[0]
+    return is_ae, is_sdr, ordinary
+
+
+def split_roles(splits, roster):
+    """``splits`` with each credit's ``role`` taken from the roster.
+
+    Split tables that already carry a ``role`` column are returned as they
+    are.
+    """
+    if "role" in splits.columns:
+        return splits
+    roles = roster.drop_duplicates(REP_KEY).set_index(REP_KEY)["role"]
+    return splits.assign(role=splits[REP_KEY].map(roles).to_numpy())
+
+
+def validate_splits(splits):
+    """Check a credit-split table; raises ``ValueError`` on bad rows.
+
+    Splits must lie in [0, 1] and be for an AE or SDR. A deal's ordinary AE
+    splits must not add up to more than the whole deal, and its ordinary
+    SDR splits, when it has any, must add up to exactly the whole deal.
+    """
+    missing = {DEAL_KEY, REP_KEY, SPLIT, "role"} - set(splits.columns)
+    if missing:
+        raise ValueError(f"Credit splits are missing column(s): {sorted(missing)}")
+    fractions = splits[SPLIT].to_numpy(dtype=np.float64)
+    bad = np.isnan(fractions) | (fractions < 0) | (fractions > 1)
+    if bad.any():
+        raise ValueError(f"Split fractions must be between 0 and 1; deal(s) "
+                         f"{sorted(set(splits[DEAL_KEY][bad]))[:5]} are not")
+    is_ae, is_sdr, ordinary = _roles(splits)
+    unknown = ~(is_ae | is_sdr)
+    if unknown.any():
+        reps = sorted(set(splits[REP_KEY][unknown].astype(str)))
+        raise ValueError(f"Credit splits need a role of {AE} or {SDR}; "
+                         f"rep(s) {reps[:5]} have none")
+    deal_codes, deal_ids = pd.factorize(splits[DEAL_KEY])
+    for role, rows in ((AE, is_ae & ordinary), (SDR, is_sdr & ordinary)):
+        totals = np.bincount(deal_codes, weights=np.where(rows, fractions, 0.0),
+                             minlength=len(deal_ids))
+        over = totals > 1 + SPLIT_TOLERANCE
+        if over.any():
+            raise ValueError(f"{role} splits add up to more than 100% for "
+                             f"deal(s) {sorted(deal_ids[over])[:5]}")
+        if role == SDR:
+            counts = np.bincount(deal_codes[rows], minlength=len(deal_ids))
+            short = (counts > 0) & (totals < 1 - SPLIT_TOLERANCE)
+            if short.any():
+                raise ValueError(f"SDR splits add up to less than 100% for "
+                                 f"deal(s) {sorted(deal_ids[short])[:5]}")
+
+
+def credited_rows(deals, splits, amount=AMOUNT):
+    """One row per credit: ``rep_id``, ``period`` (when present) and ``credited_amount``.
+
+    ``splits`` must have passed ``validate_splits``.
+    """
+    deal_ids = pd.Index(deals[DEAL_KEY])
+    if not deal_ids.is_unique:
+        raise ValueError("Deal ids must be unique within a ledger chunk")
+    has_period = PERIOD_KEY in deals.columns
+    amounts = deals[amount].to_numpy(dtype=np.float64)
+
+    # Position of each split row's deal; -1 for splits of other deals
+    position = deal_ids.get_indexer(splits[DEAL_KEY])
+    matched = position >= 0
+    fractions = splits[SPLIT].to_numpy(dtype=np.float64)
+    parts = [{
+        REP_KEY: splits[REP_KEY].to_numpy()[matched],
+        CREDITED: amounts[position[matched]] * fractions[matched],
+        **({PERIOD_KEY: deals[PERIOD_KEY].to_numpy()[position[matched]]}
+           if has_period else {}),
+    }]
+
+    # The share of each deal's AE pool no split claims; overlays never count
+    is_ae, _, ordinary = _roles(splits)
+    is_ae &= ordinary & matched
+    remainder = 1.0 - np.bincount(position[is_ae], weights=fractions[is_ae],
+                                  minlength=len(deals))
+    unallocated = remainder > SPLIT_TOLERANCE
+    if unallocated.any():
+        if REP_KEY not in deals.columns:
+            raise ValueError(f"AE splits add up to less than 100% for deal(s) "
+                             f"{sorted(deal_ids[unallocated])[:5]} and the "
+                             f"ledger has no owning '{REP_KEY}'")
+        parts.append({
+            REP_KEY: deals[REP_KEY].to_numpy()[unallocated],
+            CREDITED: amounts[unallocated] * remainder[unallocated],
+            **({PERIOD_KEY: deals[PERIOD_KEY].to_numpy()[unallocated]}
+               if has_period else {}),
+        })
+    return pd.concat([pd.DataFrame(part) for part in parts],
+                     ignore_index=True)
+
+
+def attribute_deals(deals, splits, amount=AMOUNT):
+    """Credited totals per rep (and period) for an in-memory deal ledger.
+
+    Returns ``rep_id``, ``period``, ``total_amount`` (credited) and
+    ``deal_count`` (credits received), ready for ``apply_totals``.
+    """
+    validate_splits(splits)
+    keys = [REP_KEY, PERIOD_KEY] if PERIOD_KEY in deals.columns else [REP_KEY]
+    return aggregate_chunks([credited_rows(deals, splits, amount)], keys=keys,
+                            amount=CREDITED)
+
+
+def attribute_ledger(path, splits, chunksize=1_000_000, amount=AMOUNT,
+                     fx=None):
+    """Stream a CSV or Parquet deal ledger and attribute it by ``splits``.
+
+    With an ``fx`` table, deal amounts are converted to the plan currency
+    before they are credited.
+    """
+    validate_splits(splits)
+    chunks = (credited_rows(convert_deals(chunk, fx, amount), splits, amount)
+              for chunk in iter_chunks(path, chunksize))
+    return aggregate_chunks(chunks, keys=(REP_KEY, PERIOD_KEY),
+                            amount=CREDITED)
+
+
+def attributed_payouts(ledger_path, splits, roster, plan=DEFAULT_PLAN,
+                       chunksize=1_000_000, fx=None):
+    """Compute payouts for ``roster`` from split-credited deals.
+
+    Splits without a ``role`` column take each rep's role from ``roster``.
+    """
+    totals = attribute_ledger(ledger_path, split_roles(splits, roster),
+                              chunksize=chunksize, fx=fx)
+    return compute_payouts(apply_totals(roster, totals), plan)
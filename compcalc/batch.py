@@ -0,0 +1,292 @@
+"""Vectorized SDR and AE payouts for whole-org payroll runs.
+
+Every function here takes a DataFrame with one row per rep (column names
+match the variables in the Streamlit pages) and computes all payout columns
+in one pass with NumPy. Columns that are missing fall back to the page
+defaults (or the plan's overrides of them), so a roster only needs the
+fields that vary between reps. The plan's rules are resolved once per call
+and applied to whole columns, never per row.
+
+``sdr_arrays`` and ``ae_arrays`` hold the arithmetic. They accept any
+mapping of NumPy arrays that broadcast against each other, so callers can
+evaluate e.g. a (scenarios x reps) matrix of sales against per-rep targets
+without materialising a row per cell.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.ladder import tier_ladder
+from compcalc.plans import (AE_OUTPUTS, DEFAULT_PLAN, SDR_OUTPUTS,
+                            ae_defaults, get_plan, sdr_defaults)
+from compcalc.timing import stage_clock
+
+SDR = "SDR"
+AE = "AE"
+
+# Column layout of compute_payouts, the same whatever mix of roles is passed
+PAYOUT_COLUMNS = list(dict.fromkeys(SDR_OUTPUTS + AE_OUTPUTS)) + ["total_payout"]
+
+
+def _column(data, name, defaults):
+    # A missing input is the scalar default, which broadcasts like a column
+    if name not in data:
+        return np.float64(defaults[name])
+    values = np.asarray(data[name], dtype=np.float64)
+    # Blank cells (e.g. AE fields on an SDR row) use the page default
+    if np.isnan(values).any():
+        values = np.where(np.isnan(values), defaults[name], values)
+    return values
+
+
+def _safe_divide(numerator, denominator):
+    # Attainment is 0 when there is no target, matching the pages
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _frame(columns, names, index):
+    return pd.DataFrame(
+        {name: np.broadcast_to(columns[name], (len(index),)) for name in names},
+        index=index)
+
+
+def _target_bonus(rules, attainment_rate, bonus_amount):
+    # Before the eligibility gate, which sdr_arrays applies as its own stage
+    if rules["sdr_target_bonus"] == "attainment":
+        return bonus_amount * \
+            np.minimum(attainment_rate, rules["sdr_attainment_cap"])
+    return np.where(attainment_rate >= 1.0, bonus_amount,
+                    bonus_amount * attainment_rate)
+
+
+def sdr_arrays(data, plan=DEFAULT_PLAN):
+    """Compute SDR payout arrays from a mapping of broadcastable inputs."""
+    clock = stage_clock("batch")
+    rules = get_plan(plan)
+    defaults = sdr_defaults(rules)
+    sal_target_per_month = _column(data, "sal_target_per_month", defaults)
+    sql_target_per_month = _column(data, "sql_target_per_month", defaults)
+    total_sals_attained = _column(data, "total_sals_attained", defaults)
+    total_sqls_attained = _column(data, "total_sqls_attained", defaults)
+    clock.lap("input_parsing")
+
+    sal_attainment_rate = _safe_divide(
+        total_sals_attained, sal_target_per_month)
+    sql_attainment_rate = _safe_divide(
+        total_sqls_attained, sql_target_per_month)
+    monthly_base_salary = _column(data, "base_salary", defaults) / 12
+
+    base_sal_bonus = _target_bonus(rules, sal_attainment_rate, _column(
+        data, "bonus_sals_target_attainment", defaults))
+    base_sql_bonus = _target_bonus(rules, sql_attainment_rate, _column(
+        data, "bonus_sqls_target_attainment", defaults))
+    clock.lap("tier_evaluation")
+
+    # Caps on excess bonuses
+    excess_sals_count = np.maximum(0.0, np.minimum(
+        total_sals_attained - sal_target_per_month,
+        sal_target_per_month * rules["sdr_excess_cap"]))
+    excess_sqls_count = np.maximum(0.0, np.minimum(
+        total_sqls_attained - sql_target_per_month,
+        sql_target_per_month * rules["sdr_excess_cap"]))
+    excess_sal_bonus = excess_sals_count * \
+        _column(data, "bonus_per_excess_sal", defaults)
+    excess_sql_bonus = excess_sqls_count * \
+        _column(data, "bonus_per_excess_sql", defaults)
+    clock.lap("caps")
+
+    # No target bonus below the eligibility gate
+    min_attainment = rules["min_attainment"]
+    base_sal_bonus = np.where(sal_attainment_rate < min_attainment, 0.0,
+                              base_sal_bonus)
+    base_sql_bonus = np.where(sql_attainment_rate < min_attainment, 0.0,
+                              base_sql_bonus)
+    clock.lap("eligibility_gating")
+
+    if rules["sdr_lead_conversion"]:
+        lead_conversion_rate = _column(
+            data, "lead_conversion_rate", defaults)
+        base_sal_bonus = base_sal_bonus * lead_conversion_rate
+        base_sql_bonus = base_sql_bonus * lead_conversion_rate
+        excess_sal_bonus = excess_sal_bonus * lead_conversion_rate
+        excess_sql_bonus = excess_sql_bonus * lead_conversion_rate
+
+    revenue_bonus = _column(data, "total_revenue_assist", defaults) * \
+        _column(data, "bonus_on_won_revenue", defaults)
+
+    grand_total = (base_sal_bonus + base_sql_bonus) + \
+        (excess_sal_bonus + excess_sql_bonus + revenue_bonus) + \
+        monthly_base_salary
+    clock.lap("totals")
+
+    return {
+        "sal_attainment_rate": sal_attainment_rate,
+        "sql_attainment_rate": sql_attainment_rate,
+        "monthly_base_salary": monthly_base_salary,
+        "base_sal_bonus": base_sal_bonus,
+        "base_sql_bonus": base_sql_bonus,
+        "excess_sals_count": excess_sals_count,
+        "excess_sqls_count": excess_sqls_count,
+        "excess_sal_bonus": excess_sal_bonus,
+        "excess_sql_bonus": excess_sql_bonus,
+        "revenue_bonus": revenue_bonus,
+        "grand_total": grand_total,
+    }
+
+
+def sdr_payouts(df, plan=DEFAULT_PLAN):
+    """Return the SDR payout columns for every row of ``df``."""
+    return _frame(sdr_arrays(df, plan), SDR_OUTPUTS, df.index)
+
+
+def ae_arrays(data, plan=DEFAULT_PLAN):
+    """Compute AE payout arrays from a mapping of broadcastable inputs."""
+    clock = stage_clock("batch")
+    rules = get_plan(plan)
+    defaults = ae_defaults(rules)
+    total_sales = _column(data, "total_sales", defaults)
+    monthly_target = _column(data, "monthly_target", defaults)
+    commission_rate = _column(data, "commission_rate", defaults)
+    clock.lap("input_parsing")
+
+    attainment_rate = _safe_divide(total_sales, monthly_target)
+    monthly_base_salary = _column(data, "base_salary", defaults) / 12
+    accelerated_commission = 0.0
+    overachievement_commission = 0.0
+    exceptional_commission = 0.0
+
+    method = rules["ae_commission"]
+    if method == "accelerator":
+        accelerator_threshold = _column(
+            data, "accelerator_threshold", defaults)
+        standard_commission = (monthly_target * commission_rate) * \
+            np.minimum(attainment_rate, rules["ae_attainment_cap"])
+        accelerated_commission = np.where(
+            attainment_rate > accelerator_threshold,
+            (total_sales - monthly_target * accelerator_threshold) *
+            _column(data, "accelerator_rate", defaults), 0.0)
+        total_commission = standard_commission + accelerated_commission
+        clock.lap("tier_evaluation")
+        commission = total_commission
+        clock.lap("caps")
+    elif method == "capped":
+        accelerator_threshold_sales = monthly_target * \
+            _column(data, "accelerator_threshold", defaults)
+        standard_commission = np.minimum(
+            total_sales, accelerator_threshold_sales) * commission_rate
+        accelerated_commission = np.where(
+            total_sales > accelerator_threshold_sales,
+            (total_sales - accelerator_threshold_sales) *
+            _column(data, "accelerator_rate", defaults), 0.0)
+        total_commission = standard_commission + accelerated_commission
+        clock.lap("tier_evaluation")
+        maximum_commission_allowed = monthly_target * commission_rate * \
+            _column(data, "commission_cap_multiplier", defaults)
+        commission = np.minimum(total_commission, maximum_commission_allowed)
+        clock.lap("caps")
+    elif method == "tiered":
+        lower, upper = rules["ae_tier_breakpoints"]
+        overachievement_rate = _column(data, "overachievement_rate", defaults)
+        above_lower = attainment_rate > lower
+        above_upper = attainment_rate > upper
+        standard_commission = np.where(
+            above_lower, monthly_target * lower * commission_rate,
+            total_sales * commission_rate * attainment_rate)
+        overachievement_commission = np.where(
+            above_upper, monthly_target * (upper - lower) * overachievement_rate,
+            (total_sales - monthly_target * lower) * overachievement_rate)
+        overachievement_commission = np.where(
+            above_lower, overachievement_commission, 0.0)
+        exceptional_commission = np.where(
+            above_upper, (total_sales - monthly_target * upper) *
+            _column(data, "exceptional_rate", defaults), 0.0)
+        total_commission = standard_commission + \
+            overachievement_commission + exceptional_commission
+        clock.lap("tier_evaluation")
+        commission = total_commission
+        clock.lap("caps")
+    elif method == "ladder":
+        ladder = tier_ladder(rules)
+        _, standard_commission, accelerated_commission = \
+            ladder.commission_arrays(total_sales, monthly_target,
+                                     attainment_rate)
+        total_commission = standard_commission + accelerated_commission
+        clock.lap("tier_evaluation")
+        cap = ladder.cap(monthly_target)
+        commission = total_commission if cap is None \
+            else np.minimum(total_commission, cap)
+        clock.lap("caps")
+    else:
+        raise ValueError(f"Unknown AE commission method {method!r}")
+
+    # No commission if attainment is below the eligibility gate
+    eligible = attainment_rate >= rules["min_attainment"]
+    standard_commission = np.where(eligible, standard_commission, 0.0)
+    accelerated_commission = np.where(eligible, accelerated_commission, 0.0)
+    overachievement_commission = np.where(
+        eligible, overachievement_commission, 0.0)
+    exceptional_commission = np.where(eligible, exceptional_commission, 0.0)
+    total_commission = np.where(eligible, total_commission, 0.0)
+    commission = np.where(eligible, commission, 0.0)
+    clock.lap("eligibility_gating")
+
+    total_earnings = commission + monthly_base_salary
+    clock.lap("totals")
+
+    return {
+        "attainment_rate": attainment_rate,
+        "monthly_base_salary": monthly_base_salary,
+        "standard_commission": standard_commission,
+        "accelerated_commission": accelerated_commission,
+        "overachievement_commission": overachievement_commission,
+        "exceptional_commission": exceptional_commission,
+        "total_commission": total_commission,
+        "commission": commission,
+        "total_earnings": total_earnings,
+    }
+
+
+def ae_payouts(df, plan=DEFAULT_PLAN):
+    """Return the AE payout columns for every row of ``df``."""
+    return _frame(ae_arrays(df, plan), AE_OUTPUTS, df.index)
+
+
+def compute_payouts(df, plan=DEFAULT_PLAN, role=None):
+    """Compute payouts for a mixed roster of SDRs and AEs.
+
+    The role of each row comes from its ``role`` column ("SDR" or "AE"),
+    or from ``role`` when the whole frame is a single role. The result is
+    ``df`` with every payout column appended plus a ``total_payout`` column
+    holding the SDR grand total or the AE total earnings.
+    """
+    if role is None and "role" not in df.columns:
+        raise ValueError("Pass role= or include a 'role' column")
+    frame = df.reset_index(drop=True)
+    roles = pd.Series(role, index=frame.index) if role is not None \
+        else frame["role"]
+    roles = roles.astype(str).str.upper()
+    unknown = ~roles.isin([SDR, AE])
+    if unknown.any():
+        raise ValueError(
+            f"Unknown role(s): {sorted(roles[unknown].unique())}")
+
+    parts = []
+    is_sdr = (roles == SDR).to_numpy()
+    if is_sdr.any():
+        sdr = sdr_payouts(frame[is_sdr], plan)
+        sdr["total_payout"] = sdr["grand_total"]
+        parts.append(sdr)
+    if (~is_sdr).any():
+        ae = ae_payouts(frame[~is_sdr], plan)
+        ae["total_payout"] = ae["total_earnings"]
+        parts.append(ae)
+
+    outputs = pd.concat(parts).sort_index() if parts else pd.DataFrame()
+    outputs = outputs.reindex(columns=PAYOUT_COLUMNS).astype(np.float64)
+    outputs.index = df.index
+    # Payout columns replace any stale copies in the input
+    inputs = df.drop(columns=[c for c in outputs.columns if c in df.columns])
+    return pd.concat([inputs, outputs], axis=1)
@@ -0,0 +1,179 @@
+"""Clawbacks and retroactive adjustments for cancelled deals.
+
+A cancellation event names the ``deal_id``, the ``rep_id`` and ``period``
+the deal was credited in and the ``amount`` to take back (negative to
+reinstate a deal). Events are identified by their ``event_id`` column when
+the file has one, otherwise by ``deal_id``, so a deal that is cancelled and
+later reinstated needs an ``event_id`` on each event. The store records
+every id it has applied, and ``process_cancellations`` skips those, so
+replaying a file (or a file that overlaps an earlier one) changes nothing
+twice.
+Events are summed per rep-period, and only those rep-periods are re-paid:
+their stored inputs lose the cancelled amount from ``total_sales`` (AEs) or
+``total_revenue_assist`` (SDRs) and go back through ``compute_payouts``
+under the plan version that paid them. The new payout and tier are compared
+with the payout and tier stored at the time, so a rep who drops a band or
+falls below the eligibility gate shows up on the line. Nothing else in the
+history is read or recomputed.
+
+Each re-paid rep-period gives one signed adjustment line: ``adjustment`` is
+``new_payout - old_payout``, negative for a clawback.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.attribution import DEAL_KEY
+from compcalc.batch import AE, compute_payouts
+from compcalc.incremental import payout_tiers, tier_names
+from compcalc.ledger import AMOUNT, PERIOD_KEY, REP_KEY, TOTAL_COLUMN_BY_ROLE
+from compcalc.plans import ae_defaults, sdr_defaults
+from compcalc.store import ADJUSTMENT_COLUMNS, INPUT_COLUMNS
+
+KEYS = [REP_KEY, PERIOD_KEY]
+
+EVENT_ID = "event_id"
+
+
+def event_ids(events):
+    """The id of each cancellation event, as text.
+
+    ``event_id`` when the events have one, otherwise ``deal_id``. Raises
+    ``ValueError`` for missing or repeated ids.
+    """
+    column = EVENT_ID if EVENT_ID in events.columns else DEAL_KEY
+    if column not in events.columns:
+        raise ValueError(f"Cancellations need a '{DEAL_KEY}' (or "
+                         f"'{EVENT_ID}') column")
+    ids = events[column]
+    if ids.isna().any():
+        raise ValueError(f"Cancellations are missing a {column} on "
+                         f"{int(ids.isna().sum())} row(s)")
+    ids = ids.astype(str)
+    repeated = ids[ids.duplicated()]
+    if len(repeated):
+        raise ValueError(f"Repeated {column}(s) {sorted(set(repeated))[:5]}; "
+                         f"give each event its own '{EVENT_ID}'")
+    return ids
+
+
+def cancelled_totals(events):
+    """Cancelled ``amount`` and event count per (rep_id, period)."""
+    missing = {REP_KEY, PERIOD_KEY, AMOUNT} - set(events.columns)
+    if missing:
+        raise ValueError(f"Cancellations are missing column(s): {sorted(missing)}")
+    totals = (events.assign(**{PERIOD_KEY: events[PERIOD_KEY].astype(str)})
+              .groupby(KEYS, sort=False)[AMOUNT].agg(["sum", "count"])
+              .rename(columns={"sum": "cancelled_amount",
+                               "count": "cancelled_deals"}))
+    return totals.reset_index()
+
+
+def _paid(store, keys, plan_version):
+    # The payout in force for each rep-period: the latest one computed, or
+    # the one under ``plan_version``
+    results = store.load_results(plan_version=plan_version, keys=keys)
+    results = results.sort_values("computed_at", kind="stable") \
+        .drop_duplicates(KEYS, keep="last")
+    inputs = store.load_inputs(keys=keys).drop(columns="role")
+    paid = results.merge(inputs, on=KEYS, how="inner",
+                         suffixes=("", "_input"))
+    known = keys.merge(paid[KEYS], on=KEYS, how="left", indicator=True)
+    unknown = known[known["_merge"] == "left_only"]
+    if len(unknown):
+        pairs = list(zip(unknown[REP_KEY], unknown[PERIOD_KEY]))
+        raise ValueError(f"No stored inputs and payouts for rep-period(s) "
+                         f"{pairs[:5]}")
+    return paid
+
+
+def _reduce_totals(inputs, cancelled, rules):
+    # Take the cancelled amounts off each rep's credited total, never below 0
+    reduced = inputs.copy()
+    roles = reduced["role"].astype(str).str.upper()
+    for role, column in TOTAL_COLUMN_BY_ROLE.items():
+        rows = (roles == role).to_numpy()
+        default = (ae_defaults if role == AE else sdr_defaults)(rules)[column]
+        current = reduced.loc[rows, column].fillna(default)
+        reduced.loc[rows, column] = (current - cancelled[rows]).clip(lower=0.0)
+    return reduced
+
+
+def adjustment_lines(store, events, booked_period=None, plan_version=None):
+    """Re-pay the rep-periods in ``events``.
+
+    Returns ``(lines, inputs, payouts)``: the adjustment lines
+    (``ADJUSTMENT_COLUMNS`` plus tier names) and, per plan version, the
+    reduced inputs and new payouts to store.
+    """
+    totals = cancelled_totals(events)
+    paid = _paid(store, totals[KEYS], plan_version).merge(totals, on=KEYS)
+    lines, updates = [], []
+    for version, group in paid.groupby("plan_version", sort=True):
+        version = int(version)
+        rules = store.load_plan(version)
+        group = group.reset_index(drop=True)
+        cancelled = group["cancelled_amount"].to_numpy(dtype=np.float64)
+        inputs = _reduce_totals(group[[*KEYS, "role", *INPUT_COLUMNS]],
+                                cancelled, rules)
+        payouts = compute_payouts(inputs, rules)
+
+        # Results stored before tiers were kept get theirs from the stored row
+        old_tier = group["tier"].to_numpy(dtype="float64", na_value=np.nan)
+        derived = payout_tiers(rules, group)
+        old_tier = np.where(np.isnan(old_tier), derived, old_tier).astype(np.int64)
+        new_tier = payout_tiers(rules, payouts)
+        roles = group["role"].astype(str).str.upper()
+        old_payout = group["total_payout"].to_numpy(dtype=np.float64)
+        new_payout = payouts["total_payout"].to_numpy(dtype=np.float64)
+        lines.append(pd.DataFrame({
+            REP_KEY: group[REP_KEY],
+            PERIOD_KEY: group[PERIOD_KEY],
+            "plan_version": version,
+            "role": roles,
+            "booked_period": None if booked_period is None else str(booked_period),
+            "cancelled_amount": cancelled,
+            "cancelled_deals": group["cancelled_deals"].astype("int64"),
+            "old_tier": old_tier,
+            "new_tier": new_tier,
+            "old_payout": old_payout,
+            "new_payout": new_payout,
+            "adjustment": new_payout - old_payout,
+            "old_tier_name": [tier_names(rules, role)[tier]
+                              for role, tier in zip(roles, old_tier)],
+            "new_tier_name": [tier_names(rules, role)[tier]
+                              for role, tier in zip(roles, new_tier)],
+        }))
+        updates.append((version, inputs, payouts))
+    if not lines:
+        return pd.DataFrame(columns=[*ADJUSTMENT_COLUMNS, "old_tier_name",
+                                     "new_tier_name"]), updates
+    return pd.concat(lines, ignore_index=True), updates
+
+
+def process_cancellations(store, events, booked_period=None,
+                          plan_version=None, apply=True):
+    """Adjustment lines for cancellation ``events`` against ``store``.
+
+    ``booked_period`` is the period the lines are paid in. Events whose id
+    the store has already applied are skipped. With ``apply``, the reduced
+    inputs, the new payouts and tiers, the lines themselves and the ids of
+    the events behind them are saved in one transaction, so a later
+    cancellation for the same rep-period adjusts from the corrected figures.
+    """
+    ids = event_ids(events)
+    new = ~ids.isin(store.applied_events(ids)).to_numpy()
+    events, ids = events[new], ids[new]
+    lines, updates = adjustment_lines(store, events, booked_period,
+                                      plan_version)
+    if apply:
+        applied = pd.DataFrame({REP_KEY: events[REP_KEY].to_numpy(),
+                                PERIOD_KEY: events[PERIOD_KEY].astype(str)
+                                .to_numpy(),
+                                EVENT_ID: ids.to_numpy()})
+        with store.transaction():
+            for version, inputs, payouts in updates:
+                store.save_inputs(inputs)
+                store.save_results(payouts, version)
+            store.save_adjustments(lines, applied)
+    return lines
@@ -0,0 +1,285 @@
+"""Headless payout computation for payroll jobs.
+
+Usage::
+
+    python -m compcalc reps.csv payouts.csv --plan tiered
+
+The input is read in chunks and every chunk is written out as soon as it is
+computed, so memory stays flat however long the roster is. With
+``--ledger deals.csv`` the input is a roster and each rep's totals are
+streamed from the deal ledger instead, credited to several reps per deal
+with ``--splits splits.csv`` and converted to the plan currency with
+``--fx rates.csv``. With ``--store payouts.db`` the inputs, plan
+version and results are also saved to SQLite for ``--period``. With
+``--clawback`` the input is a file of cancelled deals (deal_id, rep_id,
+period, amount) instead: only those rep-periods in ``--store`` are re-paid
+and the signed adjustment lines, booked in ``--period``, are written out;
+events the store has already applied are skipped. With
+``--diff NEW_PLAN`` every rep is paid under ``--plan`` and ``NEW_PLAN`` and
+the per-rep deltas are written out, with the cost change per role printed.
+``--timing`` and ``--profile`` record per-stage histograms and a cProfile
+capture of the run (stages inside ``--workers`` processes are not
+collected). Only pandas (and pyarrow for Parquet files) is imported, never
+the UI libraries.
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+
+from compcalc.files import ChunkWriter, iter_chunks, read_table
+from compcalc.plans import DEFAULT_PLAN, PLANS, resolve_plan
+from compcalc import timing
+
+
+def _store_chunk(store, plan_version, inputs, payouts, role, period):
+    if role is not None:
+        inputs = inputs.assign(role=role)
+        payouts = payouts.assign(role=role)
+    store.save_inputs(inputs, period)
+    store.save_results(payouts, plan_version, period)
+
+
+def run(input_path, output_path, plan=DEFAULT_PLAN, role=None,
+        chunksize=100_000, workers=1, store_path=None, period=None):
+    """Compute payouts for every row of ``input_path`` into ``output_path``.
+
+    With ``workers`` above 1 each chunk is sharded across a process pool.
+    With ``store_path`` each chunk's inputs and payouts are also saved to
+    that SQLite database for ``period`` (or the rows' ``period`` column).
+    Returns the number of rows written.
+    """
+    from compcalc.batch import compute_payouts
+
+    store = plan_version = None
+    if store_path is not None:
+        from compcalc.store import PayoutStore
+
+        store = PayoutStore(store_path)
+        plan_version = store.save_plan(plan)
+
+    rows = chunks = 0
+    try:
+        with ChunkWriter(output_path) as writer, contextlib.ExitStack() as stack:
+            if workers > 1:
+                from concurrent.futures import ProcessPoolExecutor
+
+                from compcalc.parallel import parallel_payouts
+
+                pool = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=workers))
+            clock = timing.stage_clock("cli")
+            for chunk in iter_chunks(input_path, chunksize):
+                clock.lap("input_parsing")
+                if workers > 1:
+                    payouts = parallel_payouts(chunk, plan, role=role,
+                                               workers=workers, executor=pool)
+                else:
+                    payouts = compute_payouts(chunk, plan, role=role)
+                clock.lap("calculation")
+                if store is not None:
+                    _store_chunk(store, plan_version, chunk, payouts, role,
+                                 period)
+                    clock.lap("store")
+                writer.write(payouts)
+                clock.lap("output")
+                rows += len(chunk)
+                chunks += 1
+            if not chunks:
+                # An empty Parquet file has no batches; still write the header
+                writer.write(compute_payouts(read_table(input_path), plan,
+                                             role=role))
+    finally:
+        if store is not None:
+            store.close()
+    return rows
+
+
+def run_ledger(roster_path, ledger_path, output_path, plan=DEFAULT_PLAN,
+               chunksize=1_000_000, store_path=None, period=None,
+               splits_path=None, fx_path=None, currency="EUR"):
+    """Compute payouts for a roster from a deal-level ledger.
+
+    With ``splits_path`` each deal is credited to the reps in that
+    credit-split table instead of to its own ``rep_id`` alone. With
+    ``fx_path`` deals carrying a ``currency`` are converted to ``currency``
+    by that rate table first. Returns the number of rows written.
+    """
+    roster = read_table(roster_path)
+    missing = {"rep_id", "role"} - set(roster.columns)
+    if missing:
+        raise ValueError(f"The roster is missing column(s): {sorted(missing)}")
+    fx = None
+    if fx_path is not None:
+        from compcalc.fx import FxTable
+
+        fx = FxTable.from_file(fx_path, base=currency)
+    if splits_path is not None:
+        from compcalc.attribution import attributed_payouts
+
+        payouts = attributed_payouts(ledger_path, read_table(splits_path),
+                                     roster, plan,
+                                     chunksize=chunksize, fx=fx)
+    else:
+        from compcalc.ledger import ledger_payouts
+
+        payouts = ledger_payouts(ledger_path, roster, plan,
+                                 chunksize=chunksize, fx=fx)
+    with ChunkWriter(output_path) as writer:
+        writer.write(payouts)
+    if store_path is not None:
+        from compcalc.store import PayoutStore
+
+        store = PayoutStore(store_path)
+        try:
+            # The roster with its ledger totals is the stored input
+            _store_chunk(store, store.save_plan(plan), payouts, payouts,
+                         None, period)
+        finally:
+            store.close()
+    return len(payouts)
+
+
+def run_clawback(events_path, output_path, store_path, booked_period=None):
+    """Re-pay the rep-periods hit by the cancellations in ``events_path``.
+
+    Writes one signed adjustment line per rep-period and updates the stored
+    inputs and payouts. Returns the number of lines written.
+    """
+    from compcalc.clawback import process_cancellations
+    from compcalc.store import PayoutStore
+
+    store = PayoutStore(store_path)
+    try:
+        lines = process_cancellations(store, read_table(events_path),
+                                      booked_period=booked_period)
+    finally:
+        store.close()
+    with ChunkWriter(output_path) as writer:
+        writer.write(lines)
+    return len(lines)
+
+
+def run_diff(input_path, output_path, old_plan, new_plan, role=None):
+    """Write per-rep payout deltas between two plans; returns the summary."""
+    from compcalc.diff import diff_payouts, diff_summary
+
+    diff = diff_payouts(read_table(input_path), old_plan, new_plan, role=role)
+    with ChunkWriter(output_path) as writer:
+        writer.write(diff)
+    return diff_summary(diff)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m compcalc",
+        description="Compute SDR/AE payouts for a CSV or Parquet roster.")
+    parser.add_argument("input", help="CSV or Parquet file, one row per rep")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument("--plan", default=DEFAULT_PLAN,
+                        help="built-in plan (%s) or a JSON/YAML plan file "
+                             "(default: %%(default)s)" % ", ".join(sorted(PLANS)))
+    parser.add_argument("--role", choices=["SDR", "AE"],
+                        help="role for every row; otherwise read from the "
+                             "'role' column")
+    parser.add_argument("--ledger",
+                        help="deal-level ledger (rep_id, period, amount) to "
+                             "sum into total_sales / total_revenue_assist")
+    parser.add_argument("--splits",
+                        help="credit-split table (deal_id, rep_id, split, "
+                             "optional role and credit_type) for --ledger "
+                             "deals")
+    parser.add_argument("--fx",
+                        help="FX rate table (date, currency, rate) to convert "
+                             "--ledger deals with a 'currency' column")
+    parser.add_argument("--currency", default="EUR",
+                        help="plan currency the --fx rates convert into "
+                             "(default: %(default)s)")
+    parser.add_argument("--clawback", action="store_true",
+                        help="treat the input as cancelled deals (deal_id, "
+                             "rep_id, period, amount) and write adjustment "
+                             "lines for the --store payouts they change")
+    parser.add_argument("--diff", metavar="NEW_PLAN",
+                        help="also pay every rep under NEW_PLAN (built-in or "
+                             "file) and write the per-rep payout deltas")
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                        help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to shard each chunk across "
+                             "(default: %(default)s)")
+    parser.add_argument("--store",
+                        help="SQLite database to save the inputs, plan "
+                             "version and payouts to")
+    parser.add_argument("--period",
+                        help="period to store the rows under, e.g. 2025-01; "
+                             "otherwise read from the 'period' column")
+    parser.add_argument("--timing", metavar="FILE",
+                        help="time each stage and write the histograms to "
+                             "FILE in Prometheus text format")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write a cProfile capture of the run to FILE")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.input):
+        print(f"error: input file not found: {args.input}", file=sys.stderr)
+        return 2
+    if (args.splits or args.fx) and not args.ledger:
+        print("error: --splits and --fx need --ledger", file=sys.stderr)
+        return 2
+    if args.clawback and (not args.store or args.ledger):
+        print("error: --clawback needs --store and cannot be combined with "
+              "--ledger", file=sys.stderr)
+        return 2
+    if args.diff and (args.ledger or args.store or args.clawback):
+        print("error: --diff cannot be combined with --ledger, --store or "
+              "--clawback", file=sys.stderr)
+        return 2
+    if args.ledger and args.role:
+        print("error: --role cannot be combined with --ledger; the roster "
+              "needs a 'role' column", file=sys.stderr)
+        return 2
+    if args.timing:
+        timing.enable()
+    capture = timing.start_profile(args.profile)
+    try:
+        # Validate the plan once up front; workers receive the plain rules
+        plan = resolve_plan(args.plan)
+        if args.diff:
+            summary = run_diff(args.input, args.output, plan,
+                               resolve_plan(args.diff), role=args.role)
+            rows = int(summary.loc["All", "reps"])
+            print(summary.to_string(float_format=lambda value: f"{value:,.2f}"),
+                  file=sys.stderr)
+        elif args.clawback:
+            rows = run_clawback(args.input, args.output, args.store,
+                                booked_period=args.period)
+        elif args.ledger:
+            rows = run_ledger(args.input, args.ledger, args.output,
+                              plan=plan, chunksize=args.chunksize,
+                              store_path=args.store, period=args.period,
+                              splits_path=args.splits, fx_path=args.fx,
+                              currency=args.currency)
+        else:
+            rows = run(args.input, args.output, plan=plan,
+                       role=args.role, chunksize=args.chunksize,
+                       workers=args.workers, store_path=args.store,
+                       period=args.period)
+    except (ValueError, OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    except KeyError as exc:
+        # A column the inputs lack that no check above caught
+        print(f"error: missing column {exc}", file=sys.stderr)
+        return 1
+    finally:
+        timing.stop_profile(capture)
+        if args.timing:
+            timing.write_prometheus(args.timing)
+    what = "adjustment lines" if args.clawback else "payouts"
+    print(f"Wrote {rows} {what} to {args.output}", file=sys.stderr)
+    return 0
@@ -0,0 +1,66 @@
+"""Plans compiled once into ready-to-run evaluators.
+
+``compile_plan`` validates a plan (a built-in name, a rule dict or a plan
+file) and binds its rules into scalar evaluators for single reps and batch
+evaluators for whole rosters. Run many plan variants by compiling each once
+and reusing it, instead of re-reading the rules for every rep::
+
+    plan = compile_plan("plans/tiered-2025.yaml")
+    plan.ae({"total_sales": 80000.0})["total_earnings"]
+    plan.payouts(roster)
+"""
+
+from compcalc.formulas import make_ae_evaluator, make_sdr_evaluator
+from compcalc.plans import PLANS, resolve_plan, validate_plan
+
+
+class CompiledPlan:
+    """A validated plan with its evaluators prebuilt.
+
+    Accepted anywhere a plan name is, e.g. ``compute_payouts(df, plan)``.
+    """
+
+    __slots__ = ("name", "rules", "sdr", "ae")
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.name = rules.get("name", "")
+        self.sdr = make_sdr_evaluator(rules)
+        self.ae = make_ae_evaluator(rules)
+
+    def __repr__(self):
+        return f"CompiledPlan({self.name!r})"
+
+    def sdr_batch(self, df):
+        from compcalc.batch import sdr_payouts
+
+        return sdr_payouts(df, self.rules)
+
+    def ae_batch(self, df):
+        from compcalc.batch import ae_payouts
+
+        return ae_payouts(df, self.rules)
+
+    def payouts(self, df, role=None):
+        from compcalc.batch import compute_payouts
+
+        return compute_payouts(df, self.rules, role=role)
+
+
+_BUILTIN_CACHE = {}
+
+
+def compile_plan(plan):
+    """Compile a plan name, plan file path, rule dict or ``CompiledPlan``.
+
+    Built-in plans are compiled once per process and shared.
+    """
+    if isinstance(plan, CompiledPlan):
+        return plan
+    if isinstance(plan, str) and plan in PLANS:
+        if plan not in _BUILTIN_CACHE:
+            _BUILTIN_CACHE[plan] = CompiledPlan(PLANS[plan])
+        return _BUILTIN_CACHE[plan]
+    if isinstance(plan, dict):
+        return CompiledPlan(validate_plan(plan))
+    return CompiledPlan(resolve_plan(plan))
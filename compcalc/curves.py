@@ -0,0 +1,63 @@
+"""Precomputed earnings-vs-attainment curves.
+
+A curve evaluates the plan once over a fixed attainment grid (0-300% in 1%
+steps) with the batch arithmetic. Charts draw straight from the grid, and a
+what-if slider reads its value from the grid instead of recomputing.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import ae_arrays, sdr_arrays
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, get_plan, sdr_defaults
+
+MAX_ATTAINMENT_PCT = 300
+ATTAINMENT_GRID = np.linspace(0.0, MAX_ATTAINMENT_PCT / 100,
+                              MAX_ATTAINMENT_PCT + 1)
+
+
+def _curve(grid, columns):
+    shape = grid.shape
+    return pd.DataFrame({
+        "attainment_pct": grid * 100,
+        **{name: np.broadcast_to(values, shape)
+           for name, values in columns.items()},
+    })
+
+
+def ae_curve(inputs, plan=DEFAULT_PLAN, grid=ATTAINMENT_GRID):
+    """AE commission and total earnings at every attainment in ``grid``.
+
+    ``inputs`` are the plan parameters; ``total_sales`` is ignored.
+    """
+    rules = get_plan(plan)
+    values = {**ae_defaults(rules), **inputs}
+    values["total_sales"] = grid * values["monthly_target"]
+    out = ae_arrays(values, rules)
+    return _curve(grid, {"commission": out["commission"],
+                         "total_earnings": out["total_earnings"]})
+
+
+def sdr_curve(inputs, plan=DEFAULT_PLAN, grid=ATTAINMENT_GRID):
+    """SDR bonus and total earnings with SALs and SQLs both at each attainment.
+
+    ``inputs`` are the plan parameters plus the revenue assisted, which is
+    held fixed; the SAL/SQL counts are ignored.
+    """
+    rules = get_plan(plan)
+    values = {**sdr_defaults(rules), **inputs}
+    values["total_sals_attained"] = grid * values["sal_target_per_month"]
+    values["total_sqls_attained"] = grid * values["sql_target_per_month"]
+    out = sdr_arrays(values, rules)
+    bonus = out["grand_total"] - out["monthly_base_salary"]
+    return _curve(grid, {"bonus": bonus,
+                         "total_earnings": out["grand_total"]})
+
+
+def curve_value(curve, attainment_pct, column="total_earnings"):
+    """Read ``column`` at ``attainment_pct`` from a precomputed curve.
+
+    Grid points are returned exactly; values between them are interpolated.
+    """
+    return float(np.interp(attainment_pct, curve["attainment_pct"].to_numpy(),
+                           curve[column].to_numpy()))
@@ -0,0 +1,158 @@
+"""Payout differences between two plan versions across a roster.
+
+``diff_payouts(roster, old_plan, new_plan)`` pays every rep under both
+plans and reports who wins, who loses and by how much; ``diff_summary``
+rolls that up into the cost change per role.
+
+Both plans run in one pass through the batch engine. Inputs are parsed
+once, and the numeric rules that differ (e.g. ``sdr_excess_cap`` 0.5 vs
+1.0) become a (2, 1) array, so the engine broadcasts the two versions as
+rows of one (2 x reps) evaluation: attainment rates and every other column
+that does not depend on a changed rule are computed once and shared. A
+role whose rules are the same under both plans is paid once. Plans that
+differ in structure (e.g. the AE commission method) are evaluated one after
+the other, still sharing the parsed inputs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import (AE, AE_OUTPUTS, SDR, SDR_OUTPUTS, ae_arrays,
+                            sdr_arrays)
+from compcalc.plans import ae_defaults, get_plan, sdr_defaults
+from compcalc.simulate import _inputs, _rep_column, _role_masks
+
+# Rules the engine applies arithmetically, so two values broadcast
+NUMERIC_RULES = ("min_attainment", "sdr_excess_cap", "sdr_attainment_cap",
+                 "ae_attainment_cap")
+
+DIFF_COLUMNS = ["old_payout", "new_payout", "delta", "pct_change"]
+
+SUMMARY_COLUMNS = ["reps", "winners", "losers", "unchanged", "old_cost",
+                   "new_cost", "cost_change", "cost_change_pct",
+                   "largest_gain", "largest_loss"]
+
+# Deltas smaller than half a cent count as unchanged
+CHANGE_TOLERANCE = 0.005
+
+_ROLES = (
+    (SDR, "sdr_", sdr_arrays, sdr_defaults, SDR_OUTPUTS, "grand_total"),
+    (AE, "ae_", ae_arrays, ae_defaults, AE_OUTPUTS, "total_earnings"),
+)
+
+
+def _stacked_rules(old, new, prefix):
+    # One rule set for both plans, or None when they differ in structure
+    stacked = dict(old)
+    for key in set(old) | set(new):
+        relevant = key == "min_attainment" or key.startswith(prefix)
+        if not relevant or key.endswith("_inputs"):
+            continue
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if key not in NUMERIC_RULES or before is None or after is None:
+            return None
+        stacked[key] = np.array([[before], [after]], dtype=np.float64)
+    return stacked
+
+
+def _role_outputs(frame, old, new, prefix, arrays, defaults, outputs):
+    """``(old, new)`` dicts of per-rep output arrays for one role."""
+    old_defaults, new_defaults = defaults(old), defaults(new)
+    old_inputs = _inputs(frame, old_defaults)
+    # Inputs only differ where the plans' defaults fill blank cells differently
+    new_inputs = {
+        name: values if new_defaults[name] == old_defaults[name]
+        else _rep_column(frame, name, new_defaults[name])
+        for name, values in old_inputs.items()}
+    rules = _stacked_rules(old, new, prefix)
+    if rules is None:
+        return (arrays(old_inputs, old), arrays(new_inputs, new))
+    data = {name: values if new_inputs[name] is values
+            else np.stack([values, new_inputs[name]])
+            for name, values in old_inputs.items()}
+    both = arrays(data, rules)
+    shape = (2, len(frame))
+    both = {name: np.broadcast_to(both[name], shape) for name in outputs}
+    return ({name: values[0] for name, values in both.items()},
+            {name: values[1] for name, values in both.items()})
+
+
+def diff_payouts(roster, old_plan, new_plan, role=None, components=False):
+    """Per-rep payouts under ``old_plan`` and ``new_plan`` and their difference.
+
+    Returns ``roster`` with ``role`` and ``DIFF_COLUMNS`` added:
+    ``delta`` is new minus old total payout and ``pct_change`` is relative
+    to the old payout (NaN when that is zero). With ``components``, a
+    ``delta_<column>`` is added for every payout component too.
+    """
+    old_rules, new_rules = get_plan(old_plan), get_plan(new_plan)
+    frame = roster.reset_index(drop=True)
+    is_sdr, is_ae = _role_masks(frame, role)
+    size = len(frame)
+    old_payout, new_payout = np.zeros(size), np.zeros(size)
+    deltas = {}
+    for name, prefix, arrays, defaults, outputs, total in _ROLES:
+        mask = is_sdr if name == SDR else is_ae
+        if not mask.any():
+            continue
+        old, new = _role_outputs(frame[mask], old_rules, new_rules, prefix,
+                                 arrays, defaults, outputs)
+        old_payout[mask] = old[total]
+        new_payout[mask] = new[total]
+        if components:
+            for column in outputs:
+                deltas.setdefault(f"delta_{column}", np.full(size, np.nan))
+                deltas[f"delta_{column}"][mask] = new[column] - old[column]
+
+    delta = new_payout - old_payout
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = np.where(old_payout != 0, delta / old_payout, np.nan)
+    result = pd.DataFrame({
+        "role": np.where(is_sdr, SDR, AE),
+        "old_payout": old_payout,
+        "new_payout": new_payout,
+        "delta": delta,
+        "pct_change": pct_change,
+        **deltas,
+    }, index=roster.index)
+    inputs = roster.drop(columns=[c for c in result.columns if c in roster.columns])
+    return pd.concat([inputs, result], axis=1)
+
+
+def _summarize(diff):
+    delta = diff["delta"]
+    old_cost, new_cost = diff["old_payout"].sum(), diff["new_payout"].sum()
+    return {
+        "reps": len(diff),
+        "winners": int((delta >= CHANGE_TOLERANCE).sum()),
+        "losers": int((delta <= -CHANGE_TOLERANCE).sum()),
+        "unchanged": int((delta.abs() < CHANGE_TOLERANCE).sum()),
+        "old_cost": old_cost,
+        "new_cost": new_cost,
+        "cost_change": new_cost - old_cost,
+        "cost_change_pct": (new_cost - old_cost) / old_cost if old_cost
+        else np.nan,
+        "largest_gain": max(delta.max(), 0.0) if len(diff) else 0.0,
+        "largest_loss": min(delta.min(), 0.0) if len(diff) else 0.0,
+    }
+
+
+def diff_summary(diff):
+    """Cost change of a ``diff_payouts`` result, per role and in total.
+
+    One row per role present plus an ``All`` row, with ``SUMMARY_COLUMNS``.
+    """
+    rows = {role: _summarize(group)
+            for role, group in diff.groupby("role", sort=True)}
+    rows["All"] = _summarize(diff)
+    return pd.DataFrame.from_dict(rows, orient="index",
+                                  columns=SUMMARY_COLUMNS)
+
+
+def diff_stored_versions(store, period, old_version, new_version,
+                         components=False):
+    """``diff_payouts`` of a stored period's inputs between two plan versions."""
+    return diff_payouts(store.load_inputs(period), store.load_plan(old_version),
+                        store.load_plan(new_version), components=components)
@@ -0,0 +1,106 @@
+"""Local stand-in queues for deal, SAL and SQL events.
+
+An event is a dict ``{"rep_id", "field", "delta"}`` where ``field`` is one
+of the totals in ``compcalc.incremental.EVENT_FIELDS``. Producers push
+events; consumers call ``read(cursor)`` and get back only the events after
+``cursor`` together with the cursor to pass next time, so every poll is
+proportional to what is new, not to the size of the queue.
+
+Two backends share that interface: ``JsonlEventQueue`` tails an
+append-only JSON-lines file and ``SQLiteEventQueue`` stores events in a
+SQLite table. ``open_queue`` picks one from the file suffix.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def _event(rep_id, field, delta):
+    return {"rep_id": rep_id, "field": field, "delta": float(delta)}
+
+
+class JsonlEventQueue:
+    """Events appended to a JSON-lines file; the cursor is a byte offset."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def push(self, rep_id, field, delta):
+        self.push_many([_event(rep_id, field, delta)])
+
+    def push_many(self, events):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+
+    def read(self, cursor=0, limit=None):
+        """Return ``(events, cursor)`` for complete lines after ``cursor``."""
+        if not os.path.exists(self.path):
+            return [], cursor
+        events = []
+        with open(self.path, "rb") as f:
+            f.seek(cursor)
+            for line in f:
+                # A line still being written has no newline yet; leave it
+                if not line.endswith(b"\n"):
+                    break
+                cursor += len(line)
+                if line.strip():
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # Passed on as text so the consumer can report it
+                        events.append(line.decode("utf-8", "replace").strip())
+                if limit is not None and len(events) >= limit:
+                    break
+        return events, cursor
+
+
+class SQLiteEventQueue:
+    """Events stored in a SQLite table; the cursor is the last row id read."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            # rep_id has no declared type so integer and text ids round-trip
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, rep_id, "
+                "field TEXT NOT NULL, delta REAL NOT NULL, "
+                "created_at REAL NOT NULL)")
+
+    def push(self, rep_id, field, delta):
+        self.push_many([_event(rep_id, field, delta)])
+
+    def push_many(self, events):
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (rep_id, field, delta, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(e["rep_id"], e["field"], e["delta"], now) for e in events])
+
+    def read(self, cursor=0, limit=None):
+        """Return ``(events, cursor)`` for rows with an id after ``cursor``."""
+        rows = self._conn.execute(
+            "SELECT id, rep_id, field, delta FROM events WHERE id > ? "
+            "ORDER BY id LIMIT ?", (cursor, -1 if limit is None else limit))
+        events = []
+        for row_id, rep_id, field, delta in rows:
+            events.append(_event(rep_id, field, delta))
+            cursor = row_id
+        return events, cursor
+
+    def close(self):
+        self._conn.close()
+
+
+def open_queue(path):
+    """A JSON-lines queue for ``.jsonl``/``.ndjson`` paths, else SQLite."""
+    if path.lower().endswith(JSONL_SUFFIXES):
+        return JsonlEventQueue(path)
+    return SQLiteEventQueue(path)
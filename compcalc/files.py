@@ -0,0 +1,74 @@
+"""Chunked CSV/Parquet reading and writing for the batch tools.
+
+pandas and pyarrow are imported only when a file is actually opened, so
+importing this module stays cheap.
+"""
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def is_parquet(path):
+    return str(path).lower().endswith(PARQUET_SUFFIXES)
+
+
+def iter_chunks(path, chunksize, columns=None):
+    """Yield DataFrames of at most ``chunksize`` rows from a CSV or Parquet file.
+
+    ``columns`` limits the read to the named columns.
+    """
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(
+            batch_size=chunksize, columns=columns)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def read_table(path, columns=None):
+    """Read a whole CSV or Parquet file into one DataFrame."""
+    import pandas as pd
+
+    if is_parquet(path):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = is_parquet(path)
+        self._writer = None
+        self._wrote_header = False
+
+    def write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = table.cast(self._writer.schema)
+            self._writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
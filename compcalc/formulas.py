@@ -0,0 +1,289 @@
+"""Scalar SDR and AE compensation formulas.
+
+These are the calculations from the Streamlit pages, lifted out of the
+page scripts so they can be reused without starting a UI.
+
+``make_sdr_evaluator`` and ``make_ae_evaluator`` resolve a plan's rules
+once and return a function of the rep inputs alone, so evaluating many reps
+under one plan does no rule lookups or method dispatch per rep.
+"""
+
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, get_plan, sdr_defaults
+
+
+def enforce_criteria(attainment_rate, commission):
+    # Apply minimum threshold of 50% attainment and cap at 150%
+    if attainment_rate < 0.5:
+        return 0  # No commission if attainment is below 50%
+    effective_attainment_rate = min(attainment_rate, 1.5)  # Cap at 150%
+    return commission * effective_attainment_rate
+
+
+def calculate_pro_rata_bonus(attainment_rate, bonus_amount):
+    if attainment_rate < 0.5:
+        return 0  # No bonus if attainment is below 50%
+    elif attainment_rate >= 1.0:
+        return bonus_amount  # Full bonus at 100% attainment or above
+    else:
+        return bonus_amount * attainment_rate  # Pro-rata bonus
+
+
+def _make_target_bonus(rules):
+    min_attainment = rules["min_attainment"]
+
+    if rules["sdr_target_bonus"] == "attainment":
+        attainment_cap = rules["sdr_attainment_cap"]
+
+        def target_bonus(attainment_rate, bonus_amount):
+            if attainment_rate < min_attainment:
+                return 0
+            return bonus_amount * min(attainment_rate, attainment_cap)
+    else:
+        def target_bonus(attainment_rate, bonus_amount):
+            if attainment_rate < min_attainment:
+                return 0
+            if attainment_rate >= 1.0:
+                return bonus_amount
+            return bonus_amount * attainment_rate
+
+    return target_bonus
+
+
+def make_sdr_evaluator(plan=DEFAULT_PLAN):
+    """Return ``evaluate(inputs)`` computing SDR breakdowns under ``plan``."""
+    rules = get_plan(plan)
+    defaults = sdr_defaults(rules)
+    target_bonus = _make_target_bonus(rules)
+    excess_cap = rules["sdr_excess_cap"]
+    lead_conversion = rules["sdr_lead_conversion"]
+
+    def evaluate(inputs):
+        values = {**defaults, **inputs}
+        sal_target_per_month = values["sal_target_per_month"]
+        sql_target_per_month = values["sql_target_per_month"]
+        total_sals_attained = values["total_sals_attained"]
+        total_sqls_attained = values["total_sqls_attained"]
+
+        # Calculation Logic
+        sal_attainment_rate = total_sals_attained / \
+            sal_target_per_month if sal_target_per_month > 0 else 0
+        sql_attainment_rate = total_sqls_attained / \
+            sql_target_per_month if sql_target_per_month > 0 else 0
+        monthly_base_salary = values["base_salary"] / 12
+
+        # Determine target attainment bonuses
+        base_sal_bonus = target_bonus(
+            sal_attainment_rate, values["bonus_sals_target_attainment"])
+        base_sql_bonus = target_bonus(
+            sql_attainment_rate, values["bonus_sqls_target_attainment"])
+
+        # Caps on excess bonuses
+        max_excess_sals = sal_target_per_month * excess_cap
+        max_excess_sqls = sql_target_per_month * excess_cap
+        excess_sals_count = max(
+            0, min(total_sals_attained - sal_target_per_month, max_excess_sals))
+        excess_sqls_count = max(
+            0, min(total_sqls_attained - sql_target_per_month, max_excess_sqls))
+        excess_sal_bonus = excess_sals_count * values["bonus_per_excess_sal"]
+        excess_sql_bonus = excess_sqls_count * values["bonus_per_excess_sql"]
+
+        # Adjust bonuses based on Lead Conversion Rate
+        if lead_conversion:
+            lead_conversion_rate = values["lead_conversion_rate"]
+            base_sal_bonus *= lead_conversion_rate
+            base_sql_bonus *= lead_conversion_rate
+            excess_sal_bonus *= lead_conversion_rate
+            excess_sql_bonus *= lead_conversion_rate
+
+        # Calculate revenue bonus
+        revenue_bonus = values["total_revenue_assist"] * \
+            values["bonus_on_won_revenue"]
+
+        # Total earnings calculation
+        total_target_attainment_earnings = base_sal_bonus + base_sql_bonus
+        total_excess_earnings = excess_sal_bonus + excess_sql_bonus + revenue_bonus
+        grand_total = total_target_attainment_earnings + \
+            total_excess_earnings + monthly_base_salary
+
+        return {
+            "sal_attainment_rate": sal_attainment_rate,
+            "sql_attainment_rate": sql_attainment_rate,
+            "monthly_base_salary": monthly_base_salary,
+            "base_sal_bonus": base_sal_bonus,
+            "base_sql_bonus": base_sql_bonus,
+            "excess_sals_count": excess_sals_count,
+            "excess_sqls_count": excess_sqls_count,
+            "excess_sal_bonus": excess_sal_bonus,
+            "excess_sql_bonus": excess_sql_bonus,
+            "revenue_bonus": revenue_bonus,
+            "grand_total": grand_total,
+        }
+
+    return evaluate
+
+
+# Each AE commission method returns (standard, accelerated, overachievement,
+# exceptional, total before cap, commission) for an eligible rep.
+
+def _make_accelerator_commission(rules):
+    attainment_cap = rules["ae_attainment_cap"]
+
+    def commission(values, total_sales, monthly_target, attainment_rate):
+        commission_rate = values["commission_rate"]
+        accelerator_threshold = values["accelerator_threshold"]
+        # Cap at 150% for the standard commission
+        standard_commission = (monthly_target * commission_rate) * \
+            min(attainment_rate, attainment_cap)
+        accelerated_commission = 0
+        # Add accelerated commission for sales above the threshold
+        if attainment_rate > accelerator_threshold:
+            accelerated_sales = total_sales - \
+                (monthly_target * accelerator_threshold)
+            accelerated_commission = accelerated_sales * \
+                values["accelerator_rate"]
+        total_commission = standard_commission + accelerated_commission
+        return (standard_commission, accelerated_commission, 0, 0,
+                total_commission, total_commission)
+
+    return commission
+
+
+def _make_capped_commission(rules):
+    def commission(values, total_sales, monthly_target, attainment_rate):
+        commission_rate = values["commission_rate"]
+        accelerator_threshold_sales = monthly_target * \
+            values["accelerator_threshold"]
+        standard_commission = min(
+            total_sales, accelerator_threshold_sales) * commission_rate
+        accelerated_commission = 0
+        if total_sales > accelerator_threshold_sales:
+            accelerated_commission = (
+                total_sales - accelerator_threshold_sales) * values["accelerator_rate"]
+        total_commission = standard_commission + accelerated_commission
+        # Apply commission cap
+        maximum_commission_allowed = monthly_target * commission_rate * \
+            values["commission_cap_multiplier"]
+        return (standard_commission, accelerated_commission, 0, 0,
+                total_commission,
+                min(total_commission, maximum_commission_allowed))
+
+    return commission
+
+
+def _make_tiered_commission(rules):
+    lower, upper = rules["ae_tier_breakpoints"]
+
+    def commission(values, total_sales, monthly_target, attainment_rate):
+        commission_rate = values["commission_rate"]
+        overachievement_commission = 0
+        exceptional_commission = 0
+        if attainment_rate <= lower:
+            # Pro-rata commission
+            standard_commission = total_sales * commission_rate * attainment_rate
+        else:
+            standard_commission = monthly_target * lower * commission_rate
+            if attainment_rate <= upper:
+                overachievement_commission = (
+                    total_sales - monthly_target * lower) * values["overachievement_rate"]
+            else:
+                overachievement_commission = monthly_target * \
+                    (upper - lower) * values["overachievement_rate"]
+                exceptional_commission = (
+                    total_sales - monthly_target * upper) * values["exceptional_rate"]
+        total_commission = standard_commission + \
+            overachievement_commission + exceptional_commission
+        return (standard_commission, 0, overachievement_commission,
+                exceptional_commission, total_commission, total_commission)
+
+    return commission
+
+
+def _make_ladder_commission(rules):
+    # Deferred: the ladder module needs NumPy, which the CLI avoids importing
+    from compcalc.ladder import tier_ladder
+
+    ladder = tier_ladder(rules)
+
+    def commission(values, total_sales, monthly_target, attainment_rate):
+        _, standard_commission, accelerated_commission = ladder.commission(
+            total_sales, monthly_target, attainment_rate)
+        total_commission = standard_commission + accelerated_commission
+        cap = ladder.cap(monthly_target)
+        return (standard_commission, accelerated_commission, 0, 0,
+                total_commission,
+                total_commission if cap is None else min(total_commission, cap))
+
+    return commission
+
+
+AE_COMMISSION_BUILDERS = {
+    "accelerator": _make_accelerator_commission,
+    "capped": _make_capped_commission,
+    "tiered": _make_tiered_commission,
+    "ladder": _make_ladder_commission,
+}
+
+
+def make_ae_evaluator(plan=DEFAULT_PLAN):
+    """Return ``evaluate(inputs)`` computing AE breakdowns under ``plan``."""
+    rules = get_plan(plan)
+    defaults = ae_defaults(rules)
+    min_attainment = rules["min_attainment"]
+    method = rules["ae_commission"]
+    try:
+        commission_fn = AE_COMMISSION_BUILDERS[method](rules)
+    except KeyError:
+        raise ValueError(f"Unknown AE commission method {method!r}") from None
+
+    def evaluate(inputs):
+        values = {**defaults, **inputs}
+        total_sales = values["total_sales"]
+        monthly_target = values["monthly_target"]
+
+        attainment_rate = total_sales / monthly_target if monthly_target > 0 else 0
+        monthly_base_salary = values["base_salary"] / 12
+
+        if attainment_rate >= min_attainment:
+            (standard_commission, accelerated_commission,
+             overachievement_commission, exceptional_commission,
+             total_commission, commission) = commission_fn(
+                values, total_sales, monthly_target, attainment_rate)
+        else:
+            # No commission if attainment is below the eligibility gate
+            standard_commission = accelerated_commission = 0
+            overachievement_commission = exceptional_commission = 0
+            total_commission = commission = 0
+
+        total_earnings = commission + monthly_base_salary
+
+        return {
+            "attainment_rate": attainment_rate,
+            "monthly_base_salary": monthly_base_salary,
+            "standard_commission": standard_commission,
+            "accelerated_commission": accelerated_commission,
+            "overachievement_commission": overachievement_commission,
+            "exceptional_commission": exceptional_commission,
+            "total_commission": total_commission,
+            "commission": commission,
+            "total_earnings": total_earnings,
+        }
+
+    return evaluate
+
+
+def sdr_compensation(inputs, plan=DEFAULT_PLAN):
+    """Compute one SDR's monthly earnings breakdown.
+
+    ``inputs`` uses the variable names from the pages; anything missing
+    falls back to the page defaults.
+    """
+    return make_sdr_evaluator(plan)(inputs)
+
+
+def ae_compensation(inputs, plan=DEFAULT_PLAN):
+    """Compute one AE's monthly earnings breakdown.
+
+    ``inputs`` uses the variable names from the pages; anything missing
+    falls back to the page defaults.
+    """
+    return make_ae_evaluator(plan)(inputs)
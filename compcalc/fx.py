@@ -0,0 +1,138 @@
+"""Conversion of deal amounts into the plan currency.
+
+Rates come from a locally supplied table with one row per (``date``,
+``currency``) giving the ``rate``: how many units of the plan currency one
+unit of ``currency`` buys on that date. The rate applied to a deal is the
+latest one on or before its close ``date``, found by binary search
+(``np.searchsorted``) over that currency's sorted dates. Ledgers without a
+``date`` column use the rate in force at the end of each deal's ``period``;
+those are looked up once per (currency, period) and cached.
+
+Conversion runs per batch over whole arrays, one pass per currency, and
+happens before deals are summed into ``total_sales`` /
+``total_revenue_assist``, so attainment and tiers see plan-currency totals.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.files import read_table
+
+CURRENCY = "currency"
+DATE = "date"
+RATE = "rate"
+PERIOD = "period"
+
+DEFAULT_CURRENCY = "EUR"
+
+
+def _days(values):
+    return pd.to_datetime(pd.Series(values)).to_numpy().astype("datetime64[D]")
+
+
+def _currency_codes(currencies):
+    # Upper-case the distinct codes rather than every row
+    codes, names = pd.factorize(pd.Series(currencies))
+    upper, remap = pd.factorize(pd.Index(names).astype(str).str.upper())
+    return upper[codes], remap
+
+
+class FxTable:
+    """Date-indexed FX rates into one plan currency."""
+
+    def __init__(self, rates, base=DEFAULT_CURRENCY):
+        missing = {DATE, CURRENCY, RATE} - set(rates.columns)
+        if missing:
+            raise ValueError(f"FX table is missing column(s): {sorted(missing)}")
+        frame = pd.DataFrame({
+            DATE: _days(rates[DATE]),
+            CURRENCY: rates[CURRENCY].astype(str).str.upper().to_numpy(),
+            RATE: rates[RATE].to_numpy(dtype=np.float64),
+        })
+        if not (frame[RATE] > 0).all():
+            raise ValueError("FX rates must be positive numbers")
+        frame = frame.sort_values([CURRENCY, DATE], kind="stable")
+        self.base = base.upper()
+        # Per currency: sorted dates and the rate from each date on
+        self._series = {
+            currency: (group[DATE].to_numpy(), group[RATE].to_numpy())
+            for currency, group in frame.groupby(CURRENCY, sort=False)}
+        self._period_rates = {}
+
+    @classmethod
+    def from_file(cls, path, base=DEFAULT_CURRENCY):
+        return cls(read_table(path), base)
+
+    @property
+    def currencies(self):
+        return sorted({self.base, *self._series})
+
+    def rates_on(self, currency, dates):
+        """Rates for ``currency`` in force on each of ``dates``."""
+        currency = currency.upper()
+        dates = _days(dates)
+        if currency == self.base:
+            return np.ones(len(dates))
+        try:
+            days, rates = self._series[currency]
+        except KeyError:
+            raise ValueError(f"No FX rates for currency {currency!r}") from None
+        index = np.searchsorted(days, dates, side="right") - 1
+        if (index < 0).any():
+            raise ValueError(f"No {currency} rate on or before "
+                             f"{dates[index < 0].min()}")
+        return rates[index]
+
+    def period_rate(self, currency, period):
+        """Rate for ``currency`` at the end of ``period`` (e.g. ``2025-03``), cached."""
+        key = (currency.upper(), str(period))
+        rate = self._period_rates.get(key)
+        if rate is None:
+            end = pd.Period(str(period), freq="M").end_time
+            rate = self._period_rates[key] = float(
+                self.rates_on(key[0], [end])[0])
+        return rate
+
+    def convert(self, amounts, currencies, dates=None, periods=None):
+        """Plan-currency values of ``amounts``, by deal ``dates`` or ``periods``."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        codes, names = _currency_codes(currencies)
+        out = np.empty(len(amounts))
+        if dates is not None:
+            dates = _days(dates)
+            for code, currency in enumerate(names):
+                rows = codes == code
+                out[rows] = amounts[rows] * self.rates_on(currency, dates[rows])
+            return out
+        if periods is None:
+            raise ValueError("Pass deal dates or periods to convert")
+        # Few distinct (currency, period) pairs: one cached rate each
+        period_codes, period_names = pd.factorize(pd.Series(periods))
+        pair_index, pairs = pd.factorize(codes * len(period_names) +
+                                         period_codes)
+        rates = np.array([
+            self.period_rate(names[pair // len(period_names)],
+                             period_names[pair % len(period_names)])
+            for pair in pairs])
+        return amounts * rates[pair_index]
+
+
+def convert_deals(deals, fx, amount="amount"):
+    """``deals`` with ``amount`` in the plan currency.
+
+    Deals without a ``currency`` column are taken to be in the plan
+    currency already. Rates apply by close ``date`` when the ledger has
+    one, otherwise by ``period``.
+    """
+    if fx is None or CURRENCY not in deals.columns:
+        return deals
+    if DATE in deals.columns:
+        converted = fx.convert(deals[amount], deals[CURRENCY],
+                               dates=deals[DATE])
+    elif PERIOD in deals.columns:
+        converted = fx.convert(deals[amount], deals[CURRENCY],
+                               periods=deals[PERIOD])
+    else:
+        raise ValueError("Deals in several currencies need a 'date' or "
+                         "'period' column to pick FX rates")
+    return deals.assign(**{amount: converted})
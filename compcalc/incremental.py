@@ -0,0 +1,242 @@
+"""Incremental payout recalculation for live updates.
+
+``IncrementalPayouts`` keeps each rep's running totals, current payout
+breakdown and tier position. A deal, SAL or SQL event adjusts one total and
+re-evaluates only that rep with the compiled scalar plan, so each event
+costs the same however large the roster is. The org-wide total is kept up
+to date by applying the payout delta.
+"""
+
+import numpy as np
+
+from compcalc.batch import AE, SDR, _column
+from compcalc.compiled import compile_plan
+from compcalc.ladder import tier_ladder
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, sdr_defaults
+
+# Totals that events may change, by role
+EVENT_FIELDS = {
+    AE: ("total_sales",),
+    SDR: ("total_sals_attained", "total_sqls_attained", "total_revenue_assist"),
+}
+
+# Tier positions; the names of 2 and up depend on the AE commission method.
+# A ladder's bands are tiers 1 to N, and N + 1 when its cap binds.
+BELOW_GATE = 0
+STANDARD = 1
+AE_TIER_NAMES = {
+    "tiered": ("below_gate", "standard", "overachievement", "exceptional"),
+    "accelerator": ("below_gate", "standard", "accelerated"),
+    "capped": ("below_gate", "standard", "accelerated", "capped"),
+}
+SDR_TIER_NAMES = ("below_gate", "target", "excess")
+
+
+def ae_tier(rules, values, breakdown):
+    """Index of the commission band an AE's attainment currently falls in."""
+    attainment_rate = breakdown["attainment_rate"]
+    if attainment_rate < rules["min_attainment"]:
+        return BELOW_GATE
+    method = rules["ae_commission"]
+    if method == "ladder":
+        ladder = tier_ladder(rules)
+        if breakdown["commission"] < breakdown["total_commission"]:
+            return len(ladder) + 1
+        return ladder.band(attainment_rate) + 1
+    if method == "tiered":
+        lower, upper = rules["ae_tier_breakpoints"]
+        if attainment_rate > upper:
+            return 3
+        return 2 if attainment_rate > lower else STANDARD
+    if method == "capped" and breakdown["commission"] < breakdown["total_commission"]:
+        return 3
+    if attainment_rate > values["accelerator_threshold"]:
+        return 2
+    return STANDARD
+
+
+def sdr_tier(rules, values, breakdown):
+    """0 below the gate on both targets, 1 earning target bonuses, 2 in excess."""
+    if breakdown["excess_sals_count"] > 0 or breakdown["excess_sqls_count"] > 0:
+        return 2
+    gate = rules["min_attainment"]
+    if breakdown["sal_attainment_rate"] < gate and \
+            breakdown["sql_attainment_rate"] < gate:
+        return BELOW_GATE
+    return STANDARD
+
+
+def ae_tiers(rules, payouts):
+    """``ae_tier`` over whole columns of ``compute_payouts`` output."""
+    attainment = np.asarray(payouts["attainment_rate"], dtype=np.float64)
+    method = rules["ae_commission"]
+    if method == "ladder":
+        ladder = tier_ladder(rules)
+        capped = np.asarray(payouts["commission"], dtype=np.float64) < \
+            np.asarray(payouts["total_commission"], dtype=np.float64)
+        tiers = np.where(capped, len(ladder) + 1, ladder.bands(attainment) + 1)
+    elif method == "tiered":
+        lower, upper = rules["ae_tier_breakpoints"]
+        tiers = np.where(attainment > upper, 3,
+                         np.where(attainment > lower, 2, STANDARD))
+    else:
+        threshold = _column(payouts, "accelerator_threshold", ae_defaults(rules))
+        tiers = np.where(attainment > threshold, 2, STANDARD)
+        if method == "capped":
+            capped = np.asarray(payouts["commission"], dtype=np.float64) < \
+                np.asarray(payouts["total_commission"], dtype=np.float64)
+            tiers = np.where(capped, 3, tiers)
+    return np.where(attainment < rules["min_attainment"], BELOW_GATE, tiers)
+
+
+def sdr_tiers(rules, payouts):
+    """``sdr_tier`` over whole columns of ``compute_payouts`` output."""
+    def column(name):
+        return np.asarray(payouts[name], dtype=np.float64)
+
+    gate = rules["min_attainment"]
+    tiers = np.where((column("sal_attainment_rate") < gate) &
+                     (column("sql_attainment_rate") < gate),
+                     BELOW_GATE, STANDARD)
+    excess = (column("excess_sals_count") > 0) | (column("excess_sqls_count") > 0)
+    return np.where(excess, 2, tiers)
+
+
+def payout_tiers(rules, payouts):
+    """Tier position of every row of a mixed-role ``compute_payouts`` frame."""
+    roles = payouts["role"].astype(str).str.upper().to_numpy()
+    tiers = np.zeros(len(payouts), dtype=np.int64)
+    for role, tier in ((AE, ae_tiers), (SDR, sdr_tiers)):
+        rows = roles == role
+        if rows.any():
+            tiers[rows] = tier(rules, payouts[rows])
+    return tiers
+
+
+def tier_names(rules, role):
+    """Names of the tier positions for ``role`` under ``rules``."""
+    if str(role).upper() != AE:
+        return SDR_TIER_NAMES
+    if rules["ae_commission"] == "ladder":
+        bands = len(tier_ladder(rules))
+        return ("below_gate", *(f"band_{band}" for band in range(1, bands + 1)),
+                "capped")
+    return AE_TIER_NAMES[rules["ae_commission"]]
+
+
+class IncrementalPayouts:
+    """Running payouts for a roster, updated one event at a time.
+
+    ``roster`` is a DataFrame (or iterable of dicts) with ``rep_id``,
+    ``role`` and any plan inputs, including starting totals.
+    """
+
+    def __init__(self, roster, plan=DEFAULT_PLAN):
+        self.plan = compile_plan(plan)
+        self.total_payout = 0.0
+        self._defaults = {AE: ae_defaults(self.plan.rules),
+                          SDR: sdr_defaults(self.plan.rules)}
+        self._reps = {}
+        records = roster.to_dict("records") if hasattr(roster, "to_dict") \
+            else roster
+        for record in records:
+            self.add_rep(record)
+
+    def __len__(self):
+        return len(self._reps)
+
+    def __contains__(self, rep_id):
+        return rep_id in self._reps
+
+    def add_rep(self, record):
+        """Start tracking a rep; ``record`` holds rep_id, role and inputs."""
+        record = dict(record)
+        rep_id = record.pop("rep_id")
+        role = str(record.pop("role")).upper()
+        if role not in EVENT_FIELDS:
+            raise ValueError(f"Unknown role {role!r} for rep {rep_id!r}")
+        if rep_id in self._reps:
+            raise ValueError(f"Rep {rep_id!r} is already tracked")
+        # Blank cells (NaN) fall back to the plan defaults
+        inputs = {key: value for key, value in record.items()
+                  if value == value}
+        state = {"role": role, "inputs": inputs}
+        self._evaluate(state)
+        self._reps[rep_id] = state
+        self.total_payout += state["payout"]
+
+    def _evaluate(self, state):
+        rules = self.plan.rules
+        if state["role"] == AE:
+            evaluate, tier, payout_field = self.plan.ae, ae_tier, "total_earnings"
+        else:
+            evaluate, tier, payout_field = self.plan.sdr, sdr_tier, "grand_total"
+        breakdown = evaluate(state["inputs"])
+        values = {**self._defaults[state["role"]], **state["inputs"]}
+        state["breakdown"] = breakdown
+        state["payout"] = breakdown[payout_field]
+        state["tier"] = tier(rules, values, breakdown)
+
+    def apply(self, rep_id, field, delta):
+        """Add ``delta`` to one of a rep's totals (negative for corrections).
+
+        Returns a change record with the old and new payout and tier.
+        """
+        state = self._state(rep_id, field)
+        current = state["inputs"].get(field, 0)
+        return self._update(rep_id, state, field, current + delta)
+
+    def set(self, rep_id, field, value):
+        """Replace one of a rep's totals outright."""
+        return self._update(rep_id, self._state(rep_id, field), field, value)
+
+    def _state(self, rep_id, field):
+        try:
+            state = self._reps[rep_id]
+        except KeyError:
+            raise KeyError(f"Unknown rep {rep_id!r}") from None
+        if field not in EVENT_FIELDS[state["role"]]:
+            raise ValueError(
+                f"{state['role']} events can change {EVENT_FIELDS[state['role']]}, "
+                f"not {field!r}")
+        return state
+
+    def _update(self, rep_id, state, field, value):
+        old_payout, old_tier = state["payout"], state["tier"]
+        state["inputs"][field] = value
+        self._evaluate(state)
+        delta = state["payout"] - old_payout
+        self.total_payout += delta
+        return {
+            "rep_id": rep_id,
+            "role": state["role"],
+            "field": field,
+            "value": value,
+            "old_payout": old_payout,
+            "payout": state["payout"],
+            "delta": delta,
+            "old_tier": old_tier,
+            "tier": state["tier"],
+        }
+
+    def payout(self, rep_id):
+        return self._reps[rep_id]["payout"]
+
+    def role(self, rep_id):
+        return self._reps[rep_id]["role"]
+
+    def tier(self, rep_id):
+        return self._reps[rep_id]["tier"]
+
+    def tier_name(self, rep_id):
+        state = self._reps[rep_id]
+        return tier_names(self.plan.rules, state["role"])[state["tier"]]
+
+    def breakdown(self, rep_id):
+        return dict(self._reps[rep_id]["breakdown"])
+
+    def inputs(self, rep_id):
+        return dict(self._reps[rep_id]["inputs"])
+
+    def rep_ids(self):
+        return list(self._reps)
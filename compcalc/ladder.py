@@ -0,0 +1,110 @@
+"""N-tier commission ladders.
+
+A ladder plan (``"ae_commission": "ladder"``) pays each slice of sales at
+the rate of the attainment band it falls in::
+
+    "ae_ladder": {
+        "breakpoints": [1.0, 1.5, 2.0],
+        "rates": [0.05, 0.075, 0.10, 0.12],
+        "cap_multiplier": 4.0
+    }
+
+``breakpoints`` are attainment levels splitting the bands; there is one
+more rate than breakpoints. ``cap_multiplier``, when given, caps the
+commission at ``monthly_target * rates[0] * cap_multiplier`` the way the
+``capped`` plan does. The rates are plan-wide, so the payout at the start of
+every band is worked out once per plan; a rep's commission is then one
+binary search over the breakpoints (``np.searchsorted``) and one
+multiply-add, however many tiers the ladder has.
+"""
+
+import bisect
+from functools import lru_cache
+
+import numpy as np
+
+
+def _attainment(total_sales, monthly_target):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(monthly_target > 0, total_sales / monthly_target, 0.0)
+
+
+class TierLadder:
+    """Band edges, marginal rates and cumulative band payouts of a ladder."""
+
+    __slots__ = ("edges", "rates", "cumulative", "cap_multiplier",
+                 "_edges", "_rates", "_cumulative")
+
+    def __init__(self, breakpoints, rates, cap_multiplier=None):
+        # Plain numbers (or Fractions, for exact money) for the scalar path
+        self.edges = (0, *breakpoints)
+        self.rates = tuple(rates)
+        cumulative = [0]
+        for rate, start, end in zip(self.rates, self.edges, self.edges[1:]):
+            cumulative.append(cumulative[-1] + rate * (end - start))
+        # Commission per unit of monthly target at the start of each band
+        self.cumulative = tuple(cumulative)
+        self.cap_multiplier = cap_multiplier
+        self._edges = np.array(self.edges, dtype=np.float64)
+        self._rates = np.array(self.rates, dtype=np.float64)
+        self._cumulative = np.array(self.cumulative, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.rates)
+
+    def band(self, attainment_rate):
+        """Index of the band one attainment rate falls in."""
+        return max(bisect.bisect_right(self.edges, attainment_rate) - 1, 0)
+
+    def bands(self, attainment_rate):
+        """Band index of every attainment rate in an array."""
+        return np.maximum(np.searchsorted(
+            self._edges, attainment_rate, side="right") - 1, 0)
+
+    def commission(self, total_sales, monthly_target, attainment_rate):
+        """``(band, standard, above_standard)`` commission for one rep."""
+        band = self.band(attainment_rate)
+        total = monthly_target * self.cumulative[band] + self.rates[band] * \
+            (total_sales - monthly_target * self.edges[band])
+        standard = self.rates[0] * (total_sales if len(self) == 1 else
+                                    min(total_sales,
+                                        monthly_target * self.edges[1]))
+        return band, standard, total - standard
+
+    def commission_arrays(self, total_sales, monthly_target, attainment_rate):
+        """``commission`` over arrays: one search and one multiply-add."""
+        band = self.bands(attainment_rate)
+        total = monthly_target * self._cumulative[band] + self._rates[band] * \
+            (total_sales - monthly_target * self._edges[band])
+        standard = self._rates[0] * (total_sales if len(self) == 1 else
+                                     np.minimum(total_sales,
+                                                monthly_target * self._edges[1]))
+        return band, standard, total - standard
+
+    def total_at(self, total_sales, monthly_target):
+        """Uncapped commission at ``total_sales``, over arrays."""
+        _, standard, above = self.commission_arrays(
+            total_sales, monthly_target, _attainment(total_sales, monthly_target))
+        return standard + above
+
+    def rate_at(self, total_sales, monthly_target):
+        """Marginal commission rate at ``total_sales``, over arrays."""
+        return self._rates[self.bands(_attainment(total_sales, monthly_target))]
+
+    def cap(self, monthly_target):
+        """Most commission a rep can earn, or None when uncapped."""
+        if self.cap_multiplier is None:
+            return None
+        return monthly_target * self.rates[0] * self.cap_multiplier
+
+
+@lru_cache(maxsize=64)
+def _ladder(breakpoints, rates, cap_multiplier):
+    return TierLadder(breakpoints, rates, cap_multiplier)
+
+
+def tier_ladder(rules):
+    """The ``TierLadder`` of a ladder plan's rules, built once per ladder."""
+    spec = rules["ae_ladder"]
+    return _ladder(tuple(spec.get("breakpoints", ())), tuple(spec["rates"]),
+                   spec.get("cap_multiplier"))
@@ -0,0 +1,134 @@
+"""Ranked live leaderboard maintained from payout events.
+
+``Leaderboard`` wraps ``IncrementalPayouts`` and keeps every rep in a list
+sorted by payout (highest first, ties by rep id, then roster order). An
+event re-evaluates one rep and moves its entry with two binary searches, so
+ranks are never recomputed by sorting the roster. ``consume`` returns one diff per rep that
+changed, which is all a page needs to redraw. Events that cannot be applied
+(unknown rep, a field the rep's role does not have, a missing or non-finite
+delta) are skipped and kept in ``skipped`` with the reason, so one bad
+producer cannot stall the board.
+"""
+
+import math
+import numbers
+from bisect import bisect_left, insort
+
+from compcalc.batch import AE
+from compcalc.incremental import EVENT_FIELDS, IncrementalPayouts
+from compcalc.plans import DEFAULT_PLAN
+
+
+def attainment(role, breakdown):
+    """AE attainment rate, or the mean of an SDR's SAL and SQL attainment."""
+    if role == AE:
+        return breakdown["attainment_rate"]
+    return (breakdown["sal_attainment_rate"] +
+            breakdown["sql_attainment_rate"]) / 2
+
+
+class Leaderboard:
+    """Reps ranked by current payout, updated one event at a time."""
+
+    def __init__(self, roster, plan=DEFAULT_PLAN):
+        self.live = IncrementalPayouts(roster, plan)
+        # Keys end with the rep's roster position rather than the rep_id,
+        # which may mix types (1 and "1") that cannot be compared
+        self._rep_ids = self.live.rep_ids()
+        self._positions = {rep_id: position
+                           for position, rep_id in enumerate(self._rep_ids)}
+        self._keys = {rep_id: self._key(rep_id)
+                      for rep_id in self.live.rep_ids()}
+        self._ranked = sorted(self._keys.values())
+        # (event, reason) for every event the last ``consume`` skipped
+        self.skipped = []
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def _key(self, rep_id):
+        return (-self.live.payout(rep_id), str(rep_id),
+                self._positions[rep_id])
+
+    def rank(self, rep_id):
+        """1-based position of ``rep_id``."""
+        return bisect_left(self._ranked, self._keys[rep_id]) + 1
+
+    def _row(self, rep_id):
+        breakdown = self.live.breakdown(rep_id)
+        role = self.live.role(rep_id)
+        return {
+            "rep_id": rep_id,
+            "role": role,
+            "payout": self.live.payout(rep_id),
+            "attainment_rate": attainment(role, breakdown),
+            "tier": self.live.tier_name(rep_id),
+        }
+
+    def apply(self, rep_id, field, delta):
+        """Apply one event and move the rep to its new position."""
+        change = self.live.apply(rep_id, field, delta)
+        old_key = self._keys[rep_id]
+        new_key = self._key(rep_id)
+        if new_key != old_key:
+            del self._ranked[bisect_left(self._ranked, old_key)]
+            insort(self._ranked, new_key)
+            self._keys[rep_id] = new_key
+        return change
+
+    def _problem(self, event):
+        # Why ``event`` cannot be applied, or None when it can
+        if not isinstance(event, dict):
+            return "not an event object"
+        missing = {"rep_id", "field", "delta"} - set(event)
+        if missing:
+            return f"missing {sorted(missing)}"
+        rep_id = event["rep_id"]
+        if rep_id not in self._keys:
+            return f"unknown rep {rep_id!r}"
+        role = self.live.role(rep_id)
+        if event["field"] not in EVENT_FIELDS[role]:
+            return f"{role} events cannot change {event['field']!r}"
+        delta = event["delta"]
+        if isinstance(delta, bool) or not isinstance(delta, numbers.Real) \
+                or not math.isfinite(delta):
+            return f"delta {delta!r} is not a finite number"
+        return None
+
+    def consume(self, events):
+        """Apply a batch of events and return one diff per changed rep.
+
+        Each diff is the rep's current row plus ``rank``, ``old_rank``,
+        ``old_payout`` and ``delta`` measured across the whole batch.
+        Events that cannot be applied are left out and listed in
+        ``skipped``.
+        """
+        before = {}
+        self.skipped = []
+        for event in events:
+            problem = self._problem(event)
+            if problem is not None:
+                self.skipped.append((event, problem))
+                continue
+            rep_id = event["rep_id"]
+            if rep_id not in before:
+                before[rep_id] = (self.rank(rep_id), self.live.payout(rep_id))
+            self.apply(rep_id, event["field"], event["delta"])
+        diffs = []
+        for rep_id, (old_rank, old_payout) in before.items():
+            row = self._row(rep_id)
+            row.update(rank=self.rank(rep_id), old_rank=old_rank,
+                       old_payout=old_payout,
+                       delta=row["payout"] - old_payout)
+            diffs.append(row)
+        diffs.sort(key=lambda diff: diff["rank"])
+        return diffs
+
+    def top(self, n=10):
+        """The first ``n`` rows of the leaderboard, best first."""
+        return [dict(self._row(self._rep_ids[key[2]]), rank=rank)
+                for rank, key in enumerate(self._ranked[:n], start=1)]
+
+    @property
+    def total_payout(self):
+        return self.live.total_payout
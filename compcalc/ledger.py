@@ -0,0 +1,101 @@
+"""Streaming aggregation of deal-level ledgers into per-rep totals.
+
+A ledger has one row per closed deal with at least a rep id, a period and
+an amount. It is read in chunks and reduced to one running total per
+(rep, period), so memory grows with the number of rep-periods rather than
+the number of deals. The totals then become ``total_sales`` for AEs and
+``total_revenue_assist`` for SDRs and go through the normal batch engine.
+"""
+
+import pandas as pd
+
+from compcalc.batch import AE, SDR, compute_payouts
+from compcalc.files import iter_chunks
+from compcalc.fx import convert_deals
+from compcalc.plans import DEFAULT_PLAN
+
+REP_KEY = "rep_id"
+PERIOD_KEY = "period"
+AMOUNT = "amount"
+
+# Where a rep's credited deal total lands, by role
+TOTAL_COLUMN_BY_ROLE = {AE: "total_sales", SDR: "total_revenue_assist"}
+
+
+def aggregate_chunks(chunks, keys=(REP_KEY, PERIOD_KEY), amount=AMOUNT):
+    """Sum ``amount`` per ``keys`` across an iterable of DataFrame chunks.
+
+    Returns a DataFrame with the key columns, ``total_amount`` and
+    ``deal_count``. Only the running per-key totals are held in memory.
+    """
+    keys = list(keys)
+    running = None
+    for chunk in chunks:
+        partial = chunk.groupby(keys, sort=False)[amount].agg(["sum", "count"])
+        running = partial if running is None \
+            else running.add(partial, fill_value=0)
+    if running is None:
+        return pd.DataFrame(columns=keys + ["total_amount", "deal_count"])
+    running = running.rename(columns={"sum": "total_amount",
+                                      "count": "deal_count"})
+    running["deal_count"] = running["deal_count"].astype("int64")
+    return running.sort_index().reset_index()
+
+
+def aggregate_ledger(path, chunksize=1_000_000, keys=(REP_KEY, PERIOD_KEY),
+                     amount=AMOUNT, fx=None):
+    """Stream a CSV or Parquet ledger and return per-key deal totals.
+
+    With an ``fx`` table, each chunk's amounts are converted to the plan
+    currency before they are summed.
+    """
+    if fx is None:
+        chunks = iter_chunks(path, chunksize, columns=list(keys) + [amount])
+    else:
+        chunks = (convert_deals(chunk, fx, amount)
+                  for chunk in iter_chunks(path, chunksize))
+    return aggregate_chunks(chunks, keys=keys, amount=amount)
+
+
+def apply_totals(roster, totals):
+    """Join per-rep deal totals onto a roster ready for the batch engine.
+
+    ``roster`` has one row per rep (or per rep and period, when it carries a
+    ``period`` column) with a ``role`` column and the plan inputs. Reps with
+    no deals get a total of zero. A roster without periods can only take
+    totals for a single period; raises ``ValueError`` when the totals span
+    several, or when a rep (-period) appears twice on either side.
+    """
+    if PERIOD_KEY in roster.columns:
+        on = [REP_KEY, PERIOD_KEY]
+    else:
+        on = [REP_KEY]
+        if PERIOD_KEY in totals.columns:
+            periods = totals[PERIOD_KEY].unique()
+            if len(periods) > 1:
+                raise ValueError(
+                    f"The ledger covers {len(periods)} periods but the roster "
+                    f"has no '{PERIOD_KEY}' column; add one, or pass a "
+                    f"single period's deals")
+            totals = totals.drop(columns=PERIOD_KEY)
+    try:
+        merged = roster.merge(totals, on=on, how="left", validate="one_to_one")
+    except pd.errors.MergeError:
+        raise ValueError(f"Roster rows must be unique per {on}") from None
+    merged["total_amount"] = merged["total_amount"].fillna(0.0)
+    merged["deal_count"] = merged["deal_count"].fillna(0).astype("int64")
+
+    roles = merged["role"].astype(str).str.upper()
+    for role, column in TOTAL_COLUMN_BY_ROLE.items():
+        if column not in merged.columns:
+            merged[column] = 0.0
+        merged.loc[roles == role, column] = merged.loc[roles == role,
+                                                       "total_amount"]
+    return merged
+
+
+def ledger_payouts(ledger_path, roster, plan=DEFAULT_PLAN,
+                   chunksize=1_000_000, fx=None):
+    """Compute payouts for ``roster`` from the deals in ``ledger_path``."""
+    totals = aggregate_ledger(ledger_path, chunksize=chunksize, fx=fx)
+    return compute_payouts(apply_totals(roster, totals), plan)
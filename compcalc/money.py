@@ -0,0 +1,529 @@
+"""Exact money arithmetic for payroll reconciliation.
+
+The float formulas drift by fractions of a cent across thousands of reps.
+In exact mode every money component (base salary, each bonus and
+commission band) is computed as an exact rational number and rounded once
+to the cent by its own rounding rule; totals are the sums of the rounded
+components, so they reconcile line by line.
+
+Inputs are quantized first: money to the cent, rates, thresholds and plan
+breakpoints to the millionth (7.5% is 0.075000), SAL/SQL counts to whole
+numbers.
+
+Two implementations produce identical cents:
+
+- ``exact_sdr_compensation``/``exact_ae_compensation`` evaluate one rep
+  with ``fractions.Fraction`` through the ordinary plan evaluators and
+  return ``decimal.Decimal`` amounts;
+- ``exact_sdr_arrays``/``exact_ae_arrays``/``exact_payouts`` work on int64
+  cents with NumPy, for rosters. Intermediate products are split so they fit
+  in 64 bits for amounts up to ``MAX_CENTS`` per rep-month.
+"""
+
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import AE, SDR
+from compcalc.formulas import make_ae_evaluator, make_sdr_evaluator
+from compcalc.ladder import tier_ladder
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, get_plan, sdr_defaults
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN)
+
+# Each money component and the rule it is rounded to the cent with
+SDR_ROUNDING = {
+    "monthly_base_salary": ROUND_HALF_UP,
+    "base_sal_bonus": ROUND_HALF_UP,
+    "base_sql_bonus": ROUND_HALF_UP,
+    "excess_sal_bonus": ROUND_HALF_UP,
+    "excess_sql_bonus": ROUND_HALF_UP,
+    "revenue_bonus": ROUND_HALF_UP,
+}
+AE_ROUNDING = {
+    "monthly_base_salary": ROUND_HALF_UP,
+    "standard_commission": ROUND_HALF_UP,
+    "accelerated_commission": ROUND_HALF_UP,
+    "overachievement_commission": ROUND_HALF_UP,
+    "exceptional_commission": ROUND_HALF_UP,
+    "commission_cap": ROUND_HALF_UP,
+}
+
+MONEY_INPUTS = {
+    "base_salary", "bonus_sals_target_attainment", "bonus_per_excess_sal",
+    "bonus_sqls_target_attainment", "bonus_per_excess_sql",
+    "total_revenue_assist", "monthly_target", "total_sales",
+}
+COUNT_INPUTS = {
+    "sal_target_per_month", "sql_target_per_month", "total_sals_attained",
+    "total_sqls_attained",
+}
+RULE_NUMBERS = ("min_attainment", "sdr_excess_cap", "sdr_attainment_cap",
+                "ae_attainment_cap")
+
+CENTS = 100
+PPM = 1_000_000
+
+# Largest sales or target the int64 path accepts (EUR 30M per rep-month)
+MAX_CENTS = 3_000_000_000
+# Largest rate, threshold or multiplier it accepts (460%)
+MAX_RATE = 4.6
+
+
+def _rounding(defaults, rounding):
+    rules = {**defaults, **(rounding or {})}
+    for name, mode in rules.items():
+        if name not in defaults:
+            raise ValueError(f"Unknown money component {name!r}")
+        if mode not in ROUNDING_MODES:
+            raise ValueError(f"Rounding for {name} must be one of {ROUNDING_MODES}")
+    return rules
+
+
+def _round_quotient(quotient, remainder, divisor, mode):
+    """Round ``quotient + remainder / divisor`` to an integer under ``mode``.
+
+    Works on Python ints and NumPy int64 arrays alike.
+    """
+    if mode == ROUND_DOWN:
+        return quotient
+    twice = 2 * remainder
+    if mode == ROUND_HALF_UP:
+        return quotient + (twice >= divisor)
+    return quotient + ((twice > divisor) |
+                       ((twice == divisor) & (quotient % 2 == 1)))
+
+
+def _round_div(numerator, divisor, mode):
+    return _round_quotient(numerator // divisor, numerator % divisor,
+                           divisor, mode)
+
+
+# ---------------------------------------------------------------- scalar ---
+
+def _units(value, scale):
+    # Floats are quantized the same way as the NumPy path; exact types exactly
+    if isinstance(value, float):
+        return int(np.rint(value * scale))
+    return int((Decimal(str(value)) * scale).quantize(1, ROUND_HALF_EVEN))
+
+
+def _exact_inputs(values):
+    exact = {}
+    for name, value in values.items():
+        if name in MONEY_INPUTS:
+            exact[name] = Fraction(_units(value, CENTS), CENTS)
+        elif name in COUNT_INPUTS:
+            exact[name] = Fraction(_units(value, 1))
+        else:
+            exact[name] = Fraction(_units(value, PPM), PPM)
+    return exact
+
+
+def _exact_rules(rules):
+    exact = dict(rules)
+    for name in RULE_NUMBERS:
+        if name in exact:
+            exact[name] = Fraction(_units(exact[name], PPM), PPM)
+    if "ae_tier_breakpoints" in exact:
+        exact["ae_tier_breakpoints"] = tuple(
+            Fraction(_units(value, PPM), PPM)
+            for value in exact["ae_tier_breakpoints"])
+    if "ae_ladder" in exact:
+        exact["ae_ladder"] = {
+            key: value if value is None else
+            Fraction(_units(value, PPM), PPM) if key == "cap_multiplier" else
+            tuple(Fraction(_units(item, PPM), PPM) for item in value)
+            for key, value in exact["ae_ladder"].items()}
+    return exact
+
+
+def _to_cents(amount, mode):
+    amount = Fraction(amount) * CENTS
+    return _round_div(amount.numerator, amount.denominator, mode)
+
+
+def _decimal(cents):
+    return Decimal(cents).scaleb(-2)
+
+
+def exact_sdr_compensation(inputs, plan=DEFAULT_PLAN, rounding=None):
+    """One SDR's breakdown with every money component exact to the cent.
+
+    Money values are ``Decimal``; attainment rates are floats.
+    """
+    rules = get_plan(plan)
+    modes = _rounding(SDR_ROUNDING, rounding)
+    values = _exact_inputs({**sdr_defaults(rules), **inputs})
+    raw = make_sdr_evaluator(_exact_rules(rules))(values)
+    cents = {name: _to_cents(raw[name], mode) for name, mode in modes.items()}
+    breakdown = {name: _decimal(value) for name, value in cents.items()}
+    breakdown.update(
+        sal_attainment_rate=float(raw["sal_attainment_rate"]),
+        sql_attainment_rate=float(raw["sql_attainment_rate"]),
+        excess_sals_count=Decimal(raw["excess_sals_count"].numerator) /
+        raw["excess_sals_count"].denominator,
+        excess_sqls_count=Decimal(raw["excess_sqls_count"].numerator) /
+        raw["excess_sqls_count"].denominator,
+        grand_total=_decimal(sum(cents.values())),
+    )
+    return breakdown
+
+
+def exact_ae_compensation(inputs, plan=DEFAULT_PLAN, rounding=None):
+    """One AE's breakdown with every money component exact to the cent.
+
+    Money values are ``Decimal``; the attainment rate is a float. The
+    capped plan compares the rounded commission with the rounded cap.
+    """
+    rules = get_plan(plan)
+    modes = _rounding(AE_ROUNDING, rounding)
+    values = _exact_inputs({**ae_defaults(rules), **inputs})
+    raw = make_ae_evaluator(_exact_rules(rules))(values)
+    bands = [name for name in modes if name.endswith("_commission")]
+    cents = {name: _to_cents(raw[name], modes[name])
+             for name in ["monthly_base_salary"] + bands}
+    total_commission = sum(cents[name] for name in bands)
+    commission = total_commission
+    cap = None
+    if rules["ae_commission"] == "capped":
+        cap = values["monthly_target"] * values["commission_rate"] * \
+            values["commission_cap_multiplier"]
+    elif rules["ae_commission"] == "ladder":
+        cap = tier_ladder(_exact_rules(rules)).cap(values["monthly_target"])
+    if cap is not None and raw["commission"] > 0:
+        commission = min(total_commission,
+                         _to_cents(cap, modes["commission_cap"]))
+    breakdown = {name: _decimal(value) for name, value in cents.items()}
+    breakdown.update(
+        attainment_rate=float(raw["attainment_rate"]),
+        total_commission=_decimal(total_commission),
+        commission=_decimal(commission),
+        total_earnings=_decimal(commission + cents["monthly_base_salary"]),
+    )
+    return breakdown
+
+
+# ----------------------------------------------------------------- batch ---
+
+def _mul_divmod(a, b, divisor):
+    # Quotient and remainder of a * b / divisor without forming a * b
+    high, low = np.divmod(a, divisor)
+    quotient, remainder = np.divmod(low * b, divisor)
+    return high * b + quotient, remainder
+
+
+def _mul_div(a, b, divisor, mode):
+    """``round(a * b / divisor)`` in int64 without forming ``a * b``.
+
+    Needs ``divisor * b`` to fit in 62 bits.
+    """
+    return _round_quotient(*_mul_divmod(a, b, divisor), divisor, mode)
+
+
+def _ladder_cents(rules, sales_ppm, target, modes):
+    # Each band's slice exactly, summed before the one rounding per component
+    ladder = rules["ae_ladder"]
+    edges = [0, *(_ppm_rule(value) for value in ladder["breakpoints"]), None]
+    rates = [_ppm_rule(value) for value in ladder["rates"]]
+    divisor = PPM * PPM
+    quotient = remainder = 0
+    for rate, start, end in zip(rates[1:], edges[1:], edges[2:]):
+        band = np.maximum(sales_ppm - start * target, 0)
+        if end is not None:
+            band = np.minimum(band, (end - start) * target)
+        part, rest = _mul_divmod(band, rate, divisor)
+        quotient, remainder = quotient + part, remainder + rest
+    carry, remainder = np.divmod(remainder, divisor)
+    accelerated = _round_quotient(quotient + carry, remainder, divisor,
+                                  modes["accelerated_commission"])
+    first = sales_ppm if edges[1] is None else \
+        np.minimum(sales_ppm, edges[1] * target)
+    standard = _mul_div(first, rates[0], divisor, modes["standard_commission"])
+    cap = None
+    if ladder.get("cap_multiplier") is not None:
+        cap = _mul_div(target * _ppm_rule(ladder["cap_multiplier"]), rates[0],
+                       divisor, modes["commission_cap"])
+    return standard, accelerated, cap
+
+
+def _int_column(data, name, defaults, scale, limit=None):
+    if name in data:
+        values = np.asarray(data[name], dtype=np.float64)
+        values = np.where(np.isnan(values), defaults[name], values)
+    else:
+        values = np.float64(defaults[name])
+    units = np.rint(values * scale)
+    if limit is not None and np.any(units > limit * scale):
+        raise ValueError(f"{name} exceeds the exact-mode limit of {limit:,}")
+    if np.any(units < 0):
+        raise ValueError(f"{name} must not be negative in exact mode")
+    return units.astype(np.int64)
+
+
+def _money(data, name, defaults):
+    return _int_column(data, name, defaults, CENTS, MAX_CENTS // CENTS)
+
+
+def _rate(data, name, defaults):
+    return _int_column(data, name, defaults, PPM, MAX_RATE)
+
+
+def _count(data, name, defaults):
+    return _int_column(data, name, defaults, 1)
+
+
+def _ppm_rule(value):
+    if value > MAX_RATE:
+        raise ValueError(f"Plan value {value} exceeds the exact-mode limit "
+                         f"of {MAX_RATE}")
+    return int(round(value * PPM))
+
+
+def _rule(rules, name):
+    return int(round(rules[name] * PPM))
+
+
+def _target_bonus_cents(rules, attained, target, bonus, lead_ppm, mode):
+    # Exact target bonus, times the lead conversion rate when it applies
+    safe_target = np.maximum(target, 1)
+    eligible = (target > 0) & (attained * PPM >= _rule(rules, "min_attainment")
+                               * target)
+    if rules["sdr_target_bonus"] == "attainment":
+        cap = _rule(rules, "sdr_attainment_cap")
+        capped = attained * PPM > cap * target
+        # bonus * min(attainment, cap) as numerator / denominator
+        numerator = bonus * np.where(capped, cap, attained)
+        denominator = np.where(capped, PPM, safe_target)
+    else:
+        full = attained >= target
+        numerator = bonus * np.where(full, 1, attained)
+        denominator = np.where(full, 1, safe_target)
+    if lead_ppm is None:
+        value = _mul_div(numerator, 1, denominator, mode)
+    else:
+        value = _mul_div(numerator, lead_ppm, denominator * PPM, mode)
+    return np.where(eligible, value, 0)
+
+
+def _excess_cents(rules, attained, target, per_excess, lead_ppm, mode):
+    # Excess count in millionths, so a cap of half an odd target stays exact
+    count = np.maximum(0, np.minimum((attained - target) * PPM,
+                                     target * _rule(rules, "sdr_excess_cap")))
+    if lead_ppm is None:
+        return _mul_div(count * per_excess, 1, PPM, mode)
+    return _mul_div(count * per_excess, lead_ppm, PPM * PPM, mode)
+
+
+def exact_sdr_arrays(data, plan=DEFAULT_PLAN, rounding=None):
+    """Vectorized exact SDR breakdowns; money outputs are int64 cents."""
+    rules = get_plan(plan)
+    modes = _rounding(SDR_ROUNDING, rounding)
+    defaults = sdr_defaults(rules)
+    sals = _count(data, "total_sals_attained", defaults)
+    sqls = _count(data, "total_sqls_attained", defaults)
+    sal_target = _count(data, "sal_target_per_month", defaults)
+    sql_target = _count(data, "sql_target_per_month", defaults)
+    lead_ppm = _rate(data, "lead_conversion_rate", defaults) \
+        if rules["sdr_lead_conversion"] else None
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sal_attainment_rate = np.where(sal_target > 0, sals / sal_target, 0.0)
+        sql_attainment_rate = np.where(sql_target > 0, sqls / sql_target, 0.0)
+    cents = {
+        "monthly_base_salary": _round_div(
+            _money(data, "base_salary", defaults), 12,
+            modes["monthly_base_salary"]),
+        "base_sal_bonus": _target_bonus_cents(
+            rules, sals, sal_target,
+            _money(data, "bonus_sals_target_attainment", defaults), lead_ppm,
+            modes["base_sal_bonus"]),
+        "base_sql_bonus": _target_bonus_cents(
+            rules, sqls, sql_target,
+            _money(data, "bonus_sqls_target_attainment", defaults), lead_ppm,
+            modes["base_sql_bonus"]),
+        "excess_sal_bonus": _excess_cents(
+            rules, sals, sal_target,
+            _money(data, "bonus_per_excess_sal", defaults), lead_ppm,
+            modes["excess_sal_bonus"]),
+        "excess_sql_bonus": _excess_cents(
+            rules, sqls, sql_target,
+            _money(data, "bonus_per_excess_sql", defaults), lead_ppm,
+            modes["excess_sql_bonus"]),
+        "revenue_bonus": _mul_div(
+            _money(data, "total_revenue_assist", defaults),
+            _rate(data, "bonus_on_won_revenue", defaults), PPM,
+            modes["revenue_bonus"]),
+    }
+    excess_cap = _rule(rules, "sdr_excess_cap")
+    return {
+        "sal_attainment_rate": sal_attainment_rate,
+        "sql_attainment_rate": sql_attainment_rate,
+        "excess_sals_count": np.maximum(0, np.minimum(
+            (sals - sal_target) * PPM, sal_target * excess_cap)) / PPM,
+        "excess_sqls_count": np.maximum(0, np.minimum(
+            (sqls - sql_target) * PPM, sql_target * excess_cap)) / PPM,
+        **cents,
+        "grand_total": sum(cents.values()),
+    }
+
+
+def _quadratic_band_cents(sales, target, rate, mode):
+    # rate * sales**2 / target, i.e. the tiered plan's pro-rata band
+    safe_target = np.maximum(target, 1)
+    quotient, remainder = np.divmod(sales * sales, safe_target)
+    high, low = np.divmod(quotient * rate, PPM)
+    numerator = low * safe_target + remainder * rate
+    extra, rest = np.divmod(numerator, safe_target * PPM)
+    return _round_quotient(high + extra, rest, safe_target * PPM, mode)
+
+
+def exact_ae_arrays(data, plan=DEFAULT_PLAN, rounding=None):
+    """Vectorized exact AE breakdowns; money outputs are int64 cents."""
+    rules = get_plan(plan)
+    modes = _rounding(AE_ROUNDING, rounding)
+    defaults = ae_defaults(rules)
+    sales = _money(data, "total_sales", defaults)
+    target = _money(data, "monthly_target", defaults)
+    rate = _rate(data, "commission_rate", defaults)
+    sales_ppm = sales * PPM
+    zero = np.zeros(np.broadcast(sales, target, rate).shape, dtype=np.int64)
+
+    standard = accelerated = overachievement = exceptional = zero
+    cap = None
+    method = rules["ae_commission"]
+    if method == "ladder":
+        standard, accelerated, cap = _ladder_cents(rules, sales_ppm, target,
+                                                   modes)
+    elif method == "tiered":
+        lower, upper = (int(round(value * PPM))
+                        for value in rules["ae_tier_breakpoints"])
+        over_rate = _rate(data, "overachievement_rate", defaults)
+        exceptional_rate = _rate(data, "exceptional_rate", defaults)
+        in_first = sales_ppm <= lower * target
+        in_second = ~in_first & (sales_ppm <= upper * target)
+        in_third = ~in_first & ~in_second
+        standard = np.where(
+            in_first, _quadratic_band_cents(sales, target, rate,
+                                            modes["standard_commission"]),
+            _mul_div(target * lower, rate, PPM * PPM,
+                     modes["standard_commission"]))
+        overachievement = np.where(
+            in_second, _mul_div(np.maximum(sales_ppm - lower * target, 0),
+                                over_rate, PPM * PPM,
+                                modes["overachievement_commission"]),
+            np.where(in_third, _mul_div(target * (upper - lower), over_rate,
+                                        PPM * PPM,
+                                        modes["overachievement_commission"]),
+                     0))
+        exceptional = np.where(
+            in_third, _mul_div(np.maximum(sales_ppm - upper * target, 0),
+                               exceptional_rate, PPM * PPM,
+                               modes["exceptional_commission"]), 0)
+    else:
+        threshold = _rate(data, "accelerator_threshold", defaults) * target
+        above = sales_ppm > threshold
+        accelerated = np.where(above, _mul_div(
+            np.maximum(sales_ppm - threshold, 0),
+            _rate(data, "accelerator_rate", defaults), PPM * PPM,
+            modes["accelerated_commission"]), 0)
+        if method == "accelerator":
+            limit = _rule(rules, "ae_attainment_cap") * target
+        else:
+            limit = threshold
+            cap = _mul_div(target * _rate(data, "commission_cap_multiplier",
+                                          defaults), rate, PPM * PPM,
+                           modes["commission_cap"])
+        # rate * min(sales, limit), with limit in millionths of a cent
+        standard = np.where(
+            sales_ppm <= limit,
+            _mul_div(sales, rate, PPM, modes["standard_commission"]),
+            _mul_div(limit, rate, PPM * PPM, modes["standard_commission"]))
+
+    eligible = (target > 0) & (sales_ppm >= _rule(rules, "min_attainment")
+                               * target)
+    bands = [np.where(eligible, band, 0) for band in
+             (standard, accelerated, overachievement, exceptional)]
+    total_commission = sum(bands)
+    commission = total_commission if cap is None \
+        else np.minimum(total_commission, cap)
+    base = _round_div(_money(data, "base_salary", defaults), 12,
+                      modes["monthly_base_salary"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        attainment_rate = np.where(target > 0, sales / target, 0.0)
+    return {
+        "attainment_rate": attainment_rate,
+        "monthly_base_salary": base,
+        "standard_commission": bands[0],
+        "accelerated_commission": bands[1],
+        "overachievement_commission": bands[2],
+        "exceptional_commission": bands[3],
+        "total_commission": total_commission,
+        "commission": commission,
+        "total_earnings": commission + base,
+    }
+
+
+SDR_CENTS_COLUMNS = list(SDR_ROUNDING) + ["grand_total"]
+AE_CENTS_COLUMNS = ["monthly_base_salary", "standard_commission",
+                    "accelerated_commission", "overachievement_commission",
+                    "exceptional_commission", "total_commission", "commission",
+                    "total_earnings"]
+
+
+def exact_payouts(df, plan=DEFAULT_PLAN, role=None, rounding=None):
+    """Exact payouts for a mixed roster, with money columns in int64 cents.
+
+    Money outputs are named ``<component>_cents`` (nullable ``Int64``, blank
+    where the component does not apply to the row's role), plus
+    ``total_payout_cents``. Rates and counts keep their float columns.
+    ``rounding`` may name components of either role.
+    """
+    frame = df.reset_index(drop=True)
+    if role is not None:
+        roles = pd.Series(role.upper(), index=frame.index)
+    elif "role" in frame.columns:
+        roles = frame["role"].astype(str).str.upper()
+    else:
+        raise ValueError("Pass role= or include a 'role' column")
+    unknown = ~roles.isin([SDR, AE])
+    if unknown.any():
+        raise ValueError(f"Unknown role(s): {sorted(set(roles[unknown]))}")
+
+    rules = get_plan(plan)
+    rounding = rounding or {}
+    _rounding({**SDR_ROUNDING, **AE_ROUNDING}, rounding)
+    columns, present = {}, {}
+    total = np.zeros(len(frame), dtype=np.int64)
+    for name, evaluate, components, cents_columns, total_column in (
+            (SDR, exact_sdr_arrays, SDR_ROUNDING, SDR_CENTS_COLUMNS,
+             "grand_total"),
+            (AE, exact_ae_arrays, AE_ROUNDING, AE_CENTS_COLUMNS,
+             "total_earnings")):
+        mask = (roles == name).to_numpy()
+        subset = frame[mask]
+        result = evaluate({column: subset[column].to_numpy()
+                           for column in subset.columns}, rules,
+                          {component: mode for component, mode
+                           in rounding.items() if component in components})
+        for column, values in result.items():
+            if column in cents_columns:
+                column = f"{column}_cents"
+                buffer = columns.setdefault(
+                    column, np.zeros(len(frame), dtype=np.int64))
+                present.setdefault(column, np.zeros(len(frame), dtype=bool))
+                present[column][mask] = True
+            else:
+                buffer = columns.setdefault(column, np.full(len(frame), np.nan))
+            buffer[mask] = values
+        total[mask] = result[total_column]
+    out = pd.DataFrame({
+        column: pd.arrays.IntegerArray(values, ~present[column])
+        if column in present else values
+        for column, values in columns.items()}, index=frame.index)
+    out["total_payout_cents"] = total
+    out.index = df.index
+    inputs = df.drop(columns=[c for c in out.columns if c in df.columns])
+    return pd.concat([inputs, out], axis=1)
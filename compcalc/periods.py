@@ -0,0 +1,135 @@
+"""Cumulative (YTD/QTD) attainment and true-ups across a rep's history.
+
+``history`` has one row per rep and month (``rep_id``, ``period`` such as
+``2025-03``, ``role`` and the month's plan inputs). Within each window, a
+calendar year for ``ytd`` or quarter for ``qtd``, the month's targets,
+target bonuses and results are accumulated with prefix sums, and the plan is
+evaluated on those window-to-date totals. Every cap and breakpoint in the
+plans is relative to the target, so this is the payout the rep has earned
+on cumulative attainment. Rates come from the current month's row.
+
+The true-up is what has been earned to date minus what the monthly
+calculation has paid to date (or the ``paid`` column, when history records
+actual payments). ``true_up_delta`` is the change since the previous month,
+i.e. the adjustment to settle with this month's payroll.
+
+When a new month closes, pass the previous output as ``previous=`` with only
+the new month's rows: the running sums continue from the last stored row of
+each window instead of re-reading earlier months.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import AE, SDR, compute_payouts
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, get_plan, sdr_defaults
+
+WINDOWS = {"ytd": "%Y", "qtd": "%YQ%q"}
+
+# Inputs that add up across months; everything else is a rate or salary
+SUMMED_INPUTS = {
+    AE: ("monthly_target", "total_sales"),
+    SDR: ("sal_target_per_month", "sql_target_per_month",
+          "bonus_sals_target_attainment", "bonus_sqls_target_attainment",
+          "total_sals_attained", "total_sqls_attained",
+          "total_revenue_assist"),
+}
+
+# Prefix-sum columns carried from one month to the next
+RUNNING_COLUMNS = ["months_in_window", "paid_to_date", "true_up"] + [
+    f"cumulative_{name}" for names in SUMMED_INPUTS.values() for name in names]
+
+
+def _variable_pay(payouts):
+    # Everything above the monthly base salary
+    return (payouts["total_payout"] - payouts["monthly_base_salary"]).to_numpy()
+
+
+def _offsets(previous, keys):
+    """Last running totals of each (rep, window) in ``previous``, aligned to ``keys``."""
+    if previous is None or previous.empty:
+        return pd.DataFrame(0.0, index=keys.index, columns=RUNNING_COLUMNS)
+    last = previous.sort_values("period", kind="stable") \
+        .groupby(["rep_id", "window"], sort=False).tail(1)
+    last = last.reindex(columns=["rep_id", "window"] + RUNNING_COLUMNS)
+    merged = keys.merge(last, on=["rep_id", "window"], how="left")
+    merged.index = keys.index
+    return merged[RUNNING_COLUMNS].astype(np.float64).fillna(0.0)
+
+
+def _role_cumulative(frame, rules, role, defaults, previous):
+    summed = SUMMED_INPUTS[role]
+    offsets = _offsets(previous, frame[["rep_id", "window"]])
+    groups = frame.groupby(["rep_id", "window"], sort=False)
+
+    monthly = compute_payouts(frame, rules, role=role)
+    monthly_pay = _variable_pay(monthly)
+    paid = frame["paid"].fillna(pd.Series(monthly_pay, index=frame.index)) \
+        if "paid" in frame.columns else pd.Series(monthly_pay, index=frame.index)
+
+    out = pd.DataFrame(index=frame.index)
+    cumulative = frame.copy()
+    for name in summed:
+        values = frame[name].fillna(defaults[name]) if name in frame.columns \
+            else pd.Series(float(defaults[name]), index=frame.index)
+        running = values.groupby([frame["rep_id"], frame["window"]],
+                                 sort=False).cumsum()
+        cumulative[name] = running + offsets[f"cumulative_{name}"]
+        out[f"cumulative_{name}"] = cumulative[name]
+    out["months_in_window"] = (groups.cumcount() + 1 +
+                               offsets["months_in_window"]).astype("int64")
+
+    earned = compute_payouts(cumulative, rules, role=role)
+    if role == AE:
+        out["cumulative_attainment_rate"] = earned["attainment_rate"]
+    else:
+        out["cumulative_sal_attainment_rate"] = earned["sal_attainment_rate"]
+        out["cumulative_sql_attainment_rate"] = earned["sql_attainment_rate"]
+    out["monthly_variable_pay"] = monthly_pay
+    out["earned_to_date"] = _variable_pay(earned)
+    out["paid_to_date"] = paid.groupby([frame["rep_id"], frame["window"]],
+                                       sort=False).cumsum() + \
+        offsets["paid_to_date"]
+    out["true_up"] = out["earned_to_date"] - out["paid_to_date"]
+    prior = out["true_up"].groupby([frame["rep_id"], frame["window"]],
+                                   sort=False).shift(1)
+    out["true_up_delta"] = out["true_up"] - prior.fillna(offsets["true_up"])
+    return out
+
+
+def cumulative_payouts(history, plan=DEFAULT_PLAN, window="ytd",
+                       previous=None):
+    """Window-to-date attainment, earnings and true-ups for every history row.
+
+    Returns ``history`` with ``window`` and the cumulative columns added,
+    in the original row order.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"window must be one of {sorted(WINDOWS)}")
+    missing = {"rep_id", "period", "role"} - set(history.columns)
+    if missing:
+        raise ValueError(f"History is missing column(s): {sorted(missing)}")
+    rules = get_plan(plan)
+    months = pd.PeriodIndex(history["period"].astype(str), freq="M")
+    frame = history.reset_index(drop=True).assign(
+        window=months.strftime(WINDOWS[window]), _month=months)
+    # Prefix sums run in calendar order within each rep
+    frame = frame.sort_values(["rep_id", "_month"], kind="stable")
+    roles = frame["role"].astype(str).str.upper()
+    unknown = ~roles.isin([SDR, AE])
+    if unknown.any():
+        raise ValueError(f"Unknown role(s): {sorted(set(roles[unknown]))}")
+
+    parts = []
+    for role, defaults in ((SDR, sdr_defaults(rules)), (AE, ae_defaults(rules))):
+        subset = frame[roles == role]
+        if not subset.empty:
+            parts.append(_role_cumulative(subset, rules, role, defaults,
+                                          previous))
+    added = pd.concat(parts).sort_index()
+    result = frame.drop(columns="_month").sort_index()
+    result = pd.concat([result.drop(columns=[c for c in added.columns
+                                             if c in result.columns]),
+                        added], axis=1)
+    result.index = history.index
+    return result
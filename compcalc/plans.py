@@ -0,0 +1,270 @@
+"""Compensation plan variants and default inputs.
+
+Each Streamlit page implements a slightly different plan. The rules that
+differ between them are captured here so the batch tools can reproduce any
+of the three pages exactly.
+
+Plans can also be written as JSON or YAML files::
+
+    {
+        "name": "tiered-2025",
+        "extends": "tiered",
+        "sdr_excess_cap": 0.75,
+        "ae_tier_breakpoints": [1.0, 1.25],
+        "ae_inputs": {"commission_rate": 0.06}
+    }
+
+``"ae_commission": "ladder"`` pays AEs on an N-tier ``ae_ladder`` of
+attainment breakpoints and marginal rates (see ``compcalc.ladder``).
+
+``extends`` names a built-in plan whose rules fill in anything not given.
+``sdr_inputs`` and ``ae_inputs`` override the page defaults used for any
+input a roster leaves out. ``load_plan`` validates the file once, so the
+evaluators never have to check rules per rep.
+"""
+
+import json
+import os
+
+# app.py: target bonuses scale with attainment (capped at 150%), excess
+# SALs/SQLs capped at 50% over target, AE accelerator above the threshold.
+BASIC = "basic"
+
+# Comp Calculator.py: pro-rata target bonuses, excess capped at 50% over
+# target, AE accelerator plus a commission cap multiplier.
+CAPPED = "capped"
+
+# Updated Comp Calc.py: pro-rata target bonuses adjusted by lead conversion,
+# excess capped at 100% over target, three AE commission tiers.
+TIERED = "tiered"
+
+DEFAULT_PLAN = CAPPED
+
+PLANS = {
+    BASIC: {
+        "name": BASIC,
+        "min_attainment": 0.5,
+        "sdr_target_bonus": "attainment",
+        "sdr_attainment_cap": 1.5,
+        "sdr_excess_cap": 0.5,
+        "sdr_lead_conversion": False,
+        "ae_commission": "accelerator",
+        "ae_attainment_cap": 1.5,
+    },
+    CAPPED: {
+        "name": CAPPED,
+        "min_attainment": 0.5,
+        "sdr_target_bonus": "pro_rata",
+        "sdr_excess_cap": 0.5,
+        "sdr_lead_conversion": False,
+        "ae_commission": "capped",
+    },
+    TIERED: {
+        "name": TIERED,
+        "min_attainment": 0.5,
+        "sdr_target_bonus": "pro_rata",
+        "sdr_excess_cap": 1.0,
+        "sdr_lead_conversion": True,
+        "ae_commission": "tiered",
+        "ae_tier_breakpoints": (1.0, 1.5),
+    },
+}
+
+# Widget defaults from the Streamlit pages. Percentages are stored as
+# fractions, the same way the pages divide them by 100.
+SDR_DEFAULTS = {
+    "base_salary": 50000.0,
+    "sal_target_per_month": 20,
+    "sql_target_per_month": 10,
+    "bonus_sals_target_attainment": 1000.0,
+    "bonus_per_excess_sal": 50.0,
+    "bonus_sqls_target_attainment": 1000.0,
+    "bonus_per_excess_sql": 100.0,
+    "bonus_on_won_revenue": 0.005,
+    "lead_conversion_rate": 0.5,
+    "total_sals_attained": 0,
+    "total_sqls_attained": 0,
+    "total_revenue_assist": 0.0,
+}
+
+AE_DEFAULTS = {
+    "base_salary": 70000.0,
+    "commission_rate": 0.05,
+    "accelerator_threshold": 1.5,
+    "accelerator_rate": 0.10,
+    "commission_cap_multiplier": 3.0,
+    "overachievement_rate": 0.075,
+    "exceptional_rate": 0.10,
+    "monthly_target": 50000.0,
+    "total_sales": 0.0,
+}
+
+SDR_OUTPUTS = [
+    "sal_attainment_rate",
+    "sql_attainment_rate",
+    "monthly_base_salary",
+    "base_sal_bonus",
+    "base_sql_bonus",
+    "excess_sals_count",
+    "excess_sqls_count",
+    "excess_sal_bonus",
+    "excess_sql_bonus",
+    "revenue_bonus",
+    "grand_total",
+]
+
+AE_OUTPUTS = [
+    "attainment_rate",
+    "monthly_base_salary",
+    "standard_commission",
+    "accelerated_commission",
+    "overachievement_commission",
+    "exceptional_commission",
+    "total_commission",
+    "commission",
+    "total_earnings",
+]
+
+
+SDR_TARGET_BONUS_METHODS = ("attainment", "pro_rata")
+AE_COMMISSION_METHODS = ("accelerator", "capped", "tiered", "ladder")
+LADDER_KEYS = {"breakpoints", "rates", "cap_multiplier"}
+
+PLAN_KEYS = {
+    "name", "extends", "min_attainment", "sdr_target_bonus",
+    "sdr_attainment_cap", "sdr_excess_cap", "sdr_lead_conversion",
+    "ae_commission", "ae_attainment_cap", "ae_tier_breakpoints",
+    "ae_ladder", "sdr_inputs", "ae_inputs",
+}
+
+
+def get_plan(plan):
+    """Return the rule set for a plan name, compiled plan or rule dict."""
+    if isinstance(plan, dict):
+        return plan
+    rules = getattr(plan, "rules", None)
+    if rules is not None:
+        return rules
+    try:
+        return PLANS[plan]
+    except KeyError:
+        raise ValueError(
+            f"Unknown plan {plan!r}; expected one of {sorted(PLANS)}") from None
+
+
+def sdr_defaults(rules):
+    """Page defaults for SDR inputs with the plan's overrides applied."""
+    return {**SDR_DEFAULTS, **rules.get("sdr_inputs", {})}
+
+
+def ae_defaults(rules):
+    """Page defaults for AE inputs with the plan's overrides applied."""
+    return {**AE_DEFAULTS, **rules.get("ae_inputs", {})}
+
+
+def _check_number(spec, key, minimum=0.0):
+    value = spec[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Plan field {key!r} must be a number, got {value!r}")
+    if value < minimum:
+        raise ValueError(f"Plan field {key!r} must be at least {minimum}")
+
+
+def _validate_ladder(ladder):
+    if not isinstance(ladder, dict) or "rates" not in ladder:
+        raise ValueError("The ladder method needs an ae_ladder with "
+                         "breakpoints and rates")
+    unknown = set(ladder) - LADDER_KEYS
+    if unknown:
+        raise ValueError(f"Unknown ae_ladder field(s): {sorted(unknown)}")
+    breakpoints = tuple(ladder.get("breakpoints", ()))
+    rates = tuple(ladder["rates"])
+    for value in breakpoints + rates:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"ae_ladder values must be numbers, got {value!r}")
+    if any(not low < high for low, high in
+           zip((0,) + breakpoints, breakpoints)):
+        raise ValueError("ae_ladder breakpoints must be increasing positive "
+                         "numbers")
+    if len(rates) != len(breakpoints) + 1 or min(rates) < 0:
+        raise ValueError("ae_ladder needs one non-negative rate per band, "
+                         "one more than the breakpoints")
+    cap_multiplier = ladder.get("cap_multiplier")
+    if cap_multiplier is not None:
+        _check_number(ladder, "cap_multiplier")
+    return {"breakpoints": breakpoints, "rates": rates,
+            "cap_multiplier": cap_multiplier}
+
+
+def validate_plan(spec):
+    """Check a plan spec and return the full rule dict it describes.
+
+    Missing rules are taken from the ``extends`` plan (``capped`` if not
+    given). Raises ``ValueError`` describing the first problem found.
+    """
+    unknown = set(spec) - PLAN_KEYS
+    if unknown:
+        raise ValueError(f"Unknown plan field(s): {sorted(unknown)}")
+    base = spec.get("extends", DEFAULT_PLAN)
+    if base not in PLANS:
+        raise ValueError(
+            f"Plan extends unknown plan {base!r}; expected one of {sorted(PLANS)}")
+    rules = {**PLANS[base], **spec, "extends": base}
+
+    _check_number(rules, "min_attainment")
+    _check_number(rules, "sdr_excess_cap")
+    if rules["sdr_target_bonus"] not in SDR_TARGET_BONUS_METHODS:
+        raise ValueError(
+            f"sdr_target_bonus must be one of {SDR_TARGET_BONUS_METHODS}")
+    if rules["sdr_target_bonus"] == "attainment":
+        rules.setdefault("sdr_attainment_cap", 1.5)
+        _check_number(rules, "sdr_attainment_cap")
+    if not isinstance(rules["sdr_lead_conversion"], bool):
+        raise ValueError("sdr_lead_conversion must be true or false")
+
+    method = rules["ae_commission"]
+    if method not in AE_COMMISSION_METHODS:
+        raise ValueError(f"ae_commission must be one of {AE_COMMISSION_METHODS}")
+    if method == "accelerator":
+        rules.setdefault("ae_attainment_cap", 1.5)
+        _check_number(rules, "ae_attainment_cap")
+    if method == "tiered":
+        rules.setdefault("ae_tier_breakpoints", (1.0, 1.5))
+        breakpoints = tuple(rules["ae_tier_breakpoints"])
+        if len(breakpoints) != 2 or not 0 < breakpoints[0] < breakpoints[1]:
+            raise ValueError(
+                "ae_tier_breakpoints must be two increasing positive numbers")
+        rules["ae_tier_breakpoints"] = breakpoints
+    if method == "ladder":
+        rules["ae_ladder"] = _validate_ladder(rules.get("ae_ladder"))
+
+    for key, defaults in (("sdr_inputs", SDR_DEFAULTS),
+                          ("ae_inputs", AE_DEFAULTS)):
+        overrides = rules.get(key, {})
+        unknown = set(overrides) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown {key} field(s): {sorted(unknown)}")
+        for name in overrides:
+            _check_number(overrides, name)
+    return rules
+
+
+def load_plan(path):
+    """Read and validate a JSON or YAML plan file."""
+    with open(path, encoding="utf-8") as handle:
+        if path.lower().endswith((".yaml", ".yml")):
+            import yaml
+
+            spec = yaml.safe_load(handle)
+        else:
+            spec = json.load(handle)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Plan file {path} must contain a mapping")
+    return validate_plan(spec)
+
+
+def resolve_plan(plan):
+    """Accept a built-in plan name or a path to a plan file."""
+    if isinstance(plan, str) and plan not in PLANS and os.path.exists(plan):
+        return load_plan(plan)
+    return get_plan(plan)
@@ -0,0 +1,138 @@
+"""Compact result records for single reps and whole rosters.
+
+The evaluators return a plain dict per rep, which is convenient on a page
+but costs 500-750 bytes per rep-month: the dict itself (464 bytes for an
+SDR's 11 fields, 272 bytes for an AE's 9) plus a 24-byte float object per
+breakdown field. For large runs this module offers two
+compact forms carrying the same fields the detailed-breakdown expanders
+show:
+
+- ``SDRResult``/``AEResult``: frozen ``__slots__`` dataclasses for the
+  scalar API. A record is 120 bytes (SDR) or 104 bytes (AE) plus its float
+  values, with no per-instance ``__dict__``.
+- ``SDR_RESULT_DTYPE``/``AE_RESULT_DTYPE``: NumPy structured dtypes for the
+  batch API, 88 and 72 bytes per rep (one float64 per field) with no
+  per-row Python objects. ``sdr_records``/``ae_records`` fill them in
+  blocks, so temporaries stay bounded however many rep-months are passed.
+
+``SDR_INPUT_DTYPE``/``AE_INPUT_DTYPE`` describe rep inputs the same way;
+a structured input array can be passed straight to the batch functions.
+"""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import ae_arrays, sdr_arrays
+from compcalc.formulas import make_ae_evaluator, make_sdr_evaluator
+from compcalc.plans import (AE_DEFAULTS, AE_OUTPUTS, DEFAULT_PLAN,
+                            SDR_DEFAULTS, SDR_OUTPUTS, get_plan)
+
+# Rows evaluated per block by the batch functions
+BLOCK_ROWS = 65_536
+
+SDR_INPUT_DTYPE = np.dtype([(name, np.float64) for name in SDR_DEFAULTS])
+AE_INPUT_DTYPE = np.dtype([(name, np.float64) for name in AE_DEFAULTS])
+SDR_RESULT_DTYPE = np.dtype([(name, np.float64) for name in SDR_OUTPUTS])
+AE_RESULT_DTYPE = np.dtype([(name, np.float64) for name in AE_OUTPUTS])
+
+
+class _Record:
+    # Dict-style access, so code written against the breakdown dicts still works
+    __slots__ = ()
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    @classmethod
+    def from_breakdown(cls, breakdown):
+        return cls(*(breakdown[field.name] for field in fields(cls)))
+
+    def as_dict(self):
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+@dataclass(frozen=True, slots=True)
+class SDRResult(_Record):
+    """One SDR's monthly breakdown."""
+
+    sal_attainment_rate: float
+    sql_attainment_rate: float
+    monthly_base_salary: float
+    base_sal_bonus: float
+    base_sql_bonus: float
+    excess_sals_count: float
+    excess_sqls_count: float
+    excess_sal_bonus: float
+    excess_sql_bonus: float
+    revenue_bonus: float
+    grand_total: float
+
+
+@dataclass(frozen=True, slots=True)
+class AEResult(_Record):
+    """One AE's monthly breakdown."""
+
+    attainment_rate: float
+    monthly_base_salary: float
+    standard_commission: float
+    accelerated_commission: float
+    overachievement_commission: float
+    exceptional_commission: float
+    total_commission: float
+    commission: float
+    total_earnings: float
+
+
+def sdr_result(inputs, plan=DEFAULT_PLAN):
+    """``sdr_compensation`` as an ``SDRResult``."""
+    return SDRResult.from_breakdown(make_sdr_evaluator(plan)(inputs))
+
+
+def ae_result(inputs, plan=DEFAULT_PLAN):
+    """``ae_compensation`` as an ``AEResult``."""
+    return AEResult.from_breakdown(make_ae_evaluator(plan)(inputs))
+
+
+def _columns(data):
+    # DataFrames, dicts of arrays and structured arrays alike
+    if isinstance(data, np.ndarray):
+        return {name: data[name] for name in data.dtype.names}
+    return {name: np.asarray(data[name]) for name in data.keys()}
+
+
+def _records(data, plan, evaluate, dtype, input_names, block_rows):
+    rules = get_plan(plan)
+    every = _columns(data)
+    columns = {name: values for name, values in every.items()
+               if name in input_names}
+    if isinstance(data, (pd.DataFrame, np.ndarray)):
+        size = len(data)
+    else:
+        # A mapping's length is its number of keys; any column gives the rows
+        size = len(next(iter(every.values()))) if every else 0
+    out = np.empty(size, dtype=dtype)
+    for start in range(0, size, block_rows):
+        block = slice(start, min(start + block_rows, size))
+        result = evaluate({name: values[block]
+                           for name, values in columns.items()}, rules)
+        rows = out[block]
+        for name in dtype.names:
+            rows[name] = result[name]
+    return out
+
+
+def sdr_records(data, plan=DEFAULT_PLAN, block_rows=BLOCK_ROWS):
+    """SDR breakdowns for every row as an ``SDR_RESULT_DTYPE`` array."""
+    return _records(data, plan, sdr_arrays, SDR_RESULT_DTYPE, SDR_DEFAULTS,
+                    block_rows)
+
+
+def ae_records(data, plan=DEFAULT_PLAN, block_rows=BLOCK_ROWS):
+    """AE breakdowns for every row as an ``AE_RESULT_DTYPE`` array."""
+    return _records(data, plan, ae_arrays, AE_RESULT_DTYPE, AE_DEFAULTS,
+                    block_rows)
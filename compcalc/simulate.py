@@ -0,0 +1,153 @@
+"""Monte Carlo payout-cost simulation for finance forecasting.
+
+Each rep's attainment is drawn from a distribution (``attainment_mean`` and
+``attainment_sd`` columns, defaulting to 100% and 25%), turned into sales
+or SAL/SQL counts against the rep's targets, and paid under the plan. The
+total payout of every scenario is summed across the roster, giving the
+distribution of plan cost.
+
+Scenarios are evaluated a block at a time as one (scenarios x reps) NumPy
+broadcast, so memory stays bounded. Draws are made in scenario order from
+one seeded generator, so results depend only on the seed, never on the
+block size.
+"""
+
+import numpy as np
+
+from compcalc.batch import AE, SDR, ae_arrays, sdr_arrays
+from compcalc.plans import DEFAULT_PLAN, ae_defaults, get_plan, sdr_defaults
+
+DISTRIBUTIONS = ("normal", "lognormal")
+
+# Roughly how many (scenario, rep) cells to evaluate per block
+BLOCK_CELLS = 2_000_000
+
+
+def _rep_column(frame, name, default):
+    if name not in frame.columns:
+        return np.full(len(frame), default, dtype=np.float64)
+    return frame[name].fillna(default).to_numpy(dtype=np.float64)
+
+
+def _draw(rng, mean, sd, size, distribution):
+    if distribution == "normal":
+        draws = mean + sd * rng.standard_normal((size, len(mean)))
+        return np.maximum(draws, 0.0)
+    # Lognormal with the requested mean and standard deviation
+    safe_mean = np.maximum(mean, 1e-12)
+    sigma2 = np.log1p((sd / safe_mean) ** 2)
+    mu = np.log(safe_mean) - sigma2 / 2
+    return np.exp(mu + np.sqrt(sigma2) * rng.standard_normal((size, len(mean))))
+
+
+def _role_masks(frame, role=None):
+    # (is_sdr, is_ae) boolean arrays from role= or the 'role' column
+    if role is not None:
+        roles = np.full(len(frame), role.upper())
+    elif "role" in frame.columns:
+        roles = frame["role"].astype(str).str.upper().to_numpy()
+    else:
+        raise ValueError("Pass role= or include a 'role' column")
+    is_sdr = roles == SDR
+    is_ae = roles == AE
+    unknown = ~(is_sdr | is_ae)
+    if unknown.any():
+        raise ValueError(f"Unknown role(s): {sorted(set(roles[unknown]))}")
+    return is_sdr, is_ae
+
+
+def _inputs(frame, defaults):
+    # Plan inputs as per-rep arrays, which broadcast against (scenarios, reps)
+    return {name: _rep_column(frame, name, default)
+            for name, default in defaults.items()}
+
+
+def simulate_costs(roster, plan=DEFAULT_PLAN, scenarios=100_000, seed=0,
+                   distribution="normal", role=None, block_size=None):
+    """Simulate plan cost for ``scenarios`` draws of the whole roster.
+
+    Returns ``(total_cost, accelerator_cost)``, two arrays with one entry
+    per scenario. The accelerator cost is the pay above the standard rate:
+    AE commission beyond the standard band (after any cap) plus SDR excess
+    SAL/SQL bonuses.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+    rules = get_plan(plan)
+    frame = roster.reset_index(drop=True)
+    is_sdr, is_ae = _role_masks(frame, role)
+
+    mean = _rep_column(frame, "attainment_mean", 1.0)
+    sd = _rep_column(frame, "attainment_sd", 0.25)
+    sdr_inputs = _inputs(frame[is_sdr], sdr_defaults(rules))
+    ae_inputs = _inputs(frame[is_ae], ae_defaults(rules))
+    sal_target = sdr_inputs["sal_target_per_month"]
+    sql_target = sdr_inputs["sql_target_per_month"]
+    # The roster's revenue assisted is taken as the amount at 100% attainment
+    revenue = sdr_inputs["total_revenue_assist"]
+    monthly_target = ae_inputs["monthly_target"]
+
+    rng = np.random.default_rng(seed)
+    block_size = block_size or max(1, BLOCK_CELLS // max(len(frame), 1))
+    total_cost = np.empty(scenarios)
+    accelerator_cost = np.empty(scenarios)
+    for start in range(0, scenarios, block_size):
+        size = min(block_size, scenarios - start)
+        attainment = _draw(rng, mean, sd, size, distribution)
+        total = np.zeros(size)
+        accelerator = np.zeros(size)
+        if is_sdr.any():
+            sdr_attainment = attainment[:, is_sdr]
+            sdr = sdr_arrays({
+                **sdr_inputs,
+                "total_sals_attained": np.rint(sdr_attainment * sal_target),
+                "total_sqls_attained": np.rint(sdr_attainment * sql_target),
+                "total_revenue_assist": sdr_attainment * revenue,
+            }, rules)
+            total += np.broadcast_to(
+                sdr["grand_total"], sdr_attainment.shape).sum(axis=1)
+            accelerator += np.broadcast_to(
+                sdr["excess_sal_bonus"] + sdr["excess_sql_bonus"],
+                sdr_attainment.shape).sum(axis=1)
+        if is_ae.any():
+            ae_attainment = attainment[:, is_ae]
+            ae = ae_arrays({**ae_inputs,
+                            "total_sales": ae_attainment * monthly_target},
+                           rules)
+            total += np.broadcast_to(
+                ae["total_earnings"], ae_attainment.shape).sum(axis=1)
+            above_standard = np.maximum(
+                ae["commission"] - ae["standard_commission"], 0.0)
+            accelerator += np.broadcast_to(
+                above_standard, ae_attainment.shape).sum(axis=1)
+        total_cost[start:start + size] = total
+        accelerator_cost[start:start + size] = accelerator
+    return total_cost, accelerator_cost
+
+
+def summarize_costs(total_cost, accelerator_cost):
+    """Expected, percentile and tail statistics of simulated plan cost."""
+    p95 = np.percentile(total_cost, 95)
+    tail = total_cost >= p95
+    return {
+        "scenarios": len(total_cost),
+        "expected_cost": float(total_cost.mean()),
+        "std_cost": float(total_cost.std()),
+        "p50_cost": float(np.percentile(total_cost, 50)),
+        "p95_cost": float(p95),
+        "p99_cost": float(np.percentile(total_cost, 99)),
+        # Mean cost of the worst 5% of scenarios
+        "tail_cost_95": float(total_cost[tail].mean()),
+        "expected_accelerator_cost": float(accelerator_cost.mean()),
+        "p95_accelerator_cost": float(np.percentile(accelerator_cost, 95)),
+        # Accelerator pay in the worst 5% of scenarios
+        "tail_accelerator_cost_95": float(accelerator_cost[tail].mean()),
+    }
+
+
+def simulate_plan_cost(roster, plan=DEFAULT_PLAN, scenarios=100_000, seed=0,
+                       distribution="normal", role=None):
+    """Simulate the roster under ``plan`` and summarize the cost distribution."""
+    return summarize_costs(*simulate_costs(
+        roster, plan, scenarios=scenarios, seed=seed,
+        distribution=distribution, role=role))
@@ -0,0 +1,221 @@
+"""Inverse solver: the AE sales needed to reach a target payout.
+
+An AE's commission is a piecewise function of total sales with known
+breakpoints: nothing below the eligibility gate, then linear bands
+separated by the accelerator threshold, the attainment cap, the tier or
+ladder breakpoints, and a ceiling at the commission cap. Within the tiered plan's
+first band the commission is quadratic (``total_sales * rate *
+attainment``). Each band is solved in closed form (linear, or the quadratic
+root), and the answer is the lowest sales figure across bands that reaches
+the target.
+
+The arithmetic is written over NumPy arrays, so the same code answers one
+rep or a whole roster in a single pass. A target above what the plan can
+ever pay (e.g. beyond the commission cap) gives ``inf``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import _column
+from compcalc.ladder import tier_ladder
+from compcalc.plans import AE_DEFAULTS, DEFAULT_PLAN, ae_defaults, get_plan
+
+MEASURES = ("total_earnings", "commission")
+
+SOLVER_COLUMNS = ["required_sales", "additional_sales",
+                  "required_attainment_rate"]
+
+
+def _solve_band(target, start, end, value, slope, curvature):
+    """Lowest sales in [start, end] where the band reaches ``target``.
+
+    On the band, commission = value + slope * (S - start)
+    + curvature * (S**2 - start**2). Returns ``inf`` where it never does.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Quadratic in S: curvature*S^2 + slope*S + k = 0
+        k = value - slope * start - curvature * start ** 2 - target
+        disc = np.sqrt(np.maximum(slope ** 2 - 4 * curvature * k, 0.0))
+        quadratic = (-slope + disc) / (2 * curvature)
+        linear = start + (target - value) / slope
+    root = np.where(curvature > 0, quadratic,
+                    np.where(slope > 0, linear, np.inf))
+    solved = np.where(value >= target, start, np.maximum(root, start))
+    # Empty bands (e.g. a breakpoint below the gate) contribute nothing
+    return np.where((end > start) & (solved <= end), solved, np.inf)
+
+
+def _first_above(sales, target, level):
+    """Smallest sales from ``sales`` on whose attainment, as the formulas
+    divide it, is strictly above ``level``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A few ulps at most; rounding in the division can hide the first one
+        for _ in range(4):
+            sales = np.where(sales / target <= level,
+                             np.nextafter(sales, np.inf), sales)
+    return sales
+
+
+def _bands(rules, values, gate_sales):
+    """(start, end, value at start, slope, curvature) for each band."""
+    target = values["monthly_target"]
+    rate = values["commission_rate"]
+    method = rules["ae_commission"]
+    inf = np.full(np.shape(gate_sales), np.inf)
+    zero = np.zeros(np.shape(gate_sales))
+
+    if method == "tiered":
+        lower, upper = rules["ae_tier_breakpoints"]
+        over = values["overachievement_rate"]
+        exceptional = values["exceptional_rate"]
+        lower_sales = np.maximum(gate_sales, target * lower)
+        upper_sales = np.maximum(gate_sales, target * upper)
+        # Attainment exactly at ``lower`` is still paid pro-rata, so the
+        # overachievement band only opens just above it: the payout jumps there
+        above_lower = np.minimum(_first_above(lower_sales, target, lower),
+                                 np.maximum(upper_sales, lower_sales))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            curvature = np.where(target > 0, rate / target, 0.0)
+
+        def linear_value(sales):
+            # Right-hand value of the overachievement/exceptional bands
+            return target * lower * rate + over * np.clip(
+                sales - target * lower, 0, target * (upper - lower)) + \
+                exceptional * np.maximum(sales - target * upper, 0)
+
+        return [
+            (gate_sales, lower_sales, curvature * gate_sales ** 2, zero,
+             curvature),
+            (above_lower, upper_sales, linear_value(above_lower),
+             zero + over, zero),
+            (upper_sales, inf, linear_value(upper_sales), zero + exceptional,
+             zero),
+        ]
+
+    if method == "ladder":
+        ladder = tier_ladder(rules)
+
+        def value_at(sales):
+            return ladder.total_at(sales, target)
+
+        def slope_at(sales):
+            return ladder.rate_at(sales, target)
+
+        kinks = [target * edge for edge in ladder.edges[1:]]
+    else:
+        threshold_sales = target * values["accelerator_threshold"]
+        accelerator_rate = values["accelerator_rate"]
+        if method == "accelerator":
+            cap_sales = target * rules["ae_attainment_cap"]
+
+            def value_at(sales):
+                return rate * np.minimum(sales, cap_sales) + accelerator_rate * \
+                    np.maximum(sales - threshold_sales, 0)
+
+            def slope_at(sales):
+                return rate * (sales < cap_sales) + \
+                    accelerator_rate * (sales > threshold_sales)
+
+            kinks = [np.minimum(cap_sales, threshold_sales),
+                     np.maximum(cap_sales, threshold_sales)]
+        else:
+            def value_at(sales):
+                # The commission cap is applied to the target, not the bands
+                return rate * np.minimum(sales, threshold_sales) + \
+                    accelerator_rate * np.maximum(sales - threshold_sales, 0)
+
+            def slope_at(sales):
+                return np.where(sales < threshold_sales, rate, accelerator_rate)
+
+            kinks = [threshold_sales]
+
+    edges = [gate_sales] + [np.maximum(gate_sales, kink) for kink in kinks] + \
+        [inf]
+    bands = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        # Any point inside the band gives its slope
+        inside = np.where(np.isinf(end), start + 1.0, (start + end) / 2)
+        bands.append((start, end, value_at(start), slope_at(inside) + zero,
+                      zero))
+    return bands
+
+
+def sales_needed_arrays(data, target_payout, plan=DEFAULT_PLAN,
+                        measure="total_earnings"):
+    """Required AE sales for ``target_payout``, over broadcastable arrays.
+
+    ``data`` maps AE input names to arrays (missing ones use the plan
+    defaults); ``target_payout`` is in ``measure`` terms, i.e. total
+    earnings including the monthly base salary, or commission alone.
+    Returns a dict of ``SOLVER_COLUMNS`` arrays.
+    """
+    if measure not in MEASURES:
+        raise ValueError(f"measure must be one of {MEASURES}")
+    rules = get_plan(plan)
+    defaults = ae_defaults(rules)
+    values = {name: _column(data, name, defaults) for name in defaults}
+    target = values["monthly_target"]
+    needed = np.asarray(target_payout, dtype=np.float64)
+    if measure == "total_earnings":
+        needed = needed - values["base_salary"] / 12
+
+    min_attainment = rules["min_attainment"]
+    gate_sales = target * min_attainment
+    # Smallest sales whose attainment, as the formulas divide it, passes the gate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gate_sales = np.where(gate_sales / target < min_attainment,
+                              np.nextafter(gate_sales, np.inf), gate_sales)
+    best = np.full(np.broadcast(needed, gate_sales).shape, np.inf)
+    for start, end, value, slope, curvature in _bands(rules, values, gate_sales):
+        best = np.minimum(best, _solve_band(needed, start, end, value, slope,
+                                            curvature))
+    # A rep with no target has no attainment and is never eligible
+    best = np.where(target > 0, best, np.inf)
+    if rules["ae_commission"] == "capped":
+        cap = target * values["commission_rate"] * \
+            values["commission_cap_multiplier"]
+        best = np.where(needed > cap, np.inf, best)
+    elif rules["ae_commission"] == "ladder":
+        cap = tier_ladder(rules).cap(target)
+        if cap is not None:
+            best = np.where(needed > cap, np.inf, best)
+    # Nothing to close when the base salary alone covers the target
+    required = np.where(needed <= 0, 0.0, best)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        attainment = np.where(target > 0, required / target, np.inf)
+    return {
+        "required_sales": required,
+        "additional_sales": np.maximum(required - values["total_sales"], 0.0),
+        "required_attainment_rate": attainment,
+    }
+
+
+def sales_needed(inputs, target_payout, plan=DEFAULT_PLAN,
+                 measure="total_earnings"):
+    """Total sales one AE must close to earn ``target_payout``.
+
+    Returns ``required_sales``, ``additional_sales`` beyond the current
+    ``total_sales`` and the ``required_attainment_rate``; all are ``inf``
+    when the plan can never pay that much.
+    """
+    out = sales_needed_arrays(inputs, target_payout, plan, measure)
+    return {name: float(value) for name, value in out.items()}
+
+
+def sales_needed_batch(df, target_payout, plan=DEFAULT_PLAN,
+                       measure="total_earnings"):
+    """Required sales for every AE row of ``df``.
+
+    ``target_payout`` is a number, an array or the name of a column.
+    Returns ``df`` with ``SOLVER_COLUMNS`` added.
+    """
+    if isinstance(target_payout, str):
+        target_payout = df[target_payout].to_numpy(dtype=np.float64)
+    data = {name: df[name].to_numpy() for name in AE_DEFAULTS
+            if name in df.columns}
+    out = sales_needed_arrays(data, target_payout, plan, measure)
+    solved = pd.DataFrame({name: np.broadcast_to(values, len(df))
+                           for name, values in out.items()}, index=df.index)
+    return pd.concat([df.drop(columns=[c for c in SOLVER_COLUMNS
+                                       if c in df.columns]), solved], axis=1)
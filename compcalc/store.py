@@ -0,0 +1,409 @@
+"""SQLite persistence for plan versions, monthly inputs and computed payouts.
+
+Five tables:
+
+- ``plan_versions``: every distinct rule set saved, numbered by
+  ``plan_version``. Saving rules identical to a plan's latest version
+  reuses that version.
+- ``inputs``: one row per (rep_id, period) with the rep's role and plan
+  inputs.
+- ``results``: one row per (rep_id, period, plan_version) with the full
+  ``PAYOUT_COLUMNS`` layout and the rep's ``tier`` position at the time.
+- ``adjustments``: signed clawback / retroactive adjustment lines, one per
+  re-paid rep-period (see ``compcalc.clawback``), with the id of every
+  cancellation event behind a line in ``adjustment_events``, so an event is
+  only ever applied once.
+
+The primary keys lead with (rep_id, period), so one rep's month is a single
+index lookup. ``results`` is also indexed on (plan_version, period), so
+payroll reads a whole period for a plan version with one indexed scan.
+Batch runs write with ``executemany`` inside one transaction. Connections
+come from a small pool shared across threads, which is what a Streamlit
+server needs.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from compcalc.batch import PAYOUT_COLUMNS, compute_payouts
+from compcalc.compiled import compile_plan
+from compcalc.incremental import payout_tiers
+from compcalc.plans import AE_DEFAULTS, SDR_DEFAULTS, validate_plan
+
+INPUT_COLUMNS = list(dict.fromkeys([*SDR_DEFAULTS, *AE_DEFAULTS]))
+
+ADJUSTMENT_COLUMNS = ["rep_id", "period", "plan_version", "role",
+                      "booked_period", "cancelled_amount", "cancelled_deals",
+                      "old_tier", "new_tier", "old_payout", "new_payout",
+                      "adjustment"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS plan_versions (
+    plan_version INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plan_versions_name ON plan_versions (name);
+CREATE TABLE IF NOT EXISTS inputs (
+    rep_id NOT NULL,
+    period TEXT NOT NULL,
+    role TEXT NOT NULL,
+    {", ".join(f"{name} REAL" for name in INPUT_COLUMNS)},
+    PRIMARY KEY (rep_id, period)
+);
+CREATE INDEX IF NOT EXISTS inputs_period ON inputs (period);
+CREATE TABLE IF NOT EXISTS results (
+    rep_id NOT NULL,
+    period TEXT NOT NULL,
+    plan_version INTEGER NOT NULL REFERENCES plan_versions (plan_version),
+    role TEXT NOT NULL,
+    {", ".join(f"{name} REAL" for name in PAYOUT_COLUMNS)},
+    computed_at REAL NOT NULL,
+    tier INTEGER,
+    PRIMARY KEY (rep_id, period, plan_version)
+);
+CREATE INDEX IF NOT EXISTS results_plan_period ON results (plan_version, period);
+CREATE TABLE IF NOT EXISTS adjustments (
+    adjustment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rep_id NOT NULL,
+    period TEXT NOT NULL,
+    plan_version INTEGER NOT NULL REFERENCES plan_versions (plan_version),
+    role TEXT NOT NULL,
+    booked_period TEXT,
+    cancelled_amount REAL NOT NULL,
+    cancelled_deals INTEGER NOT NULL,
+    old_tier INTEGER,
+    new_tier INTEGER,
+    old_payout REAL NOT NULL,
+    new_payout REAL NOT NULL,
+    adjustment REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS adjustments_rep_period ON adjustments (rep_id, period);
+CREATE INDEX IF NOT EXISTS adjustments_booked ON adjustments (booked_period);
+CREATE TABLE IF NOT EXISTS adjustment_events (
+    event_id TEXT PRIMARY KEY,
+    adjustment_id INTEGER NOT NULL REFERENCES adjustments (adjustment_id)
+);
+"""
+
+
+class ConnectionPool:
+    """Up to ``size`` SQLite connections handed out one thread at a time."""
+
+    def __init__(self, path, size=4, timeout=30.0):
+        self.path = path
+        # Every connection to ":memory:" would be a separate empty database
+        self.size = 1 if path == ":memory:" else size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        # The connection a thread has pinned with ``transaction``
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout,
+                               check_same_thread=False)
+        if self.path != ":memory:":
+            # Readers do not block the writer, or each other
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; the block runs in one transaction.
+
+        Inside ``transaction`` the pinned connection is reused and the
+        block joins its transaction.
+        """
+        pinned = getattr(self._local, "conn", None)
+        if pinned is not None:
+            yield pinned
+            return
+        conn = self._acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Run every ``connection`` block of this thread in one transaction."""
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+        with self.connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+        self._idle = queue.LifoQueue()
+
+
+def _periods(df, period):
+    if period is not None:
+        return [str(period)] * len(df)
+    if "period" not in df.columns:
+        raise ValueError("Pass period= or include a 'period' column")
+    return df["period"].astype(str).tolist()
+
+
+def _rows(df, leading, columns):
+    # Floats are bound as-is: SQLite stores NaN as NULL, and binding NaN is
+    # much faster than converting blanks to None first
+    frame = df.reindex(columns=columns).astype("float64")
+    return list(zip(*leading, *(frame[name].tolist() for name in columns)))
+
+
+class PayoutStore:
+    """Plan versions, monthly inputs and payouts in one SQLite database."""
+
+    def __init__(self, path, pool_size=4):
+        self.pool = ConnectionPool(path, size=pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+            # Databases from before tier state was kept
+            columns = {row[1] for row in
+                       conn.execute("PRAGMA table_info(results)")}
+            if "tier" not in columns:
+                conn.execute("ALTER TABLE results ADD COLUMN tier INTEGER")
+
+    def close(self):
+        self.pool.close()
+
+    def transaction(self):
+        """Context manager making the saves inside it all-or-nothing."""
+        return self.pool.transaction()
+
+    def save_plan(self, plan):
+        """Store a plan (name, file, rule dict or ``CompiledPlan``).
+
+        Returns its ``plan_version``; unchanged rules reuse the latest one.
+        """
+        rules = compile_plan(plan).rules
+        name = rules.get("name", "")
+        payload = json.dumps(rules, sort_keys=True)
+        with self.pool.connection() as conn:
+            latest = conn.execute(
+                "SELECT plan_version, rules FROM plan_versions WHERE name = ? "
+                "ORDER BY plan_version DESC LIMIT 1", (name,)).fetchone()
+            if latest is not None and latest[1] == payload:
+                return latest[0]
+            cursor = conn.execute(
+                "INSERT INTO plan_versions (name, rules, created_at) "
+                "VALUES (?, ?, ?)", (name, payload, time.time()))
+            return cursor.lastrowid
+
+    def load_plan(self, plan_version):
+        """The rule dict stored as ``plan_version``."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT rules FROM plan_versions WHERE plan_version = ?",
+                (plan_version,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown plan version {plan_version!r}")
+        return validate_plan(json.loads(row[0]))
+
+    def plan_versions(self):
+        """Every stored plan version, newest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT plan_version, name, created_at FROM plan_versions "
+                "ORDER BY plan_version DESC").fetchall()
+        return pd.DataFrame(rows, columns=["plan_version", "name", "created_at"])
+
+    def periods(self):
+        """Periods with stored results, latest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT period FROM results ORDER BY period DESC")
+            return [period for (period,) in rows]
+
+    def rep_ids(self, period=None):
+        """Rep ids with stored results, as stored (ints stay ints)."""
+        sql = "SELECT DISTINCT rep_id FROM results"
+        params = ()
+        if period is not None:
+            sql += " WHERE period = ?"
+            params = (period,)
+        with self.pool.connection() as conn:
+            return [rep_id for (rep_id,) in conn.execute(sql, params)]
+
+    def save_inputs(self, df, period=None):
+        """Upsert each row's role and plan inputs for its (rep_id, period)."""
+        if "rep_id" not in df.columns or "role" not in df.columns:
+            raise ValueError("Inputs need 'rep_id' and 'role' columns")
+        rows = _rows(df, [df["rep_id"].tolist(), _periods(df, period),
+                          df["role"].astype(str).str.upper().tolist()],
+                     INPUT_COLUMNS)
+        columns = ["rep_id", "period", "role", *INPUT_COLUMNS]
+        with self.pool.connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO inputs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})", rows)
+        return len(rows)
+
+    def save_results(self, payouts, plan_version, period=None):
+        """Upsert computed payouts (``compute_payouts`` output) for a plan version.
+
+        Each row's tier position under that version is stored alongside.
+        """
+        if "rep_id" not in payouts.columns or "role" not in payouts.columns:
+            raise ValueError("Payouts need 'rep_id' and 'role' columns")
+        now = time.time()
+        tiers = payout_tiers(self.load_plan(plan_version), payouts).tolist()
+        rows = _rows(payouts, [payouts["rep_id"].tolist(),
+                               _periods(payouts, period),
+                               [plan_version] * len(payouts),
+                               payouts["role"].astype(str).str.upper().tolist()],
+                     PAYOUT_COLUMNS)
+        rows = [row + (now, tier) for row, tier in zip(rows, tiers)]
+        columns = ["rep_id", "period", "plan_version", "role", *PAYOUT_COLUMNS,
+                   "computed_at", "tier"]
+        with self.pool.connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})", rows)
+        return len(rows)
+
+    def _select(self, table, columns, numeric, filters, keys=None,
+                integer=()):
+        clauses = [f"{name} = ?" for name, value in filters if value is not None]
+        params = [value for _, value in filters if value is not None]
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        if keys is not None:
+            # Only the listed (rep_id, period) pairs, joined on the primary key
+            sql += " JOIN temp.wanted USING (rep_id, period)"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self.pool.connection() as conn:
+            if keys is not None:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted "
+                             "(rep_id, period TEXT)")
+                conn.execute("DELETE FROM temp.wanted")
+                conn.executemany(
+                    "INSERT INTO temp.wanted VALUES (?, ?)",
+                    zip(keys["rep_id"].tolist(),
+                        keys["period"].astype(str).tolist()))
+            rows = conn.execute(sql + f" ORDER BY {table}.rowid",
+                                params).fetchall()
+        frame = pd.DataFrame.from_records(rows, columns=columns,
+                                          coerce_float=True)
+        # NULL-only columns come back as objects; keep the float layout
+        return frame.astype({**{name: "float64" for name in numeric},
+                             **{name: "Int64" for name in integer}})
+
+    def load_inputs(self, period=None, rep_id=None, keys=None):
+        """Stored inputs for a period and/or rep, ready for ``compute_payouts``.
+
+        ``keys`` (a frame of ``rep_id`` and ``period``) limits the rows to
+        those rep-periods.
+        """
+        columns = ["rep_id", "period", "role", *INPUT_COLUMNS]
+        return self._select("inputs", columns, INPUT_COLUMNS,
+                            [("rep_id", rep_id), ("period", period)], keys)
+
+    def load_results(self, period=None, plan_version=None, rep_id=None,
+                     keys=None):
+        """Stored payouts filtered by any of period, plan version, rep and ``keys``."""
+        columns = ["rep_id", "period", "plan_version", "role", *PAYOUT_COLUMNS,
+                   "computed_at", "tier"]
+        return self._select("results", columns, PAYOUT_COLUMNS,
+                            [("rep_id", rep_id), ("plan_version", plan_version),
+                             ("period", period)], keys, integer=["tier"])
+
+    def save_adjustments(self, lines, events=None):
+        """Append adjustment lines (``ADJUSTMENT_COLUMNS``).
+
+        ``events`` (``rep_id``, ``period`` and ``event_id``) records which
+        events each line applies, for ``applied_events``.
+        """
+        now = time.time()
+        frame = lines.reindex(columns=ADJUSTMENT_COLUMNS).astype(
+            {"old_tier": "object", "new_tier": "object"})
+        frame = frame.where(frame.notna(), None)
+        rows = [row + (now,) for row in frame.itertuples(index=False, name=None)]
+        columns = [*ADJUSTMENT_COLUMNS, "created_at"]
+        sql = (f"INSERT INTO adjustments ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        with self.pool.connection() as conn:
+            if events is None:
+                conn.executemany(sql, rows)
+                return len(rows)
+            # One insert per line to learn its id; a line is one rep-period
+            ids = {(rep_id, str(period)): conn.execute(sql, row).lastrowid
+                   for rep_id, period, row in zip(lines["rep_id"],
+                                                  lines["period"], rows)}
+            conn.executemany(
+                "INSERT INTO adjustment_events (event_id, adjustment_id) "
+                "VALUES (?, ?)",
+                [(str(event_id), ids[rep_id, str(period)])
+                 for rep_id, period, event_id in zip(
+                     events["rep_id"], events["period"], events["event_id"])])
+        return len(rows)
+
+    def applied_events(self, event_ids):
+        """The ids among ``event_ids`` that already have adjustment lines."""
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_events "
+                         "(event_id TEXT)")
+            conn.execute("DELETE FROM temp.wanted_events")
+            conn.executemany("INSERT INTO temp.wanted_events VALUES (?)",
+                             [(str(event_id),) for event_id in event_ids])
+            rows = conn.execute(
+                "SELECT event_id FROM adjustment_events "
+                "JOIN temp.wanted_events USING (event_id)").fetchall()
+        return {event_id for (event_id,) in rows}
+
+    def load_adjustments(self, booked_period=None, rep_id=None, period=None):
+        """Stored adjustment lines, oldest first."""
+        columns = [*ADJUSTMENT_COLUMNS, "created_at"]
+        return self._select("adjustments", columns,
+                            ["cancelled_amount", "old_payout", "new_payout",
+                             "adjustment"],
+                            [("rep_id", rep_id), ("period", period),
+                             ("booked_period", booked_period)],
+                            integer=["plan_version", "cancelled_deals",
+                                     "old_tier", "new_tier"])
+
+    def compute_period(self, period, plan):
+        """Pay a stored period's inputs under ``plan`` and store the results.
+
+        Returns ``(plan_version, payouts)``.
+        """
+        plan_version = self.save_plan(plan)
+        rules = self.load_plan(plan_version)
+        inputs = self.load_inputs(period)
+        payouts = compute_payouts(inputs, rules)
+        self.save_results(payouts, plan_version)
+        return plan_version, payouts
@@ -0,0 +1,92 @@
+"""What-if sweeps of plan parameters across the real rep population.
+
+``sweep_costs`` takes a grid of plan inputs (e.g. ``accelerator_threshold``
+and ``commission_cap_multiplier``), forms every combination, and pays the
+whole roster under each one. Grid points run along one axis and reps along
+the other, so each block of grid points is a single (points x reps) NumPy
+broadcast through the batch engine, with no Python loop over points or reps.
+Blocks are sized like the cost simulation's, so memory stays bounded
+however large the grid.
+
+The result has one row per grid point with its total cost;
+``cost_surface`` pivots it into a 2-D surface for charting.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from compcalc.batch import ae_arrays, sdr_arrays
+from compcalc.plans import (AE_DEFAULTS, DEFAULT_PLAN, SDR_DEFAULTS,
+                            ae_defaults, get_plan, sdr_defaults)
+from compcalc.simulate import BLOCK_CELLS, _inputs, _role_masks
+
+COST_COLUMNS = ["sdr_cost", "ae_cost", "total_cost", "accelerator_cost"]
+
+
+def sweep_costs(roster, grid, plan=DEFAULT_PLAN, role=None, block_size=None):
+    """Total roster cost at every combination of the ``grid`` values.
+
+    ``grid`` maps plan input names to the values to try, e.g.
+    ``{"accelerator_threshold": np.linspace(1.0, 2.0, 50)}``. A parameter
+    overrides the roster's own column for the role(s) that use it.
+    Returns a DataFrame with one column per parameter plus
+    ``COST_COLUMNS``, one row per grid point.
+    """
+    unknown = set(grid) - set(SDR_DEFAULTS) - set(AE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown plan input(s) in grid: {sorted(unknown)}")
+    rules = get_plan(plan)
+    frame = roster.reset_index(drop=True)
+    is_sdr, is_ae = _role_masks(frame, role)
+    sdr_inputs = _inputs(frame[is_sdr], sdr_defaults(rules))
+    ae_inputs = _inputs(frame[is_ae], ae_defaults(rules))
+
+    names = list(grid)
+    points = pd.DataFrame(list(itertools.product(*(
+        np.asarray(grid[name], dtype=np.float64) for name in names))),
+        columns=names, dtype=np.float64)
+    size = len(points)
+    block_size = block_size or max(1, BLOCK_CELLS // max(len(frame), 1))
+
+    costs = {name: np.zeros(size) for name in COST_COLUMNS}
+    for start in range(0, size, block_size):
+        block = slice(start, min(start + block_size, size))
+        # Each parameter is a column vector, broadcasting against the reps
+        params = {name: points[name].to_numpy()[block, None] for name in names}
+        if is_sdr.any():
+            sdr = sdr_arrays({**sdr_inputs, **{
+                name: value for name, value in params.items()
+                if name in SDR_DEFAULTS}}, rules)
+            shape = (block.stop - block.start, int(is_sdr.sum()))
+            costs["sdr_cost"][block] = np.broadcast_to(
+                sdr["grand_total"], shape).sum(axis=1)
+            costs["accelerator_cost"][block] += np.broadcast_to(
+                sdr["excess_sal_bonus"] + sdr["excess_sql_bonus"],
+                shape).sum(axis=1)
+        if is_ae.any():
+            ae = ae_arrays({**ae_inputs, **{
+                name: value for name, value in params.items()
+                if name in AE_DEFAULTS}}, rules)
+            shape = (block.stop - block.start, int(is_ae.sum()))
+            costs["ae_cost"][block] = np.broadcast_to(
+                ae["total_earnings"], shape).sum(axis=1)
+            costs["accelerator_cost"][block] += np.broadcast_to(
+                np.maximum(ae["commission"] - ae["standard_commission"], 0.0),
+                shape).sum(axis=1)
+    costs["total_cost"] = costs["sdr_cost"] + costs["ae_cost"]
+    return pd.concat([points, pd.DataFrame(costs)], axis=1)
+
+
+def cost_surface(result, x, y, value="total_cost", **fixed):
+    """Pivot a sweep into a surface: ``y`` values as rows, ``x`` as columns.
+
+    Any other swept parameters must be pinned with keyword arguments, e.g.
+    ``cost_surface(result, "accelerator_threshold",
+    "commission_cap_multiplier", lead_conversion_rate=0.5)``.
+    """
+    rows = result
+    for name, pinned in fixed.items():
+        rows = rows[np.isclose(rows[name], pinned)]
+    return rows.pivot(index=y, columns=x, values=value)
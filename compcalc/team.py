@@ -0,0 +1,74 @@
+"""Server-side paging, sorting and filtering over a team's payout table.
+
+The team view computes the whole roster's payouts once and keeps the table
+on the server. Each rerun filters and sorts it here and sends only one
+page of rows to the browser grid, so a 20k-rep roster never travels
+wholesale to the client.
+"""
+
+import math
+
+import numpy as np
+
+from compcalc.batch import compute_payouts
+
+# Columns shown in the team grid, in order, when the table has them
+TEAM_COLUMNS = ["rep_id", "name", "team", "role", "attainment_rate",
+                "sal_attainment_rate", "sql_attainment_rate",
+                "monthly_base_salary", "commission", "grand_total",
+                "total_payout"]
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+def team_payouts(roster, plan):
+    """The roster's payouts trimmed to ``TEAM_COLUMNS``."""
+    payouts = compute_payouts(roster, plan)
+    return payouts[[name for name in TEAM_COLUMNS if name in payouts.columns]] \
+        .reset_index(drop=True)
+
+
+def filter_payouts(table, role=None, search=None, min_payout=None):
+    """Rows of ``table`` matching every given filter.
+
+    ``search`` matches rep ids (and names and teams, where present) by
+    case-insensitive substring. With no filters ``table`` itself is
+    returned, so an already filtered table can be passed on without a copy.
+    """
+    if not role and not search and min_payout is None:
+        return table
+    keep = np.ones(len(table), dtype=bool)
+    if role:
+        keep &= (table["role"].astype(str).str.upper() == role.upper()).to_numpy()
+    if search:
+        found = np.zeros(len(table), dtype=bool)
+        for name in ("rep_id", "name", "team"):
+            if name in table.columns:
+                found |= table[name].astype(str).str.contains(
+                    search, case=False, regex=False).to_numpy()
+        keep &= found
+    if min_payout is not None:
+        keep &= (table["total_payout"] >= min_payout).to_numpy()
+    return table[keep]
+
+
+def page_count(rows, page_size):
+    return max(1, math.ceil(rows / page_size))
+
+
+def team_page(table, page=1, page_size=50, sort_by="total_payout",
+              ascending=False, role=None, search=None, min_payout=None):
+    """One page of the filtered, sorted table and the filtered row count.
+
+    ``page`` is 1-based and clamped to the last page. Ties keep roster
+    order and blanks sort last, so pages do not shuffle between reruns.
+    A caller that has already run ``filter_payouts`` passes its result and
+    no filters.
+    """
+    rows = filter_payouts(table, role, search, min_payout)
+    if sort_by:
+        rows = rows.sort_values(sort_by, ascending=ascending, kind="stable",
+                                na_position="last")
+    page = min(max(int(page), 1), page_count(len(rows), page_size))
+    start = (page - 1) * page_size
+    return rows.iloc[start:start + page_size], len(rows)
@@ -0,0 +1,214 @@
+"""Opt-in per-stage timing and profiling for the pages and batch runs.
+
+Timing is off unless ``COMPCALC_TIMING=1`` is set (or ``enable()`` is
+called); while off, every hook is a no-op costing well under a microsecond.
+When on, each stage's wall time is recorded into a histogram labelled
+with its scope (``app``, ``batch``, ``cli``) and stage name:
+
+- ``batch``: ``input_parsing``, ``tier_evaluation``, ``caps``,
+  ``eligibility_gating`` and ``totals``, in that order, inside both
+  ``sdr_arrays`` and ``ae_arrays`` and for every plan (``caps`` is recorded
+  even where a plan has no cap), so the stages compare across roles;
+- ``cli``: ``input_parsing``, ``calculation``, ``store`` and ``output`` per
+  chunk;
+- ``app``: ``css``, ``widgets``, ``calculation`` and ``rendering`` per rerun
+  of an instrumented page.
+
+``prometheus_text()`` renders the histograms in the Prometheus text
+exposition format; ``write_prometheus(path)`` writes them to a file (for a
+node-exporter textfile collector, or ``COMPCALC_TIMING_FILE`` after every
+page rerun) and ``serve_prometheus(port)`` exposes them on ``/metrics``.
+
+Setting ``COMPCALC_PROFILE=path`` (or ``--profile`` on the command line)
+captures a cProfile of each page rerun or batch run to ``path``, readable
+with ``python -m pstats``.
+"""
+
+import bisect
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC = "compcalc_stage_seconds"
+
+_enabled = os.environ.get("COMPCALC_TIMING", "") not in ("", "0")
+_histograms = {}
+_lock = threading.Lock()
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled():
+    return _enabled
+
+
+class Histogram:
+    """Bucket counts, sum and count of one stage's timings."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        # One count per bucket plus the +Inf overflow
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+def observe(scope, stage, seconds):
+    """Record one timing for ``stage`` of ``scope``."""
+    with _lock:
+        histogram = _histograms.get((scope, stage))
+        if histogram is None:
+            histogram = _histograms[(scope, stage)] = Histogram()
+        histogram.observe(seconds)
+
+
+def snapshot():
+    """``{(scope, stage): (count, total seconds)}`` for every recorded stage."""
+    with _lock:
+        return {key: (histogram.count, histogram.total)
+                for key, histogram in _histograms.items()}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+class StageClock:
+    """Times consecutive stages of straight-line code.
+
+    ``lap(stage)`` records the time since the clock started or since the
+    previous lap as ``stage``, so a page or function only needs one call at
+    the end of each stage.
+    """
+
+    __slots__ = ("scope", "last", "laps")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.laps = []
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        seconds = now - self.last
+        self.last = now
+        self.laps.append((stage, seconds))
+        observe(self.scope, stage, seconds)
+
+
+class _NullClock:
+    __slots__ = ()
+    laps = ()
+
+    def lap(self, stage):
+        pass
+
+
+_NULL_CLOCK = _NullClock()
+
+
+def stage_clock(scope):
+    """A ``StageClock`` for ``scope``, or a no-op clock while timing is off."""
+    return StageClock(scope) if _enabled else _NULL_CLOCK
+
+
+def prometheus_text():
+    """All histograms in the Prometheus text exposition format."""
+    lines = [f"# HELP {METRIC} Wall time of each compcalc stage.",
+             f"# TYPE {METRIC} histogram"]
+    with _lock:
+        items = sorted((key, list(histogram.counts), histogram.total,
+                        histogram.count)
+                       for key, histogram in _histograms.items())
+    for (scope, stage), counts, total, count in items:
+        labels = f'scope="{scope}",stage="{stage}"'
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS, counts):
+            cumulative += bucket
+            lines.append(f'{METRIC}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"{METRIC}_sum{{{labels}}} {total!r}")
+        lines.append(f"{METRIC}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Write ``prometheus_text()`` to ``path`` atomically."""
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w") as handle:
+        handle.write(prometheus_text())
+    os.replace(partial, path)
+
+
+def flush():
+    """Write the histograms to ``COMPCALC_TIMING_FILE``, when set."""
+    path = os.environ.get("COMPCALC_TIMING_FILE")
+    if _enabled and path:
+        write_prometheus(path)
+
+
+def serve_prometheus(port=9464, host="127.0.0.1"):
+    """Serve the histograms on ``http://host:port/metrics`` from a daemon thread.
+
+    Returns the server; call ``shutdown()`` on it to stop.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type",
+                             "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def profile_path():
+    """Where to write cProfile captures (``COMPCALC_PROFILE``), or None."""
+    return os.environ.get("COMPCALC_PROFILE") or None
+
+
+def start_profile(path):
+    """Start a cProfile capture destined for ``path``; None when ``path`` is empty."""
+    if not path:
+        return None
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler, path
+
+
+def stop_profile(capture):
+    """Stop a capture from ``start_profile`` and write its stats."""
+    if capture is None:
+        return
+    profiler, path = capture
+    profiler.disable()
+    profiler.dump_stats(path)
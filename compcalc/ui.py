@@ -0,0 +1,159 @@
+"""Streamlit helpers shared by the calculator pages.
+
+Only the pages import this module; the batch tools never load Streamlit.
+Streamlit reruns a page top to bottom on every widget change, so the
+calculations are wrapped in ``st.cache_data``: a rerun with the same plan
+and inputs (the common case when many reps check the same numbers) is a
+cache hit. The caches are bounded so a busy server does not grow without
+limit.
+
+Anything only a particular view needs (curves, grids, charting libraries)
+is imported inside the function that draws that view, so a page's first
+paint does not wait on it.
+"""
+
+import streamlit as st
+
+from compcalc.compiled import compile_plan
+from compcalc.plans import ae_defaults
+
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL_SECONDS = 60 * 60
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS,
+               show_spinner=False)
+def sdr_breakdown(plan, **inputs):
+    """Cached SDR breakdown keyed on the plan and every input."""
+    return compile_plan(plan).sdr(inputs)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS,
+               show_spinner=False)
+def ae_breakdown(plan, **inputs):
+    """Cached AE breakdown keyed on the plan and every input."""
+    return compile_plan(plan).ae(inputs)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS,
+               show_spinner=False)
+def ae_earnings_curve(plan, **inputs):
+    """Cached AE earnings curve keyed on the plan parameters."""
+    from compcalc.curves import ae_curve
+
+    return ae_curve(inputs, compile_plan(plan).rules)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS,
+               show_spinner=False)
+def sdr_earnings_curve(plan, **inputs):
+    """Cached SDR earnings curve keyed on the plan parameters."""
+    from compcalc.curves import sdr_curve
+
+    return sdr_curve(inputs, compile_plan(plan).rules)
+
+
+def earnings_curve_chart(curve, label, default_pct=100):
+    """Draw a precomputed earnings curve with a what-if attainment slider.
+
+    The slider reads its value from the curve, so dragging it never
+    recomputes the plan.
+    """
+    from compcalc.curves import MAX_ATTAINMENT_PCT, curve_value
+
+    st.write(f"**{label} vs. Attainment:**")
+    st.line_chart(curve, x="attainment_pct", y="total_earnings")
+    what_if_pct = st.slider(
+        f"What-if Attainment (%) - {label}", min_value=0,
+        max_value=MAX_ATTAINMENT_PCT, value=default_pct, step=1)
+    st.write(f"At {what_if_pct}% attainment your total earnings would be "
+             f"€{curve_value(curve, what_if_pct):,.2f}.")
+
+
+def sales_needed_widget(plan, **inputs):
+    """Ask for a target payout and show the sales needed to reach it.
+
+    The answer comes from the closed-form solver, so changing the target
+    never recomputes the plan.
+    """
+    from compcalc.solver import sales_needed
+
+    rules = compile_plan(plan).rules
+    values = {**ae_defaults(rules), **inputs}
+    # On-target earnings; a fixed default keeps the widget stable across reruns
+    on_target = values["base_salary"] / 12 + \
+        values["monthly_target"] * values["commission_rate"]
+    st.write("### What Do I Need to Close?")
+    target_earnings = st.number_input(
+        "Target Total Earnings (€)", min_value=0.0,
+        value=float(round(on_target, 2)), step=100.0,
+        help="Total monthly earnings you want to reach, including base salary.")
+    result = sales_needed(values, target_earnings, rules)
+    if result["required_sales"] == float("inf"):
+        st.write(f"The plan cannot pay €{target_earnings:,.2f} in a month "
+                 "with these settings.")
+    elif result["additional_sales"] == 0:
+        st.write(f"You have already reached €{target_earnings:,.2f}.")
+    else:
+        st.write(f"To earn €{target_earnings:,.2f} you need "
+                 f"€{result['required_sales']:,.2f} in total sales "
+                 f"({result['required_attainment_rate'] * 100:.1f}% "
+                 f"attainment), €{result['additional_sales']:,.2f} more "
+                 "than you have closed.")
+
+
+@st.cache_resource(show_spinner=False)
+def payout_store(path):
+    """One store per database, its connection pool shared by every session."""
+    from compcalc.store import PayoutStore
+
+    return PayoutStore(path)
+
+
+def autorefresh(interval_ms, key):
+    """Rerun the page every ``interval_ms`` milliseconds."""
+    from streamlit_autorefresh import st_autorefresh
+
+    return st_autorefresh(interval=interval_ms, key=key)
+
+
+@st.cache_data(max_entries=32, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def team_table(plan, roster_path, modified):
+    """The roster's payout table, recomputed when the file changes."""
+    from compcalc.files import read_table
+    from compcalc.team import team_payouts
+
+    return team_payouts(read_table(roster_path), plan)
+
+
+def payout_grid(rows, key):
+    """Show one page of payouts in AgGrid.
+
+    Sorting and filtering happen server-side over the whole table, so the
+    grid's own (page-local) sort and filter menus are switched off.
+    """
+    from st_aggrid import AgGrid, GridOptionsBuilder
+
+    builder = GridOptionsBuilder.from_dataframe(rows)
+    builder.configure_default_column(sortable=False, filter=False,
+                                     resizable=True)
+    for name in rows.columns:
+        if rows[name].dtype.kind == "f":
+            builder.configure_column(
+                name, type=["numericColumn"],
+                valueFormatter="x.value == null ? '' : "
+                               "x.value.toLocaleString(undefined, "
+                               "{maximumFractionDigits: 2})")
+    return AgGrid(rows, gridOptions=builder.build(), height=600,
+                  update_mode="NO_UPDATE", key=key,
+                  enable_enterprise_modules=False)
+
+
+def timing_sidebar(clock):
+    """List this rerun's stage timings in the sidebar when timing is on."""
+    if not clock.laps:
+        return
+    st.sidebar.write("**Rerun Timings**")
+    st.sidebar.table({"Stage": [stage for stage, _ in clock.laps],
+                      "ms": [f"{seconds * 1000:.1f}"
+                             for _, seconds in clock.laps]})
@@ -0,0 +1,22 @@
+"""Shared helpers for the benchmark suite.
+
+Every benchmark asserts a budget on its best time. The budgets are
+deliberately loose (several times the measured time on a laptop) so that
+only real regressions, not machine noise, fail the run. Every case is
+marked ``benchmark``, which pytest.ini leaves out by default; select them
+with ``-m benchmark``. With ``--benchmark-disable`` each case runs once as a
+smoke test and budgets are not checked.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def assert_budget(benchmark, budget):
+    """Fail when the best round of ``benchmark`` took longer than ``budget`` seconds."""
+    if benchmark.stats is None:
+        return
+    best = benchmark.stats.stats.min
+    assert best <= budget, f"best {best * 1e3:.3f} ms exceeds budget " \
+                           f"{budget * 1e3:.3f} ms"
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.plans import CAPPED, TIERED
+from compcalc.sweep import sweep_costs
+
+from tests.benchmarks.conftest import assert_budget
+from tests.conftest import make_roster
+
+pytestmark = pytest.mark.benchmark
+
+# Seconds a batch run may take per 1k reps, and never less than 50 ms
+BATCH_BUDGET_PER_1K = 0.005
+
+_rosters = {}
+
+
+def _roster(size):
+    # Built once per size; the 1M roster takes a moment to generate
+    if size not in _rosters:
+        _rosters[size] = make_roster(size)
+    return _rosters[size]
+
+
+@pytest.mark.parametrize("plan", [CAPPED, TIERED])
+@pytest.mark.parametrize("size", [1_000, 100_000, 1_000_000],
+                         ids=["1k", "100k", "1M"])
+def test_compute_payouts(benchmark, plan, size):
+    roster = _roster(size)
+    rounds = 3 if size >= 1_000_000 else 5
+    payouts = benchmark.pedantic(compute_payouts, args=(roster, plan),
+                                 rounds=rounds, warmup_rounds=1)
+    assert len(payouts) == size
+    assert_budget(benchmark, max(size / 1000 * BATCH_BUDGET_PER_1K, 0.05))
+
+
+def test_sweep_costs(benchmark):
+    roster = _roster(10_000)
+    grid = {"accelerator_threshold": np.linspace(1.0, 2.0, 50),
+            "commission_cap_multiplier": np.linspace(1.0, 4.0, 50)}
+    result = benchmark.pedantic(sweep_costs, args=(roster, grid, CAPPED),
+                                rounds=3)
+    assert len(result) == 2500
+    assert_budget(benchmark, 3.0)
@@ -0,0 +1,41 @@
+import pytest
+
+from compcalc.formulas import (ae_compensation, calculate_pro_rata_bonus,
+                               enforce_criteria, make_ae_evaluator,
+                               sdr_compensation)
+from compcalc.plans import BASIC, CAPPED, TIERED
+
+from tests.benchmarks.conftest import assert_budget
+
+pytestmark = pytest.mark.benchmark
+
+SDR_INPUTS = {"total_sals_attained": 27, "total_sqls_attained": 12,
+              "total_revenue_assist": 30000.0}
+AE_INPUTS = {"total_sales": 82000.0}
+
+
+def test_enforce_criteria(benchmark):
+    benchmark(enforce_criteria, 1.2, 1000.0)
+    assert_budget(benchmark, 5e-6)
+
+
+def test_calculate_pro_rata_bonus(benchmark):
+    benchmark(calculate_pro_rata_bonus, 0.8, 1000.0)
+    assert_budget(benchmark, 5e-6)
+
+
+def test_sdr_compensation(benchmark):
+    benchmark(sdr_compensation, SDR_INPUTS, CAPPED)
+    assert_budget(benchmark, 1e-4)
+
+
+@pytest.mark.parametrize("plan", [BASIC, TIERED])
+def test_ae_compensation(benchmark, plan):
+    benchmark(ae_compensation, AE_INPUTS, plan)
+    assert_budget(benchmark, 1e-4)
+
+
+def test_compiled_ae(benchmark):
+    evaluate = make_ae_evaluator(TIERED)
+    benchmark(evaluate, AE_INPUTS)
+    assert_budget(benchmark, 3e-5)
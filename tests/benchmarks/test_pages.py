@@ -0,0 +1,46 @@
+"""Page reruns.
+
+Streamlit's AppTest harness is used when the installed Streamlit provides
+it (1.28+). requirements.txt pins 1.25, so otherwise each page is
+re-executed in bare mode, which runs the same script code without a
+browser session.
+"""
+
+import contextlib
+import io
+import os
+import runpy
+
+import pytest
+
+from tests.benchmarks.conftest import assert_budget
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+PAGES = ["app.py", "Comp Calculator.py", "Updated Comp Calc.py"]
+
+
+def _rerun(path):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        def rerun():
+            with contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                runpy.run_path(path, run_name="__main__")
+        return rerun
+    app = AppTest.from_file(path).run()
+    return app.run
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_page_rerun(benchmark, page):
+    from streamlit import logger
+
+    logger.set_log_level("error")
+    rerun = _rerun(os.path.join(ROOT, page))
+    rerun()  # warm caches and imports
+    benchmark.pedantic(rerun, rounds=5, iterations=1)
+    assert_budget(benchmark, 0.5)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_roster(size, seed=0):
+    """A mixed SDR/AE roster with blanks, zero targets and edge attainments."""
+    rng = np.random.default_rng(seed)
+    is_ae = rng.random(size) < 0.5
+    target = rng.choice([0.0, 40e3, 50e3, 60e3], size, p=[0.05, 0.3, 0.4, 0.25])
+    # Land some reps exactly on the gate and the tier breakpoints
+    sales = np.where(rng.random(size) < 0.2,
+                     target * rng.choice([0.5, 1.0, 1.25, 1.5, 2.0], size),
+                     rng.uniform(0, 150e3, size))
+    return pd.DataFrame({
+        "rep_id": [f"r{i}" for i in range(size)],
+        "role": np.where(is_ae, "AE", "SDR"),
+        "monthly_target": np.where(is_ae, target, np.nan),
+        "total_sales": np.where(is_ae, sales, np.nan),
+        "total_sals_attained": np.where(is_ae, np.nan,
+                                        rng.integers(0, 50, size)),
+        "total_sqls_attained": np.where(is_ae, np.nan,
+                                        rng.integers(0, 25, size)),
+        "total_revenue_assist": np.where(is_ae, np.nan,
+                                         rng.uniform(0, 1e5, size)),
+    })
+
+
+@pytest.fixture
+def roster():
+    return make_roster(400)
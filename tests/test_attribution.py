@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+
+from compcalc.attribution import (attribute_deals, attributed_payouts,
+                                  split_roles, validate_splits)
+
+DEALS = pd.DataFrame({"deal_id": [1, 2, 3], "period": ["2025-01"] * 3,
+                      "amount": [1000.0, 2000.0, 4000.0],
+                      "rep_id": ["ae1", "ae1", "ae2"]})
+
+
+def _splits(rows):
+    return pd.DataFrame(rows, columns=["deal_id", "rep_id", "split", "role",
+                                       "credit_type"])
+
+
+def _credited(deals, splits):
+    totals = attribute_deals(deals, splits)
+    return dict(zip(totals["rep_id"], totals["total_amount"]))
+
+
+def test_unsplit_deals_go_to_their_owner():
+    assert _credited(DEALS, _splits([])) == {"ae1": 3000.0, "ae2": 4000.0}
+
+
+def test_overlay_only_deal_keeps_its_owner():
+    splits = _splits([(3, "ov1", 0.1, "AE", "overlay")])
+    assert _credited(DEALS, splits) == {"ae1": 3000.0, "ae2": 4000.0,
+                                        "ov1": 400.0}
+
+
+def test_ordinary_and_overlay_splits():
+    splits = _splits([(3, "ae1", 0.5, "AE", "split"),
+                      (3, "ae2", 0.5, "AE", "split"),
+                      (3, "ov1", 0.25, "AE", "overlay")])
+    assert _credited(DEALS, splits) == {"ae1": 5000.0, "ae2": 2000.0,
+                                        "ov1": 1000.0}
+
+
+def test_ae_and_sdr_pools_are_separate():
+    # 100% to the AEs and another 100% to the SDRs is not over-allocated
+    splits = _splits([(3, "ae2", 1.0, "AE", "split"),
+                      (3, "sdr1", 0.6, "SDR", "split"),
+                      (3, "sdr2", 0.4, "SDR", "split")])
+    assert _credited(DEALS, splits) == {"ae1": 3000.0, "ae2": 4000.0,
+                                        "sdr1": 2400.0, "sdr2": 1600.0}
+
+
+def test_ae_remainder_goes_to_the_owner():
+    splits = _splits([(3, "ae1", 0.25, "AE", "split"),
+                      (3, "sdr1", 1.0, "SDR", "split")])
+    assert _credited(DEALS, splits) == {"ae1": 4000.0, "ae2": 3000.0,
+                                        "sdr1": 4000.0}
+
+
+def test_ae_remainder_without_an_owner_is_an_error():
+    splits = _splits([(3, "ae1", 0.25, "AE", "split")])
+    with pytest.raises(ValueError, match="less than 100%"):
+        attribute_deals(DEALS.drop(columns="rep_id"), splits)
+
+
+@pytest.mark.parametrize("rows, message", [
+    ([(3, "sdr1", 0.5, "SDR", "split")], "SDR splits add up to less"),
+    ([(3, "ae1", 0.7, "AE", "split"), (3, "ae2", 0.7, "AE", "split")],
+     "AE splits add up to more"),
+    ([(3, "sdr1", 1.0, "SDR", "split"), (3, "sdr2", 0.5, "SDR", "split")],
+     "SDR splits add up to more"),
+    ([(3, "x", 0.5, "manager", "split")], "role"),
+    ([(3, "x", 1.5, "AE", "split")], "between 0 and 1"),
+])
+def test_invalid_splits(rows, message):
+    with pytest.raises(ValueError, match=message):
+        validate_splits(_splits(rows))
+
+
+def test_roles_come_from_the_roster(tmp_path):
+    roster = pd.DataFrame({"rep_id": ["ae1", "ae2", "sdr1"],
+                           "role": ["AE", "AE", "SDR"],
+                           "monthly_target": [5000.0, 5000.0, None]})
+    splits = _splits([(3, "ae1", 0.5, None, "split"),
+                      (3, "sdr1", 1.0, None, "split")]).drop(columns="role")
+    assert split_roles(splits, roster)["role"].tolist() == ["AE", "SDR"]
+    ledger = tmp_path / "deals.csv"
+    DEALS.to_csv(ledger, index=False)
+    payouts = attributed_payouts(str(ledger), splits, roster, "basic")
+    totals = dict(zip(payouts["rep_id"], payouts["total_sales"]))
+    assert totals["ae1"] == 5000.0 and totals["ae2"] == 2000.0
+    assert payouts.set_index("rep_id").loc["sdr1", "total_revenue_assist"] \
+        == 4000.0
@@ -0,0 +1,117 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.clawback import process_cancellations
+from compcalc.incremental import payout_tiers
+from compcalc.store import PayoutStore
+
+from tests.conftest import make_roster
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PayoutStore(str(tmp_path / "payouts.db"))
+    store.save_inputs(make_roster(50), period="2025-01")
+    store.compute_period("2025-01", "tiered")
+    yield store
+    store.close()
+
+
+def _events(*rows):
+    return pd.DataFrame(rows, columns=["deal_id", "rep_id", "period",
+                                       "amount"])
+
+
+def _ae_ids(store, count):
+    inputs = store.load_inputs("2025-01")
+    return inputs.loc[inputs["role"] == "AE", "rep_id"].head(count).tolist()
+
+
+def test_adjustment_matches_a_full_recompute(store):
+    rep_id, = _ae_ids(store, 1)
+    lines = process_cancellations(store, _events(
+        (1, rep_id, "2025-01", 4000.0), (2, rep_id, "2025-01", 1000.0)),
+        booked_period="2025-06")
+    inputs = make_roster(50).set_index("rep_id").loc[[rep_id]].reset_index()
+    before = compute_payouts(inputs, "tiered")["total_payout"].item()
+    after = compute_payouts(inputs.assign(
+        total_sales=(inputs["total_sales"] - 5000.0).clip(lower=0.0)),
+        "tiered")["total_payout"].item()
+    assert lines["cancelled_deals"].tolist() == [2]
+    assert lines["adjustment"].item() == pytest.approx(after - before)
+
+
+def test_replaying_events_changes_nothing(store):
+    first, second = _ae_ids(store, 2)
+    events = _events((1, first, "2025-01", 4000.0))
+    assert len(process_cancellations(store, events, "2025-06")) == 1
+    results = store.load_results("2025-01")
+    assert process_cancellations(store, events, "2025-06").empty
+    pd.testing.assert_frame_equal(store.load_results("2025-01"), results)
+
+    # Only the new event of an overlapping file is applied
+    overlap = pd.concat([events, _events((2, second, "2025-01", 500.0))])
+    lines = process_cancellations(store, overlap, "2025-07")
+    assert lines["rep_id"].tolist() == [second]
+    assert len(store.load_adjustments()) == 2
+
+
+def test_event_ids_tell_repeat_deals_apart(store):
+    rep_id, = _ae_ids(store, 1)
+    events = _events((1, rep_id, "2025-01", 4000.0),
+                     (1, rep_id, "2025-01", -4000.0))
+    with pytest.raises(ValueError, match="Repeated deal_id"):
+        process_cancellations(store, events)
+    lines = process_cancellations(store, events.assign(event_id=["a", "b"]))
+    assert lines["adjustment"].item() == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("events, message", [
+    (pd.DataFrame({"rep_id": ["r0"], "period": ["2025-01"], "amount": [1.0]}),
+     "deal_id"),
+    (_events((None, "r0", "2025-01", 1.0)), "missing a deal_id"),
+])
+def test_events_need_ids(store, events, message):
+    with pytest.raises(ValueError, match=message):
+        process_cancellations(store, events)
+
+
+def test_a_failed_run_saves_nothing(store, monkeypatch):
+    rep_id, = _ae_ids(store, 1)
+    results = store.load_results("2025-01")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(store, "save_adjustments", fail)
+    with pytest.raises(RuntimeError):
+        process_cancellations(store, _events((1, rep_id, "2025-01", 4000.0)))
+    pd.testing.assert_frame_equal(store.load_results("2025-01"), results)
+    assert store.applied_events(["1"]) == set()
+
+
+def test_results_without_tiers_are_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    store = PayoutStore(path)
+    store.save_inputs(make_roster(20), period="2025-01")
+    store.compute_period("2025-01", "tiered")
+    store.close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE results DROP COLUMN tier")
+
+    store = PayoutStore(path)
+    try:
+        assert store.load_results("2025-01")["tier"].isna().all()
+        rep_id, = _ae_ids(store, 1)
+        stored = store.load_results("2025-01", rep_id=rep_id)
+        lines = process_cancellations(store, _events(
+            (1, rep_id, "2025-01", 1e6)))
+        # The old tier is derived from the stored payout
+        assert lines["old_tier"].item() == \
+            payout_tiers(store.load_plan(1), stored)[0]
+        assert lines["new_tier"].item() == 0
+    finally:
+        store.close()
@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.cli import main
+
+
+@pytest.fixture
+def roster_csv(tmp_path, roster):
+    path = tmp_path / "reps.csv"
+    roster.to_csv(path, index=False)
+    return path
+
+
+def test_run_writes_every_chunk(tmp_path, roster, roster_csv):
+    out = tmp_path / "payouts.csv"
+    assert main([str(roster_csv), str(out), "--plan", "tiered",
+                 "--chunksize", "64"]) == 0
+    written = pd.read_csv(out)
+    expected = compute_payouts(pd.read_csv(roster_csv), "tiered")
+    assert len(written) == len(roster)
+    pd.testing.assert_series_equal(written["total_payout"],
+                                   expected["total_payout"])
+
+
+def test_parquet_output(tmp_path, roster_csv):
+    out = tmp_path / "payouts.parquet"
+    assert main([str(roster_csv), str(out)]) == 0
+    assert "total_payout" in pd.read_parquet(out).columns
+
+
+def test_role_flag_overrides_column(tmp_path, roster):
+    path = tmp_path / "aes.csv"
+    roster.drop(columns="role").to_csv(path, index=False)
+    out = tmp_path / "payouts.csv"
+    assert main([str(path), str(out), "--role", "AE"]) == 0
+    assert pd.read_csv(out)["grand_total"].isna().all()
+
+
+def test_missing_input(tmp_path, capsys):
+    assert main([str(tmp_path / "nope.csv"), str(tmp_path / "out.csv")]) == 2
+    assert "input file not found" in capsys.readouterr().err
+
+
+def test_unknown_plan(tmp_path, roster_csv, capsys):
+    assert main([str(roster_csv), str(tmp_path / "out.csv"),
+                 "--plan", "nope"]) == 1
+    assert "Unknown plan" in capsys.readouterr().err
+
+
+def test_missing_role_column(tmp_path, roster):
+    path = tmp_path / "reps.csv"
+    roster.drop(columns="role").to_csv(path, index=False)
+    assert main([str(path), str(tmp_path / "out.csv")]) == 1
+
+
+@pytest.mark.parametrize("flags", [
+    ["--splits", "splits.csv"],
+    ["--fx", "rates.csv"],
+    ["--ledger", "deals.csv", "--role", "AE"],
+])
+def test_rejected_flag_combinations(tmp_path, roster_csv, flags):
+    assert main([str(roster_csv), str(tmp_path / "out.csv"), *flags]) == 2
+
+
+def test_store_saves_inputs_and_results(tmp_path, roster_csv, roster):
+    from compcalc.store import PayoutStore
+
+    db = tmp_path / "payouts.db"
+    assert main([str(roster_csv), str(tmp_path / "out.csv"),
+                 "--store", str(db), "--period", "2025-01"]) == 0
+    store = PayoutStore(str(db))
+    try:
+        assert len(store.load_inputs("2025-01")) == len(roster)
+        assert len(store.load_results("2025-01")) == len(roster)
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_empty_input_writes_header(tmp_path, roster, suffix):
+    path = tmp_path / f"reps{suffix}"
+    out = tmp_path / f"payouts{suffix}"
+    empty = roster.iloc[:0]
+    if suffix == ".csv":
+        empty.to_csv(path, index=False)
+    else:
+        empty.to_parquet(path, index=False)
+    assert main([str(path), str(out)]) == 0
+    written = pd.read_csv(out) if suffix == ".csv" else pd.read_parquet(out)
+    assert len(written) == 0
+    assert list(written.columns) == \
+        list(compute_payouts(roster, "capped").columns)
+
+
+@pytest.mark.parametrize("column", ["rep_id", "role"])
+def test_ledger_roster_missing_column(tmp_path, column, capsys):
+    roster = tmp_path / "roster.csv"
+    pd.DataFrame({"rep_id": ["a"], "role": ["AE"]}).drop(
+        columns=column).to_csv(roster, index=False)
+    deals = tmp_path / "deals.csv"
+    pd.DataFrame({"rep_id": ["a"], "period": ["2025-01"],
+                  "amount": [1.0]}).to_csv(deals, index=False)
+    assert main([str(roster), str(tmp_path / "out.csv"),
+                 "--ledger", str(deals)]) == 1
+    assert f"missing column(s): ['{column}']" in capsys.readouterr().err
+
+
+def test_key_error_is_reported(tmp_path, roster_csv, monkeypatch, capsys):
+    def lookup(*args, **kwargs):
+        raise KeyError("rep_id")
+
+    monkeypatch.setattr("compcalc.cli.run", lookup)
+    assert main([str(roster_csv), str(tmp_path / "out.csv")]) == 1
+    assert "error: missing column 'rep_id'" in capsys.readouterr().err
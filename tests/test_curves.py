@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from compcalc.curves import (ATTAINMENT_GRID, ae_curve, curve_value,
+                             sdr_curve)
+from compcalc.formulas import make_ae_evaluator, make_sdr_evaluator
+from compcalc.plans import ae_defaults, get_plan, load_plan, validate_plan
+
+LADDER = load_plan("plans/ladder-2025.yaml")
+PLANS = ["basic", "capped", "tiered", LADDER,
+         validate_plan({"extends": "tiered", "min_attainment": 0.3,
+                        "ae_tier_breakpoints": [1.2, 1.8]})]
+SDR_INPUTS = {"total_revenue_assist": 40000.0, "sal_target_per_month": 16}
+AE_INPUTS = {"monthly_target": 60000.0, "accelerator_threshold": 1.2}
+
+
+def _kinks(values):
+    # Grid percentages where the curve stops being a straight line
+    bends = np.abs(np.diff(values, 2)) > 1e-6
+    return set((np.nonzero(bends)[0] + 1).tolist())
+
+
+@pytest.mark.parametrize("plan", PLANS)
+def test_ae_curve_matches_evaluator(plan):
+    curve = ae_curve(AE_INPUTS, plan)
+    evaluate = make_ae_evaluator(plan)
+    for attainment, row in zip(ATTAINMENT_GRID, curve.itertuples()):
+        out = evaluate({**AE_INPUTS, "total_sales": attainment * 60000.0})
+        assert row.commission == pytest.approx(out["commission"], abs=1e-9)
+        assert row.total_earnings == pytest.approx(out["total_earnings"],
+                                                   abs=1e-9)
+
+
+@pytest.mark.parametrize("plan", PLANS)
+def test_sdr_curve_matches_evaluator(plan):
+    curve = sdr_curve(SDR_INPUTS, plan)
+    evaluate = make_sdr_evaluator(plan)
+    for attainment, row in zip(ATTAINMENT_GRID, curve.itertuples()):
+        out = evaluate({**SDR_INPUTS,
+                        "total_sals_attained": attainment * 16,
+                        "total_sqls_attained": attainment * 10})
+        assert row.total_earnings == pytest.approx(out["grand_total"],
+                                                   abs=1e-9)
+        assert row.bonus == pytest.approx(
+            out["grand_total"] - out["monthly_base_salary"], abs=1e-9)
+
+
+def _gate_pct(rules):
+    # Pay jumps at the gate, which bends the curve either side of it
+    gate = round(rules["min_attainment"] * 100)
+    return {gate - 1, gate}
+
+
+@pytest.mark.parametrize("name", ["basic", "capped"])
+def test_ae_accelerator_breakpoints(name):
+    rules = get_plan(name)
+    commission = ae_curve(AE_INPUTS, name)["commission"].to_numpy()
+    threshold = round(AE_INPUTS["accelerator_threshold"] * 100)
+    expected = _gate_pct(rules) | {threshold}
+    if name == "basic":
+        expected.add(round(rules["ae_attainment_cap"] * 100))
+    if name == "capped":
+        # The cap binds once standard plus accelerated pay reaches it
+        values = {**ae_defaults(rules), **AE_INPUTS}
+        threshold = values["accelerator_threshold"]
+        rate = values["commission_rate"]
+        cap = values["commission_cap_multiplier"] * rate
+        expected.add(round(
+            (threshold + (cap - threshold * rate) / values["accelerator_rate"])
+            * 100))
+    assert _kinks(commission) == expected
+
+
+@pytest.mark.parametrize("plan", [PLANS[2], PLANS[4]])
+def test_ae_tiered_breakpoints(plan):
+    rules = get_plan(plan)
+    lower, upper = (round(point * 100)
+                    for point in rules["ae_tier_breakpoints"])
+    kinks = _kinks(ae_curve(AE_INPUTS, plan)["commission"].to_numpy())
+    # Pay is scaled by attainment below the lower breakpoint, so the curve
+    # only runs straight from there on. Away from 100% the pro-rata pay
+    # doesn't meet the standard band, and the jump bends both sides of it.
+    above = {kink for kink in kinks if kink >= lower}
+    assert _gate_pct(rules) <= kinks
+    assert {lower, upper} <= above <= {lower, lower + 1, upper}
+
+
+def test_ae_ladder_breakpoints():
+    commission = ae_curve(AE_INPUTS, LADDER)["commission"].to_numpy()
+    breakpoints = {round(point * 100)
+                   for point in LADDER["ae_ladder"]["breakpoints"]}
+    # The cap lands between grid points, bending the curve either side
+    capped = int(np.argmax(commission == commission.max()))
+    assert _kinks(commission) == \
+        _gate_pct(LADDER) | breakpoints | {capped - 1, capped}
+
+
+@pytest.mark.parametrize("plan", PLANS)
+def test_sdr_breakpoints(plan):
+    rules = get_plan(plan)
+    kinks = _kinks(sdr_curve(SDR_INPUTS, plan)["bonus"].to_numpy())
+    # Excess bonuses start at target and stop at the excess cap
+    excess_end = round((1 + rules["sdr_excess_cap"]) * 100)
+    allowed = _gate_pct(rules) | {100, excess_end}
+    if rules["sdr_target_bonus"] == "attainment":
+        allowed.add(round(rules["sdr_attainment_cap"] * 100))
+    assert _gate_pct(rules) | {excess_end} <= kinks <= allowed
+
+
+def test_curve_value_interpolates():
+    curve = ae_curve({}, "capped")
+    assert curve_value(curve, 120) == curve["total_earnings"][120]
+    halfway = (curve["total_earnings"][120] + curve["total_earnings"][121]) / 2
+    assert curve_value(curve, 120.5) == pytest.approx(halfway)
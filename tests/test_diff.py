@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from compcalc.batch import AE_OUTPUTS, compute_payouts
+from compcalc.cli import main
+from compcalc.diff import (CHANGE_TOLERANCE, SUMMARY_COLUMNS, diff_payouts,
+                           diff_stored_versions, diff_summary)
+from compcalc.plans import get_plan, load_plan
+from compcalc.store import PayoutStore
+
+# Differs from the capped plan only in a numeric rule: the stacked path
+LOOSER_CAP = dict(get_plan("capped"), sdr_excess_cap=1.0, min_attainment=0.4)
+
+PAIRS = {
+    "numeric": ("capped", LOOSER_CAP),
+    "structural": ("capped", "tiered"),
+    "ladder": ("tiered", load_plan("plans/ladder-2025.yaml")),
+    "same": ("basic", "basic"),
+}
+
+
+@pytest.mark.parametrize("old, new", list(PAIRS.values()), ids=list(PAIRS))
+def test_matches_two_separate_runs(roster, old, new):
+    diff = diff_payouts(roster, old, new, components=True)
+    before = compute_payouts(roster, old)
+    after = compute_payouts(roster, new)
+    np.testing.assert_allclose(diff["old_payout"], before["total_payout"])
+    np.testing.assert_allclose(diff["new_payout"], after["total_payout"])
+    np.testing.assert_allclose(diff["delta"],
+                               after["total_payout"] - before["total_payout"])
+    is_ae = (roster["role"] == "AE").to_numpy()
+    for column in AE_OUTPUTS:
+        np.testing.assert_allclose(diff[f"delta_{column}"][is_ae],
+                                   (after[column] - before[column])[is_ae])
+
+
+def test_pct_change_is_blank_without_an_old_payout(roster):
+    diff = diff_payouts(roster, "capped", "tiered")
+    zero = diff["old_payout"] == 0
+    assert diff.loc[zero, "pct_change"].isna().all()
+    np.testing.assert_allclose(diff.loc[~zero, "pct_change"],
+                               (diff["delta"] / diff["old_payout"])[~zero])
+
+
+def test_summary_counts_every_rep(roster):
+    summary = diff_summary(diff_payouts(roster, "capped", LOOSER_CAP))
+    assert summary.columns.tolist() == SUMMARY_COLUMNS
+    assert summary.index.tolist() == ["AE", "SDR", "All"]
+    counts = summary[["winners", "losers", "unchanged"]].sum(axis=1)
+    assert (counts == summary["reps"]).all()
+    assert summary.loc["All", "reps"] == len(roster)
+    assert summary.loc["All", "cost_change"] == pytest.approx(
+        summary.loc[["AE", "SDR"], "cost_change"].sum())
+
+
+def test_unchanged_plans_have_no_winners(roster):
+    summary = diff_summary(diff_payouts(roster, "basic", "basic"))
+    assert (summary["winners"] == 0).all() and (summary["losers"] == 0).all()
+    assert summary.loc["All", "largest_gain"] < CHANGE_TOLERANCE
+
+
+def test_stored_versions(tmp_path, roster):
+    store = PayoutStore(str(tmp_path / "payouts.db"))
+    try:
+        store.save_inputs(roster, period="2025-01")
+        old, _ = store.compute_period("2025-01", "capped")
+        new, _ = store.compute_period("2025-01", "tiered")
+        stored = diff_stored_versions(store, "2025-01", old, new)
+    finally:
+        store.close()
+    expected = diff_payouts(roster, "capped", "tiered")
+    np.testing.assert_allclose(stored["delta"], expected["delta"])
+
+
+def test_cli_diff(tmp_path, roster, capsys):
+    path = tmp_path / "reps.csv"
+    roster.to_csv(path, index=False)
+    out = tmp_path / "diff.csv"
+    assert main([str(path), str(out), "--plan", "capped",
+                 "--diff", "tiered"]) == 0
+    assert "delta" in out.read_text().splitlines()[0]
+    assert main([str(path), str(out), "--diff", "tiered",
+                 "--store", str(tmp_path / "p.db")]) == 2
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compcalc.fx import FxTable, convert_deals
+from compcalc.ledger import aggregate_ledger
+
+RATES = pd.DataFrame({
+    "date": ["2025-01-01", "2025-01-15", "2025-02-01", "2025-01-01"],
+    "currency": ["USD", "usd", "USD", "GBP"],
+    "rate": [0.90, 0.95, 0.92, 1.20],
+})
+
+
+@pytest.fixture
+def fx():
+    return FxTable(RATES)
+
+
+def test_latest_rate_on_or_before_the_date(fx):
+    rates = fx.rates_on("USD", ["2025-01-01", "2025-01-14", "2025-01-15",
+                                "2025-03-31"])
+    np.testing.assert_array_equal(rates, [0.90, 0.90, 0.95, 0.92])
+    np.testing.assert_array_equal(fx.rates_on("eur", ["2024-01-01"]), [1.0])
+
+
+def test_dates_before_the_first_rate(fx):
+    with pytest.raises(ValueError, match="No USD rate"):
+        fx.rates_on("USD", ["2024-12-31"])
+    with pytest.raises(ValueError, match="No FX rates for currency 'JPY'"):
+        fx.rates_on("JPY", ["2025-01-01"])
+
+
+def test_convert_by_date_and_by_period(fx):
+    amounts = [100.0, 100.0, 100.0, 100.0]
+    currencies = ["USD", "gbp", "EUR", "USD"]
+    by_date = fx.convert(amounts, currencies,
+                         dates=["2025-01-20", "2025-01-20", "2025-01-20",
+                                "2025-02-10"])
+    np.testing.assert_allclose(by_date, [95.0, 120.0, 100.0, 92.0])
+    # Periods use the rate in force at the end of the month
+    by_period = fx.convert(amounts, currencies,
+                           periods=["2025-01", "2025-01", "2025-01", "2025-02"])
+    np.testing.assert_allclose(by_period, [95.0, 120.0, 100.0, 92.0])
+    with pytest.raises(ValueError, match="dates or periods"):
+        fx.convert(amounts, currencies)
+
+
+def test_bad_tables():
+    with pytest.raises(ValueError, match="missing column"):
+        FxTable(RATES.drop(columns="rate"))
+    with pytest.raises(ValueError, match="positive"):
+        FxTable(RATES.assign(rate=[0.9, 0.0, 1.0, 1.2]))
+
+
+def test_ledger_totals_are_in_the_plan_currency(tmp_path, fx):
+    deals = pd.DataFrame({"rep_id": ["a", "a", "b"],
+                          "period": ["2025-01", "2025-01", "2025-02"],
+                          "date": ["2025-01-02", "2025-01-20", "2025-02-03"],
+                          "currency": ["USD", "EUR", "GBP"],
+                          "amount": [1000.0, 500.0, 100.0]})
+    path = tmp_path / "deals.csv"
+    deals.to_csv(path, index=False)
+    totals = aggregate_ledger(str(path), chunksize=2, fx=fx)
+    assert dict(zip(totals["rep_id"], totals["total_amount"])) == \
+        pytest.approx({"a": 1400.0, "b": 120.0})
+
+
+def test_convert_deals_needs_a_date_or_period(fx):
+    deals = pd.DataFrame({"currency": ["USD"], "amount": [1.0]})
+    plain = deals.drop(columns="currency")
+    assert convert_deals(plain, fx) is plain
+    with pytest.raises(ValueError, match="'date' or 'period'"):
+        convert_deals(deals, fx)
@@ -0,0 +1,75 @@
+import pytest
+
+from compcalc.events import open_queue
+from compcalc.leaderboard import Leaderboard
+
+from tests.conftest import make_roster
+
+
+@pytest.fixture
+def board():
+    return Leaderboard(make_roster(20), "tiered")
+
+
+def _ae(board):
+    return next(row["rep_id"] for row in board.top(len(board))
+                if row["role"] == "AE")
+
+
+def test_consume_matches_single_applies(board):
+    rep_id = _ae(board)
+    payout = board.live.payout(rep_id)
+    diffs = board.consume([{"rep_id": rep_id, "field": "total_sales",
+                            "delta": 5000.0}] * 2)
+    assert [diff["rep_id"] for diff in diffs] == [rep_id]
+    assert diffs[0]["old_payout"] == payout
+    assert board.live.inputs(rep_id)["total_sales"] == \
+        pytest.approx(make_roster(20).set_index("rep_id")
+                      .loc[rep_id, "total_sales"] + 10000.0)
+    ranks = [row["rank"] for row in board.top(len(board))]
+    assert ranks == list(range(1, len(board) + 1))
+
+
+@pytest.mark.parametrize("event", [
+    "not json",
+    {"rep_id": "nobody", "field": "total_sales", "delta": 1.0},
+    {"field": "total_sales", "delta": 1.0},
+    {"rep_id": None, "field": "total_sals_attained", "delta": 1.0},
+    {"rep_id": None, "field": "total_sales", "delta": "12"},
+    {"rep_id": None, "field": "total_sales", "delta": float("nan")},
+])
+def test_bad_events_are_skipped(board, event):
+    rep_id = _ae(board)
+    if isinstance(event, dict) and event.get("rep_id", "") is None:
+        event = dict(event, rep_id=rep_id)
+    good = {"rep_id": rep_id, "field": "total_sales", "delta": 1000.0}
+    total = board.total_payout
+    diffs = board.consume([event, good])
+    assert [skipped for skipped, _ in board.skipped] == [event]
+    assert [diff["rep_id"] for diff in diffs] == [rep_id]
+    assert board.total_payout == pytest.approx(total + diffs[0]["delta"])
+    board.consume([])
+    assert board.skipped == []
+
+
+def test_malformed_jsonl_line_is_passed_on(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"rep_id": "r0", "field": "total_sales", "delta": 1}\n'
+                    '{"rep_id": "r0", "field"\n')
+    events, cursor = open_queue(str(path)).read()
+    assert events[1] == '{"rep_id": "r0", "field"'
+    assert cursor == path.stat().st_size
+
+
+def test_mixed_type_rep_ids_tie():
+    # 1 and "1" print the same, so their keys would otherwise compare 1 < "1"
+    roster = [{"rep_id": rep_id, "role": "AE", "total_sales": 10000.0}
+              for rep_id in (1, "1", 2, "0")]
+    board = Leaderboard(roster, "capped")
+    assert [row["rep_id"] for row in board.top(4)] == ["0", 1, "1", 2]
+    board.apply("1", "total_sales", 50000.0)
+    board.apply("1", "total_sales", -50000.0)
+    assert [board.rank(rep_id) for rep_id in (1, "1")] == [2, 3]
+    diffs = board.consume([{"rep_id": 2, "field": "total_sales",
+                            "delta": 30000.0}])
+    assert diffs[0]["rank"] == 1
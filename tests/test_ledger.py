@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.ledger import aggregate_ledger, apply_totals, ledger_payouts
+
+ROSTER = pd.DataFrame({"rep_id": ["ae1", "sdr1", "ae2"],
+                       "role": ["AE", "SDR", "AE"],
+                       "monthly_target": [50000.0, None, 50000.0]})
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    deals = pd.DataFrame({
+        "rep_id": ["ae1", "ae1", "sdr1", "ae1", "nobody"],
+        "period": ["2025-01", "2025-01", "2025-01", "2025-02", "2025-01"],
+        "amount": [30000.0, 25000.0, 8000.0, 1000.0, 5.0],
+    })
+    path = tmp_path / "deals.csv"
+    deals.to_csv(path, index=False)
+    return path
+
+
+def test_totals_per_rep_and_period(ledger):
+    totals = aggregate_ledger(str(ledger), chunksize=2)
+    by_key = {(rep, period): (amount, count) for rep, period, amount, count
+              in totals.itertuples(index=False)}
+    assert by_key[("ae1", "2025-01")] == (55000.0, 2)
+    assert by_key[("ae1", "2025-02")] == (1000.0, 1)
+
+
+def test_roster_with_periods(ledger):
+    roster = pd.concat([ROSTER.assign(period="2025-01"),
+                        ROSTER.assign(period="2025-02")], ignore_index=True)
+    payouts = ledger_payouts(str(ledger), roster, "tiered")
+    assert len(payouts) == len(roster)
+    sales = payouts.set_index(["rep_id", "period"])["total_sales"]
+    assert sales[("ae1", "2025-01")] == 55000.0
+    assert sales[("ae2", "2025-02")] == 0.0
+    revenue = payouts.set_index(["rep_id", "period"])["total_revenue_assist"]
+    assert revenue[("sdr1", "2025-01")] == 8000.0
+    expected = compute_payouts(payouts, "tiered")
+    pd.testing.assert_series_equal(payouts["total_payout"],
+                                   expected["total_payout"])
+
+
+def test_roster_without_periods_takes_one_period(ledger):
+    totals = aggregate_ledger(str(ledger))
+    with pytest.raises(ValueError, match="2 periods"):
+        apply_totals(ROSTER, totals)
+    merged = apply_totals(ROSTER, totals[totals["period"] == "2025-01"])
+    assert len(merged) == len(ROSTER)
+    assert merged["total_sales"].tolist()[::2] == [55000.0, 0.0]
+
+
+def test_duplicate_roster_rows(ledger):
+    totals = aggregate_ledger(str(ledger))
+    with pytest.raises(ValueError, match="unique"):
+        apply_totals(pd.concat([ROSTER, ROSTER]).assign(period="2025-01"),
+                     totals)
@@ -0,0 +1,95 @@
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.money import (AE_ROUNDING, MAX_CENTS, SDR_ROUNDING,
+                            _round_div, exact_ae_compensation,
+                            exact_payouts, exact_sdr_compensation)
+from compcalc.plans import load_plan
+
+from tests.conftest import make_roster
+
+PLANS = {
+    "basic": "basic",
+    "capped": "capped",
+    "tiered": "tiered",
+    "ladder": load_plan("plans/ladder-2025.yaml"),
+}
+
+
+def _cents(amount):
+    return int(amount * 100)
+
+
+@pytest.mark.parametrize("mode", [ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN])
+@pytest.mark.parametrize("plan", list(PLANS.values()), ids=list(PLANS))
+def test_cents_match_the_decimal_path(plan, mode):
+    roster = make_roster(120, seed=3)
+    rounding = {name: mode for name in {**SDR_ROUNDING, **AE_ROUNDING}}
+    exact = exact_payouts(roster, plan, rounding=rounding)
+    for row, out in zip(roster.to_dict("records"), exact.to_dict("records")):
+        inputs = {key: value for key, value in row.items()
+                  if key not in ("rep_id", "role") and value == value}
+        if row["role"] == "AE":
+            scalar = exact_ae_compensation(
+                inputs, plan, {k: mode for k in AE_ROUNDING})
+            total = scalar["total_earnings"]
+            components = ["standard_commission", "commission",
+                          "monthly_base_salary"]
+        else:
+            scalar = exact_sdr_compensation(
+                inputs, plan, {k: mode for k in SDR_ROUNDING})
+            total = scalar["grand_total"]
+            components = list(SDR_ROUNDING)
+        assert out["total_payout_cents"] == _cents(total)
+        for name in components:
+            assert out[f"{name}_cents"] == _cents(scalar[name])
+
+
+def test_totals_are_sums_of_rounded_components():
+    exact = exact_payouts(make_roster(200, seed=4), "tiered")
+    sdr = exact[exact["role"] == "SDR"]
+    parts = sum(sdr[f"{name}_cents"] for name in SDR_ROUNDING)
+    assert (parts == sdr["total_payout_cents"]).all()
+
+
+def test_close_to_the_float_engine():
+    roster = make_roster(500, seed=5)
+    exact = exact_payouts(roster, "capped")["total_payout_cents"] / 100
+    floats = compute_payouts(roster, "capped")["total_payout"]
+    # At most half a cent of rounding per component
+    np.testing.assert_allclose(exact, floats, atol=0.03)
+
+
+@pytest.mark.parametrize("numerator, mode, expected", [
+    (25, ROUND_HALF_UP, 3), (25, ROUND_HALF_EVEN, 2), (35, ROUND_HALF_EVEN, 4),
+    (29, ROUND_DOWN, 2), (24, ROUND_HALF_UP, 2), (26, ROUND_HALF_EVEN, 3),
+])
+def test_round_div(numerator, mode, expected):
+    assert _round_div(numerator, 10, mode) == expected
+    array = _round_div(np.array([numerator], dtype=np.int64), 10, mode)
+    assert array.tolist() == [expected]
+
+
+def test_half_cent_commission():
+    # 0.5% of 1.00 is half a cent
+    inputs = {"total_sales": 1.0, "monthly_target": 1.0,
+              "commission_rate": 0.005}
+    up = exact_ae_compensation(inputs, "basic")
+    down = exact_ae_compensation(inputs, "basic",
+                                 {"standard_commission": ROUND_DOWN})
+    assert up["standard_commission"] == Decimal("0.01")
+    assert down["standard_commission"] == Decimal("0.00")
+
+
+def test_limits():
+    roster = make_roster(4)
+    too_big = roster.assign(total_sales=MAX_CENTS / 100 + 1.0)
+    with pytest.raises(ValueError, match="exact-mode limit"):
+        exact_payouts(too_big, "tiered")
+    with pytest.raises(ValueError, match="negative"):
+        exact_payouts(roster.assign(total_sales=-1.0), "tiered")
+    with pytest.raises(ValueError, match="Unknown money component"):
+        exact_payouts(roster, "tiered", rounding={"bonus": ROUND_DOWN})
@@ -0,0 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from compcalc import parallel
+from compcalc.batch import compute_payouts
+from compcalc.compiled import compile_plan
+from compcalc.parallel import parallel_payouts, split_shards
+
+
+@pytest.fixture
+def shuffled(roster):
+    # A non-default index shows whether it survives the round trip
+    return roster.set_axis(range(len(roster) * 3, 0, -3))
+
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_SHARD_ROWS", 10)
+
+
+def test_shards_cover_the_roster_in_order(shuffled):
+    pieces = split_shards(shuffled, 7)
+    assert len(pieces) == 7
+    pd.testing.assert_frame_equal(pd.concat(pieces), shuffled)
+
+
+@pytest.mark.parametrize("plan", ["tiered", compile_plan("capped")],
+                         ids=["name", "compiled"])
+def test_matches_a_single_process_run(shuffled, plan):
+    expected = compute_payouts(shuffled, plan)
+    result = parallel_payouts(shuffled, plan, workers=2, shards=7)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_reuses_an_executor(shuffled):
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        result = parallel_payouts(shuffled, "basic", shards=5, executor=pool)
+    pd.testing.assert_frame_equal(result, compute_payouts(shuffled, "basic"))
@@ -0,0 +1,64 @@
+"""The vectorized engine must match the scalar page formulas rep by rep."""
+
+import numpy as np
+import pytest
+
+from compcalc.batch import AE_OUTPUTS, SDR_OUTPUTS, compute_payouts
+from compcalc.formulas import make_ae_evaluator, make_sdr_evaluator
+from compcalc.plans import BASIC, CAPPED, TIERED, load_plan, validate_plan
+
+LADDER = validate_plan({
+    "ae_commission": "ladder",
+    "ae_ladder": {"breakpoints": [0.8, 1.0, 1.25, 1.5, 2.0],
+                  "rates": [0.04, 0.05, 0.075, 0.1, 0.12, 0.15],
+                  "cap_multiplier": 4.0},
+})
+
+PLANS = {
+    BASIC: BASIC,
+    CAPPED: CAPPED,
+    TIERED: TIERED,
+    "tiered-2025": load_plan("plans/tiered-2025.yaml"),
+    "ladder-2025": load_plan("plans/ladder-2025.yaml"),
+    "ladder-6": LADDER,
+}
+
+
+def _scalar(row, evaluate):
+    return evaluate({name: value for name, value in row.items()
+                     if name not in ("rep_id", "role") and value == value})
+
+
+@pytest.mark.parametrize("plan", list(PLANS.values()), ids=list(PLANS))
+def test_compute_payouts_matches_scalar_evaluators(roster, plan):
+    payouts = compute_payouts(roster, plan)
+    evaluators = {"SDR": (make_sdr_evaluator(plan), SDR_OUTPUTS),
+                  "AE": (make_ae_evaluator(plan), AE_OUTPUTS)}
+    for (_, row), (_, paid) in zip(roster.iterrows(), payouts.iterrows()):
+        evaluate, outputs = evaluators[row["role"]]
+        expected = _scalar(row.to_dict(), evaluate)
+        for name in outputs:
+            assert paid[name] == pytest.approx(expected[name], rel=1e-12,
+                                               abs=1e-9), (row["rep_id"], name)
+
+
+def test_total_payout_is_role_total(roster):
+    payouts = compute_payouts(roster, CAPPED)
+    is_ae = (payouts["role"] == "AE").to_numpy()
+    np.testing.assert_array_equal(payouts["total_payout"][is_ae],
+                                  payouts["total_earnings"][is_ae])
+    np.testing.assert_array_equal(payouts["total_payout"][~is_ae],
+                                  payouts["grand_total"][~is_ae])
+
+
+def test_single_role_frame(roster):
+    aes = roster[roster["role"] == "AE"].drop(columns="role")
+    payouts = compute_payouts(aes, TIERED, role="ae")
+    assert len(payouts) == len(aes)
+    assert payouts["grand_total"].isna().all()
+
+
+def test_unknown_role_rejected(roster):
+    roster.loc[0, "role"] = "CSM"
+    with pytest.raises(ValueError, match="Unknown role"):
+        compute_payouts(roster, CAPPED)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compcalc.periods import cumulative_payouts
+
+from tests.conftest import make_roster
+
+ADDED = ["window", "months_in_window", "monthly_variable_pay",
+         "earned_to_date", "paid_to_date", "true_up", "true_up_delta"]
+
+
+def _history(months=7, reps=60):
+    # Each rep keeps its role; blank inputs fall back to the plan defaults
+    roles = make_roster(reps)["role"]
+    frames = []
+    for month in range(months):
+        frame = make_roster(reps, seed=month + 1)
+        frames.append(frame.assign(role=roles,
+                                   period=f"2025-{month + 1:02d}"))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("window", ["ytd", "qtd"])
+def test_month_by_month_matches_a_full_run(window):
+    history = _history()
+    full = cumulative_payouts(history, "tiered", window)
+    previous, parts = None, []
+    for _, month in history.groupby("period", sort=True):
+        previous = cumulative_payouts(month, "tiered", window,
+                                      previous=previous)
+        parts.append(previous)
+    chunked = pd.concat(parts).loc[full.index]
+    columns = [name for name in full.columns if name.startswith("cumulative_")]
+    pd.testing.assert_frame_equal(chunked[ADDED + columns],
+                                  full[ADDED + columns])
+
+
+def test_hand_worked_quarter():
+    # Basic plan, 50k monthly target, 5% commission, gate at 50% attainment
+    history = pd.DataFrame({
+        "rep_id": "ae1", "role": "AE",
+        "period": ["2025-01", "2025-02", "2025-03", "2025-04"],
+        "total_sales": [20000.0, 30000.0, 100000.0, 50000.0],
+    })
+    result = cumulative_payouts(history, "basic", window="qtd")
+    # Monthly: below the gate, 60% of target, then 200% with the accelerator
+    assert result["monthly_variable_pay"].tolist() == \
+        pytest.approx([0.0, 1500.0, 6250.0, 2500.0])
+    # Quarter to date: 40%, 50% and 100% of the cumulative target
+    assert result["cumulative_attainment_rate"].tolist() == \
+        pytest.approx([0.4, 0.5, 1.0, 1.0])
+    assert result["earned_to_date"].tolist() == \
+        pytest.approx([0.0, 2500.0, 7500.0, 2500.0])
+    # The quarter earned 7500 but the months paid 7750
+    assert result["true_up"].tolist() == pytest.approx([0.0, 1000.0, -250.0, 0.0])
+    assert result["true_up_delta"].tolist() == \
+        pytest.approx([0.0, 1000.0, -1250.0, 0.0])
+    assert result["months_in_window"].tolist() == [1, 2, 3, 1]
+
+
+def test_paid_column_overrides_the_monthly_calculation():
+    history = pd.DataFrame({"rep_id": "ae1", "role": "AE",
+                            "period": ["2025-01", "2025-02"],
+                            "total_sales": [50000.0, 50000.0],
+                            "paid": [2000.0, np.nan]})
+    result = cumulative_payouts(history, "basic")
+    assert result["paid_to_date"].tolist() == pytest.approx([2000.0, 4500.0])
+    assert result["true_up"].tolist() == pytest.approx([500.0, 500.0])
+
+
+def test_bad_window():
+    with pytest.raises(ValueError, match="window"):
+        cumulative_payouts(_history(1, 2), window="mtd")
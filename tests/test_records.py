@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.plans import AE_DEFAULTS, AE_OUTPUTS, SDR_OUTPUTS
+from compcalc.records import (AE_INPUT_DTYPE, ae_records, ae_result,
+                              sdr_records, sdr_result)
+
+
+@pytest.mark.parametrize("block_rows", [7, 65_536])
+def test_records_match_payouts(roster, block_rows):
+    payouts = compute_payouts(roster, "tiered")
+    for role, records, outputs in (("AE", ae_records, AE_OUTPUTS),
+                                   ("SDR", sdr_records, SDR_OUTPUTS)):
+        rows = (roster["role"] == role).to_numpy()
+        result = records(roster[rows], "tiered", block_rows=block_rows)
+        assert result.shape == (rows.sum(),)
+        for name in outputs:
+            np.testing.assert_allclose(result[name], payouts.loc[rows, name])
+
+
+def test_structured_inputs(roster):
+    aes = roster[roster["role"] == "AE"]
+    inputs = np.zeros(len(aes), dtype=AE_INPUT_DTYPE)
+    for name in AE_INPUT_DTYPE.names:
+        values = aes[name] if name in aes.columns else np.nan
+        inputs[name] = np.where(np.isnan(values), AE_DEFAULTS[name], values)
+    np.testing.assert_array_equal(ae_records(inputs, "capped"),
+                                  ae_records(aes, "capped"))
+
+
+def test_partial_columns_use_the_defaults():
+    assert sdr_records({"rep_id": [1, 2, 3]}).shape == (3,)
+    records = ae_records({"total_sales": [0.0, 60000.0]})
+    assert records.shape == (2,)
+    defaults = ae_result({"total_sales": 60000.0})
+    assert records["total_earnings"][1] == pytest.approx(defaults["total_earnings"])
+
+
+def test_scalar_records_match_the_breakdown():
+    sdr = sdr_result({"total_sals_attained": 30, "total_sqls_attained": 9},
+                     "capped")
+    assert sdr.as_dict() == {name: sdr[name] for name in SDR_OUTPUTS}
+    with pytest.raises(KeyError):
+        sdr["total_earnings"]
+    with pytest.raises(AttributeError):
+        sdr.grand_total = 0.0
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.plans import AE_DEFAULTS, SDR_DEFAULTS
+from compcalc.simulate import simulate_costs, simulate_plan_cost
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal"])
+def test_same_seed_same_results(roster, distribution):
+    first = simulate_costs(roster, scenarios=500, seed=7,
+                           distribution=distribution)
+    again = simulate_costs(roster, scenarios=500, seed=7,
+                           distribution=distribution)
+    other = simulate_costs(roster, scenarios=500, seed=8,
+                           distribution=distribution)
+    np.testing.assert_array_equal(first[0], again[0])
+    np.testing.assert_array_equal(first[1], again[1])
+    assert not np.array_equal(first[0], other[0])
+
+
+@pytest.mark.parametrize("plan", ["basic", "capped", "tiered"])
+def test_invariant_to_block_size(roster, plan):
+    whole = simulate_costs(roster, plan, scenarios=300, seed=3)
+    for block_size in (1, 7, 64, 1000):
+        blocked = simulate_costs(roster, plan, scenarios=300, seed=3,
+                                 block_size=block_size)
+        np.testing.assert_allclose(blocked[0], whole[0], rtol=1e-12)
+        np.testing.assert_allclose(blocked[1], whole[1], rtol=1e-12)
+
+
+def test_summary_quantiles_are_ordered(roster):
+    summary = simulate_plan_cost(roster, scenarios=2000, seed=1)
+    assert summary["scenarios"] == 2000
+    assert summary["p50_cost"] <= summary["p95_cost"] <= summary["p99_cost"]
+    assert summary["p95_cost"] <= summary["tail_cost_95"]
+    assert 0.0 <= summary["expected_accelerator_cost"] <= \
+        summary["p95_accelerator_cost"]
+
+
+@pytest.mark.parametrize("plan", ["basic", "capped", "tiered"])
+def test_no_spread_pays_the_target(roster, plan):
+    # With zero spread every scenario is every rep at exactly 100%
+    total, _ = simulate_costs(roster.assign(attainment_sd=0.0), plan,
+                              scenarios=3)
+    on_target = roster.assign(
+        total_sales=roster["monthly_target"].fillna(
+            AE_DEFAULTS["monthly_target"]),
+        total_sals_attained=SDR_DEFAULTS["sal_target_per_month"],
+        total_sqls_attained=SDR_DEFAULTS["sql_target_per_month"])
+    expected = compute_payouts(on_target, plan)["total_payout"].sum()
+    np.testing.assert_allclose(total, expected, rtol=1e-12)
+
+
+def test_bad_distribution(roster):
+    with pytest.raises(ValueError, match="distribution"):
+        simulate_costs(roster, scenarios=10, distribution="uniform")
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compcalc.formulas import make_ae_evaluator
+from compcalc.plans import get_plan, load_plan, validate_plan
+from compcalc.solver import SOLVER_COLUMNS, sales_needed, sales_needed_batch
+
+LADDER = load_plan("plans/ladder-2025.yaml")
+
+PLANS = ["basic", "capped", "tiered", LADDER]
+
+SALES = np.linspace(0.0, 200e3, 81)
+
+
+@pytest.mark.parametrize("plan", PLANS, ids=["basic", "capped", "tiered",
+                                          "ladder"])
+def test_round_trip(plan):
+    # Paying the solved sales reaches the target, and no less will do
+    evaluate = make_ae_evaluator(get_plan(plan))
+    for sales in SALES:
+        earned = evaluate({"total_sales": sales})["total_earnings"]
+        needed = sales_needed({}, earned, plan)["required_sales"]
+        assert needed <= sales + 1e-6
+        reached = evaluate({"total_sales": needed})["total_earnings"]
+        assert reached == pytest.approx(earned, rel=1e-9, abs=1e-6)
+        if needed > 1.0:
+            below = evaluate({"total_sales": needed - 1.0})["total_earnings"]
+            assert below < earned
+
+
+def test_base_salary_alone_needs_no_sales():
+    base = make_ae_evaluator(get_plan("tiered"))({"total_sales": 0.0})
+    assert sales_needed({}, base["total_earnings"], "tiered") == \
+        {"required_sales": 0.0, "additional_sales": 0.0,
+         "required_attainment_rate": 0.0}
+
+
+@pytest.mark.parametrize("plan", ["capped", LADDER], ids=["capped", "ladder"])
+def test_beyond_the_cap_is_unreachable(plan):
+    assert sales_needed({}, 1e9, plan)["required_sales"] == np.inf
+
+
+def test_zero_target_is_unreachable():
+    out = sales_needed({"monthly_target": 0.0}, 1e5, "tiered")
+    assert out["required_sales"] == np.inf
+
+
+def test_batch_matches_scalar():
+    df = pd.DataFrame({"monthly_target": [40e3, 50e3, 60e3],
+                       "total_sales": [10e3, 55e3, 0.0],
+                       "goal": [8000.0, 9000.0, 12000.0]})
+    solved = sales_needed_batch(df, "goal", "tiered")
+    for row, out in zip(df.to_dict("records"), solved.to_dict("records")):
+        expected = sales_needed(row, row["goal"], "tiered")
+        assert {name: out[name] for name in SOLVER_COLUMNS} == \
+            pytest.approx(expected)
+
+
+def test_unknown_measure():
+    with pytest.raises(ValueError, match="measure"):
+        sales_needed({}, 1000.0, measure="salary")
+
+
+VARIANTS = {
+    "tiered-low-lower": {"extends": "tiered", "ae_tier_breakpoints": [0.8, 1.5]},
+    "tiered-high-lower": {"extends": "tiered", "ae_tier_breakpoints": [1.2, 1.8]},
+    "tiered-low-gate": {"extends": "tiered", "min_attainment": 0.3,
+                        "ae_tier_breakpoints": [0.6, 1.2]},
+    "tiered-high-gate": {"extends": "tiered", "min_attainment": 0.9,
+                         "ae_tier_breakpoints": [0.8, 1.5]},
+    "capped-high-gate": {"extends": "capped", "min_attainment": 0.75},
+    "basic-low-gate": {"extends": "basic", "min_attainment": 0.2},
+}
+
+
+@pytest.mark.parametrize("measure", ["commission", "total_earnings"])
+@pytest.mark.parametrize("plan", list(VARIANTS.values()), ids=list(VARIANTS))
+def test_round_trip_reaches_the_target(plan, measure):
+    # Payouts jump at the gate and tier breakpoints; the solved sales must
+    # land on the paying side of every jump
+    rules = validate_plan(plan)
+    evaluate = make_ae_evaluator(rules)
+    base = evaluate({"total_sales": 0.0})["monthly_base_salary"]
+    for target in np.linspace(100.0, 6000.0, 119):
+        wanted = target + (base if measure == "total_earnings" else 0.0)
+        needed = sales_needed({}, wanted, rules, measure)["required_sales"]
+        if np.isinf(needed):
+            continue
+        paid = evaluate({"total_sales": needed})[measure]
+        assert paid >= wanted - 1e-6, (target, needed)
+        assert evaluate({"total_sales": needed * (1 - 1e-9) - 1e-6})[measure] \
+            < wanted
@@ -0,0 +1,25 @@
+"""The startup budget of ``benchmarks/startup.py``, run with ``-m benchmark``."""
+
+import importlib.util
+import os
+
+import pytest
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                     "benchmarks", "startup.py")
+_spec = importlib.util.spec_from_file_location("startup", _PATH)
+startup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(startup)
+
+# Wall-clock budgets depend on the machine, so they run with the benchmarks
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("name", list(startup.ENTRY_POINTS))
+def test_entry_point_starts_within_budget(name):
+    baseline, modules, budget = startup.ENTRY_POINTS[name]
+    seconds, added = startup.measure(baseline, modules)
+    heavy = sorted({module.split(".")[0] for module in added}
+                   & set(startup.HEAVY_MODULES))
+    assert not heavy, f"{name} imports {heavy} at startup"
+    assert seconds <= budget, f"{name} took {seconds:.3f}s (budget {budget}s)"
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.store import INPUT_COLUMNS, PayoutStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PayoutStore(str(tmp_path / "payouts.db"))
+    yield store
+    store.close()
+
+
+def test_unchanged_plan_reuses_its_version(store):
+    first = store.save_plan("tiered")
+    assert store.save_plan("tiered") == first
+    assert store.save_plan("capped") != first
+    assert store.load_plan(first)["ae_commission"] == "tiered"
+    with pytest.raises(ValueError, match="Unknown plan version"):
+        store.load_plan(999)
+
+
+def test_inputs_round_trip(store, roster):
+    store.save_inputs(roster, period="2025-01")
+    loaded = store.load_inputs("2025-01")
+    assert loaded["rep_id"].tolist() == roster["rep_id"].tolist()
+    for name in INPUT_COLUMNS:
+        if name in roster.columns:
+            np.testing.assert_array_equal(loaded[name], roster[name])
+        else:
+            assert loaded[name].isna().all()
+    # Upserts replace the rep's month instead of adding a row
+    store.save_inputs(roster.head(3).assign(total_sales=1.0), period="2025-01")
+    assert len(store.load_inputs("2025-01")) == len(roster)
+    assert store.load_inputs("2025-01", rep_id="r0")["total_sales"].item() == 1.0
+
+
+def test_compute_period_matches_compute_payouts(store, roster):
+    store.save_inputs(roster, period="2025-01")
+    version, payouts = store.compute_period("2025-01", "tiered")
+    stored = store.load_results("2025-01", plan_version=version)
+    expected = compute_payouts(store.load_inputs("2025-01"), "tiered")
+    np.testing.assert_allclose(stored["total_payout"], expected["total_payout"])
+    assert stored["tier"].notna().all()
+    assert store.periods() == ["2025-01"]
+
+
+def test_rep_ids_keep_their_stored_type(store):
+    roster = pd.DataFrame({"rep_id": [7, "007", "r1"],
+                           "role": ["AE", "AE", "SDR"]})
+    store.save_inputs(roster, period="2025-01")
+    version, _ = store.compute_period("2025-01", "capped")
+    assert sorted(store.rep_ids("2025-01"), key=str) == ["007", 7, "r1"]
+    assert store.rep_ids("2025-02") == []
+    for rep_id in (7, "007"):
+        results = store.load_results("2025-01", version, rep_id=rep_id)
+        assert results["rep_id"].tolist() == [rep_id]
+
+
+def test_keys_limit_the_rows(store, roster):
+    store.save_inputs(roster, period="2025-01")
+    store.save_inputs(roster, period="2025-02")
+    keys = pd.DataFrame({"rep_id": ["r1", "r2"],
+                         "period": ["2025-02", "2025-01"]})
+    loaded = store.load_inputs(keys=keys)
+    assert sorted(zip(loaded["rep_id"], loaded["period"])) == \
+        [("r1", "2025-02"), ("r2", "2025-01")]
+
+
+def test_period_column_is_required_without_period(store, roster):
+    with pytest.raises(ValueError, match="period"):
+        store.save_inputs(roster)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from compcalc.batch import compute_payouts
+from compcalc.sweep import cost_surface, sweep_costs
+
+GRID = {
+    # SDR-only, AE-only, and one input both roles read
+    "lead_conversion_rate": [0.25, 0.5],
+    "accelerator_threshold": [1.0, 1.25, 2.0],
+    "base_salary": [40000.0, 90000.0],
+}
+
+
+@pytest.mark.parametrize("plan", ["basic", "capped", "tiered"])
+@pytest.mark.parametrize("block_size", [None, 5])
+def test_points_match_compute_payouts(roster, plan, block_size):
+    result = sweep_costs(roster, GRID, plan, block_size=block_size)
+    assert len(result) == 2 * 3 * 2
+    for point in result.itertuples(index=False):
+        overridden = roster.assign(**{name: getattr(point, name)
+                                      for name in GRID})
+        payouts = compute_payouts(overridden, plan)
+        cost = payouts.groupby("role")["total_payout"].sum()
+        assert point.sdr_cost == pytest.approx(cost["SDR"], rel=1e-12)
+        assert point.ae_cost == pytest.approx(cost["AE"], rel=1e-12)
+        assert point.total_cost == pytest.approx(cost.sum(), rel=1e-12)
+
+
+def test_single_role(roster):
+    result = sweep_costs(roster, {"accelerator_threshold": [1.2]}, role="AE")
+    # role= pays every row as that role, as compute_payouts does
+    payouts = compute_payouts(roster.assign(accelerator_threshold=1.2),
+                              role="AE")
+    assert result["sdr_cost"].tolist() == [0.0]
+    assert result["ae_cost"][0] == pytest.approx(
+        payouts["total_payout"].sum(), rel=1e-12)
+
+
+def test_cost_surface(roster):
+    result = sweep_costs(roster, GRID)
+    surface = cost_surface(result, "accelerator_threshold",
+                           "lead_conversion_rate", base_salary=40000.0)
+    assert surface.shape == (2, 3)
+    row = result[(result["lead_conversion_rate"] == 0.5)
+                 & (result["accelerator_threshold"] == 1.25)
+                 & (result["base_salary"] == 40000.0)]
+    assert surface.loc[0.5, 1.25] == row["total_cost"].item()
+
+
+def test_unknown_parameter(roster):
+    with pytest.raises(ValueError, match="bogus"):
+        sweep_costs(roster, {"bogus": np.arange(3)})
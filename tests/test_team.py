@@ -0,0 +1,30 @@
+import pytest
+
+from compcalc.team import filter_payouts, page_count, team_page, team_payouts
+
+
+@pytest.fixture
+def table(roster):
+    return team_payouts(roster, "tiered")
+
+
+def test_no_filters_returns_the_table(table):
+    assert filter_payouts(table) is table
+
+
+def test_prefiltered_page_matches_filtering_in_team_page(table):
+    filtered = filter_payouts(table, "AE", "r1", 100.0)
+    assert 0 < len(filtered) < len(table)
+    for page in range(1, page_count(len(filtered), 25) + 2):
+        rows, matched = team_page(filtered, page, 25)
+        expected, expected_matched = team_page(table, page, 25, role="AE",
+                                               search="r1", min_payout=100.0)
+        assert matched == expected_matched == len(filtered)
+        assert rows.index.tolist() == expected.index.tolist()
+
+
+def test_pages_are_sorted_and_clamped(table):
+    rows, matched = team_page(table, 99, 50, "total_payout", ascending=True)
+    assert matched == len(table)
+    assert len(rows) == len(table) - 50 * (page_count(len(table), 50) - 1)
+    assert rows["total_payout"].is_monotonic_increasing
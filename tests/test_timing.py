@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from compcalc import timing
+from compcalc.batch import compute_payouts
+from compcalc.plans import load_plan
+
+STAGES = ["input_parsing", "tier_evaluation", "caps", "eligibility_gating",
+          "totals"]
+
+PLANS = ["basic", "capped", "tiered", load_plan("plans/ladder-2025.yaml")]
+
+
+@pytest.fixture
+def timed():
+    timing.reset()
+    timing.enable()
+    yield
+    timing.enable(False)
+    timing.reset()
+
+
+def _counts(text):
+    # {(scope, stage): count} from the exposition format
+    return {(scope, stage): int(count) for scope, stage, count in re.findall(
+        r'compcalc_stage_seconds_count\{scope="(\w+)",stage="(\w+)"\} (\d+)',
+        text)}
+
+
+@pytest.mark.parametrize("role", ["SDR", "AE"])
+@pytest.mark.parametrize("plan", PLANS,
+                         ids=["basic", "capped", "tiered", "ladder"])
+def test_every_role_and_plan_laps_the_same_stages(timed, roster, plan, role):
+    compute_payouts(roster[roster["role"] == role], plan)
+    assert _counts(timing.prometheus_text()) == \
+        {("batch", stage): 1 for stage in STAGES}
+
+
+def test_histogram_exposition(timed, roster):
+    compute_payouts(roster, "tiered")
+    compute_payouts(roster, "capped")
+    text = timing.prometheus_text()
+    assert text.startswith("# HELP compcalc_stage_seconds ")
+    assert "# TYPE compcalc_stage_seconds histogram" in text
+    # Both roles in both runs
+    assert set(_counts(text).values()) == {4}
+    for stage in STAGES:
+        labels = f'scope="batch",stage="{stage}"'
+        buckets = [int(value) for value in re.findall(
+            rf'compcalc_stage_seconds_bucket\{{{labels},le="[^"]+"\}} (\d+)',
+            text)]
+        assert len(buckets) == len(timing.BUCKETS) + 1
+        assert buckets == sorted(buckets) and buckets[-1] == 4
+        assert re.search(rf"compcalc_stage_seconds_sum\{{{labels}\}} [0-9.e-]+",
+                         text)
+
+
+def test_disabled_timing_records_nothing(roster):
+    timing.reset()
+    compute_payouts(roster, "tiered")
+    assert timing.snapshot() == {}
+
+
+def test_profile_capture(tmp_path):
+    import pstats
+
+    path = tmp_path / "run.prof"
+    capture = timing.start_profile(str(path))
+    try:
+        sum(range(1000))
+    finally:
+        timing.stop_profile(capture)
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert timing.start_profile("") is None